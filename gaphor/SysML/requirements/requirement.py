@@ -7,6 +7,7 @@ from gaphor.diagram.presentation import (
 from gaphor.diagram.shapes import (
     Box,
     EditableText,
+    ShapeCache,
     Text,
     TextAlign,
     VerticalAlign,
@@ -48,6 +49,7 @@ class RequirementItem(ElementPresentation[Requirement], Classified):
         attribute_watches(self, "Requirement")
         operation_watches(self, "Requirement")
         stereotype_watches(self)
+        self.shape_cache = ShapeCache()
 
     show_stereotypes: attribute[int] = attribute("show_stereotypes", int)
 
@@ -56,7 +58,11 @@ class RequirementItem(ElementPresentation[Requirement], Classified):
     show_operations: attribute[int] = attribute("show_operations", int, default=False)
 
     def update_shapes(self, event=None):
-        self.shape = Box(
+        with self.shape_cache as shapes:
+            self.shape = self.requirement_shape(shapes)
+
+    def requirement_shape(self, shapes):
+        return Box(
             Box(
                 Text(
                     text=lambda: stereotypes_str(self.subject, ["requirement"]),
@@ -81,16 +87,20 @@ class RequirementItem(ElementPresentation[Requirement], Classified):
             *(
                 self.show_attributes
                 and self.subject
-                and [attributes_compartment(self.subject)]
+                and [attributes_compartment(self.subject, shapes)]
                 or []
             ),
             *(
                 self.show_operations
                 and self.subject
-                and [operations_compartment(self.subject)]
+                and [operations_compartment(self.subject, shapes)]
+                or []
+            ),
+            *(
+                self.show_stereotypes
+                and stereotype_compartments(self.subject, shapes)
                 or []
             ),
-            *(self.show_stereotypes and stereotype_compartments(self.subject) or []),
             self.id_and_text_compartment(),
             style={
                 "min-width": 100,
@@ -83,7 +83,15 @@ from gaphor.diagram.presentation import (
     ElementPresentation,
     from_package_str,
 )
-from gaphor.diagram.shapes import Box, EditableText, IconBox, Text, draw_border, stroke
+from gaphor.diagram.shapes import (
+    Box,
+    EditableText,
+    IconBox,
+    ShapeCache,
+    Text,
+    draw_border,
+    stroke,
+)
 from gaphor.diagram.support import represents
 from gaphor.UML.classes.klass import (
     attribute_watches,
@@ -200,6 +208,7 @@ class InterfaceItem(ElementPresentation, Classified):
         )
         attribute_watches(self, "Interface")
         operation_watches(self, "Interface")
+        self.shape_cache = ShapeCache()
 
     show_stereotypes: attribute[int] = attribute("show_stereotypes", int)
 
@@ -285,11 +294,12 @@ class InterfaceItem(ElementPresentation, Classified):
 
     def update_shapes(self, event=None, connectors=None):
         if self._folded == Folded.NONE:
-            self.shape = self.class_shape()
+            with self.shape_cache as shapes:
+                self.shape = self.class_shape(shapes)
         else:
             self.shape = self.ball_and_socket_shape(connectors)
 
-    def class_shape(self):
+    def class_shape(self, shapes):
         return Box(
             Box(
                 Text(
@@ -310,16 +320,20 @@ class InterfaceItem(ElementPresentation, Classified):
             *(
                 self.show_attributes
                 and self.subject
-                and [attributes_compartment(self.subject)]
+                and [attributes_compartment(self.subject, shapes)]
                 or []
             ),
             *(
                 self.show_operations
                 and self.subject
-                and [operations_compartment(self.subject)]
+                and [operations_compartment(self.subject, shapes)]
+                or []
+            ),
+            *(
+                self.show_stereotypes
+                and stereotype_compartments(self.subject, shapes)
                 or []
             ),
-            *(self.show_stereotypes and stereotype_compartments(self.subject) or []),
             style={
                 "min-width": 100,
                 "min-height": 50,
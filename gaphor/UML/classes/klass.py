@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 from gaphor import UML
 from gaphor.core.format import format
@@ -18,6 +19,7 @@ from gaphor.diagram.presentation import (
 from gaphor.diagram.shapes import (
     Box,
     EditableText,
+    ShapeCache,
     Text,
     draw_border,
     draw_top_separator,
@@ -52,6 +54,7 @@ class ClassItem(ElementPresentation[UML.Class], Classified):
         attribute_watches(self, "Class")
         operation_watches(self, "Class")
         stereotype_watches(self)
+        self.shape_cache = ShapeCache()
 
     show_stereotypes: attribute[int] = attribute("show_stereotypes", int)
 
@@ -68,23 +71,34 @@ class ClassItem(ElementPresentation[UML.Class], Classified):
             return ()
 
     def update_shapes(self, event=None):
-        self.shape = Box(
+        with self.shape_cache as shapes:
+            self.shape = self.class_shape(shapes)
+
+    def class_shape(self, shapes):
+        is_abstract = bool(self.subject and self.subject.isAbstract)
+        return Box(
             Box(
-                Text(
+                shapes(
+                    "stereotypes",
+                    Text,
                     text=lambda: UML.model.stereotypes_str(
                         self.subject, self.additional_stereotypes()
                     ),
                 ),
-                EditableText(
+                shapes(
+                    ("name", is_abstract),
+                    EditableText,
                     text=lambda: self.subject.name or "",
                     style={
                         "font-weight": FontWeight.BOLD,
                         "font-style": FontStyle.ITALIC
-                        if self.subject and self.subject.isAbstract
+                        if is_abstract
                         else FontStyle.NORMAL,
                     },
                 ),
-                Text(
+                shapes(
+                    "namespace",
+                    Text,
                     text=lambda: from_package_str(self),
                     style={"font-size": 10, "min-width": 0, "min-height": 0},
                 ),
@@ -93,16 +107,20 @@ class ClassItem(ElementPresentation[UML.Class], Classified):
             *(
                 self.show_attributes
                 and self.subject
-                and [attributes_compartment(self.subject)]
+                and [attributes_compartment(self.subject, shapes)]
                 or []
             ),
             *(
                 self.show_operations
                 and self.subject
-                and [operations_compartment(self.subject)]
+                and [operations_compartment(self.subject, shapes)]
+                or []
+            ),
+            *(
+                self.show_stereotypes
+                and stereotype_compartments(self.subject, shapes)
                 or []
             ),
-            *(self.show_stereotypes and stereotype_compartments(self.subject) or []),
             style={
                 "min-width": 100,
                 "min-height": 50,
@@ -174,14 +192,22 @@ def stereotype_watches(presentation):
     )
 
 
-def attributes_compartment(subject):
+def attributes_compartment(subject, shapes: Optional[ShapeCache] = None):
+    """The attributes of a classifier.
+
+    Rows are reused from ``shapes``, by attribute.
+    """
+    shapes = shapes or ShapeCache()
+
     # We need to fix the attribute value, since the for loop changes it.
     def lazy_format(attribute):
         return lambda: format(attribute)
 
     return Box(
         *(
-            Text(
+            shapes(
+                (attribute.id, attribute.isStatic),
+                Text,
                 text=lazy_format(attribute),
                 style={
                     "text-align": TextAlign.LEFT,
@@ -198,7 +224,13 @@ def attributes_compartment(subject):
     )
 
 
-def operations_compartment(subject):
+def operations_compartment(subject, shapes: Optional[ShapeCache] = None):
+    """The operations of a classifier.
+
+    Rows are reused from ``shapes``, by operation.
+    """
+    shapes = shapes or ShapeCache()
+
     def lazy_format(operation):
         return lambda: format(
             operation, visibility=True, type=True, multiplicity=True, default=True
@@ -206,7 +238,9 @@ def operations_compartment(subject):
 
     return Box(
         *(
-            Text(
+            shapes(
+                (operation.id, operation.isAbstract, operation.isStatic),
+                Text,
                 text=lazy_format(operation),
                 style={
                     "text-align": TextAlign.LEFT,
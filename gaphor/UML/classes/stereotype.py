@@ -1,15 +1,23 @@
 """Support code for dealing with stereotypes in diagrams."""
 
+from typing import Optional
+
 from gaphor.core.format import format
 from gaphor.core.styling import TextAlign, VerticalAlign
-from gaphor.diagram.shapes import Box, Text, draw_top_separator
+from gaphor.diagram.shapes import Box, ShapeCache, Text, draw_top_separator
+
 
+def stereotype_compartments(subject, shapes: Optional[ShapeCache] = None):
+    """The applied stereotypes with slots of an element.
 
-def stereotype_compartments(subject):
+    Rows are reused from ``shapes``, by applied stereotype and the
+    stereotype it is an instance of, and by slot.
+    """
+    shapes = shapes or ShapeCache()
     return filter(
         None,
         (
-            _create_stereotype_compartment(appliedStereotype)
+            _create_stereotype_compartment(appliedStereotype, shapes)
             for appliedStereotype in subject.appliedStereotype
         )
         if subject
@@ -17,7 +25,7 @@ def stereotype_compartments(subject):
     )
 
 
-def _create_stereotype_compartment(appliedStereotype):
+def _create_stereotype_compartment(appliedStereotype, shapes):
     def lazy_format(slot):
         return lambda: format(slot)
 
@@ -25,12 +33,22 @@ def _create_stereotype_compartment(appliedStereotype):
 
     if slots:
         return Box(
-            Text(
+            shapes(
+                (
+                    appliedStereotype.id,
+                    *(classifier.id for classifier in appliedStereotype.classifier),
+                ),
+                Text,
                 text=lazy_format(appliedStereotype.classifier[0]),
                 style={"padding": (0, 0, 4, 0)},
             ),
             *(
-                Text(text=lazy_format(slot), style={"text-align": TextAlign.LEFT})
+                shapes(
+                    slot.id,
+                    Text,
+                    text=lazy_format(slot),
+                    style={"text-align": TextAlign.LEFT},
+                )
                 for slot in slots
             ),
             style={"padding": (4, 4, 4, 4), "vertical-align": VerticalAlign.TOP},
@@ -77,6 +77,24 @@ class ClassTestCase(TestCase):
 
         assert len(compartments(klass)[0]) == 2
 
+    def test_attribute_rows_are_reused(self):
+        element_factory = self.element_factory
+        diagram = element_factory.create(UML.Diagram)
+        klass = diagram.create(ClassItem, subject=element_factory.create(UML.Class))
+
+        attr = element_factory.create(UML.Property)
+        attr.name = "blah1"
+        klass.subject.ownedAttribute = attr
+        row = compartments(klass)[0].children[0]
+
+        attr2 = element_factory.create(UML.Property)
+        attr2.name = "blah2"
+        klass.subject.ownedAttribute = attr2
+        attr.name = "blah"
+
+        assert compartments(klass)[0].children[0] is row
+        assert compartments(klass)[0].children[1] is not row
+
     def test_compartment_resizing(self):
         element_factory = self.element_factory
         diagram = element_factory.create(UML.Diagram)
@@ -0,0 +1,26 @@
+from gaphor import UML
+from gaphor.diagram.shapes import ShapeCache
+from gaphor.UML.classes.stereotype import stereotype_compartments
+from gaphor.UML.modelfactory import add_slot, apply_stereotype
+
+
+def test_stereotype_header_is_not_reused_for_another_stereotype(element_factory):
+    klass = element_factory.create(UML.Class)
+    stereotype = element_factory.create(UML.Stereotype)
+    other = element_factory.create(UML.Stereotype)
+    attr = element_factory.create(UML.Property)
+    instance = apply_stereotype(klass, stereotype)
+    add_slot(instance, attr).value = "value"
+    shapes = ShapeCache()
+
+    with shapes:
+        (compartment,) = stereotype_compartments(klass, shapes)
+    header, row = compartment.children
+
+    instance.classifier.remove(stereotype)
+    instance.classifier = other
+    with shapes:
+        (compartment,) = stereotype_compartments(klass, shapes)
+
+    assert compartment.children[0] is not header
+    assert compartment.children[1] is row
@@ -21,9 +21,7 @@ def interaction_config(new_item):
     interactions = (
         [i for i in package.ownedClassifier if isinstance(i, UML.Interaction)]
         if package
-        else diagram.model.lselect(
-            lambda e: isinstance(e, UML.Interaction) and e.package is None
-        )
+        else [e for e in diagram.model.select(UML.Interaction) if e.package is None]
     )
     if interactions:
         interaction = interactions[0]
@@ -99,10 +99,10 @@ def apply_stereotype(element, stereotype):
 def find_instances(element):
     """Find instance specification which extend classifier `element`."""
     model = element.model
-    return model.select(
-        lambda e: e.isKindOf(InstanceSpecification)
-        and e.classifier
-        and e.classifier[0] == element
+    return (
+        e
+        for e in model.select(InstanceSpecification)
+        if e.classifier and e.classifier[0] == element
     )
 
 
@@ -135,7 +135,9 @@ def get_stereotypes(element):
     names = {c.__name__ for c in cls.__mro__ if issubclass(c, Element)}
 
     # find stereotypes that extend element class
-    classes = model.select(lambda e: e.isKindOf(Class) and e.name in names)
+    classes = (
+        e for name in names for e in model.select_by("name", name) if e.isKindOf(Class)
+    )
 
     stereotypes = {ext.ownedEnd.type for cls in classes for ext in cls.extension}
     # Lambda key sort issue in mypy: https://github.com/python/mypy/issues/9656
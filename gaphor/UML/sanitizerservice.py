@@ -50,7 +50,11 @@ class SanitizerService(Service):
         linked."""
         if event.property is UML.Element.presentation:
             old_presentation = event.old_value
-            if old_presentation and not event.element.presentation:
+            if not old_presentation:
+                return
+            # Presentations on diagrams that are not loaded yet count too
+            event.element.materialize_presentations()
+            if not event.element.presentation:
                 event.element.unlink()
 
     @event_handler(AssociationSet)
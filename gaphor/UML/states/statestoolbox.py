@@ -31,9 +31,7 @@ def state_machine_config(new_item):
     state_machines = (
         [i for i in package.ownedClassifier if isinstance(i, UML.StateMachine)]
         if package
-        else diagram.model.lselect(
-            lambda e: isinstance(e, UML.StateMachine) and e.package is None
-        )
+        else [e for e in diagram.model.select(UML.StateMachine) if e.package is None]
     )
 
     if state_machines:
@@ -1,4 +1,5 @@
 from gaphor import UML
+from gaphor.core.modeling import ElementFactory
 
 
 def test_qualified_name():
@@ -13,3 +14,37 @@ def test_qualified_name():
     p2.package = p1
 
     assert p3.qualifiedName == ["package1", "package2", "package3"]
+
+
+def test_property_navigability_follows_model_changes():
+    element_factory = ElementFactory()
+    c1 = element_factory.create(UML.Class)
+    c2 = element_factory.create(UML.Class)
+    association = UML.model.create_association(c1, c2)
+    head, tail = association.memberEnd
+
+    assert head.opposite is tail
+    assert tail.opposite is head
+    assert head.navigability is None
+
+    UML.model.set_navigability(association, head, True)
+    assert head.navigability is True
+
+    UML.model.set_navigability(association, head, False)
+    assert head.navigability is False
+
+    association.memberEnd.swap(head, tail)
+    assert head.opposite is tail
+
+
+def test_property_opposite_follows_unlink():
+    element_factory = ElementFactory()
+    c1 = element_factory.create(UML.Class)
+    c2 = element_factory.create(UML.Class)
+    association = UML.model.create_association(c1, c2)
+    head, tail = association.memberEnd
+
+    assert head.opposite is tail
+    tail.unlink()
+
+    assert head.opposite is None
@@ -1500,9 +1500,7 @@ Stereotype.profile = derivedunion("profile", Profile, 1, 1)
 # Class.extension = derived('extension', Extension, 0, '*', class_extension, Extension.metaclass)
 
 Class.extension = property(
-    lambda self: self.model.lselect(
-        lambda e: e.isKindOf(Extension) and self is e.metaclass
-    ),
+    lambda self: [e for e in self.model.select(Extension) if self is e.metaclass],
     doc="""References the Extensions that specify additional properties of the
 metaclass. The property is derived from the extensions whose memberEnds
 are typed by the Class.""",
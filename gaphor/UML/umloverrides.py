@@ -49,7 +49,9 @@ def property_opposite(self: uml.Property) -> List[Optional[uml.Property]]:
     return [None]
 
 
-uml.Property.opposite = derived("opposite", uml.Property, 0, 1, property_opposite)
+uml.Property.opposite = derived(
+    "opposite", uml.Property, 0, 1, property_opposite, memoize=True
+)
 
 
 def property_navigability(self: uml.Property) -> List[Optional[bool]]:
@@ -77,7 +79,9 @@ def property_navigability(self: uml.Property) -> List[Optional[bool]]:
         return [False]
 
 
-uml.Property.navigability = derived("navigability", bool, 0, 1, property_navigability)
+uml.Property.navigability = derived(
+    "navigability", bool, 0, 1, property_navigability, memoize=True
+)
 
 
 def _pr_interface_deps(classifier, dep_type):
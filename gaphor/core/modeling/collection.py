@@ -1,6 +1,16 @@
 """1:n and n:m relations in the data model are saved using a collection."""
 
-from typing import Generic, List, Type, TypeVar, Union, overload
+from typing import (
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
 
 from gaphor.core.modeling.event import AssociationUpdated
 from gaphor.core.modeling.listmixins import querymixin, recursemixin, recurseproxy
@@ -47,16 +57,52 @@ class collectionlist(recursemixin, querymixin, List[T]):  # type: ignore[misc]
 
 
 class collection(Generic[T]):
-    """Collection (set-like) for model elements' 1:n and n:m relationships."""
+    """Collection (set-like) for model elements' 1:n and n:m relationships.
+
+    Members are kept in an insertion ordered dict, so membership tests,
+    adding and removing members take constant time. The list of items is
+    created when it's needed.
+    """
 
     def __init__(self, property, object, type: Type[T]):
         self.property = property
         self.object = object
         self.type = type
-        self.items: collectionlist[T] = collectionlist()
+        self._members: Dict[T, None] = {}
+        self._items: Optional[collectionlist[T]] = None
+
+    @property
+    def items(self) -> collectionlist[T]:
+        items = self._items
+        if items is None:
+            items = self._items = collectionlist(self._members)
+        return items
+
+    @items.setter
+    def items(self, items: Iterable[T]) -> None:
+        self._items = collectionlist(items)
+        self._members = dict.fromkeys(self._items)
+
+    def _add(self, value: T) -> None:
+        self._members[value] = None
+        if self._items is not None:
+            self._items.append(value)
+
+    def _discard(self, value: T) -> bool:
+        try:
+            del self._members[value]
+        except KeyError:
+            return False
+        self._items = None
+        return True
+
+    def _move_to_end(self, value: T) -> None:
+        del self._members[value]
+        self._members[value] = None
+        self._items = None
 
     def __len__(self) -> int:
-        return len(self.items)
+        return len(self._members)
 
     def __setitem__(self, key, value) -> None:
         raise RuntimeError("items should not be overwritten.")
@@ -76,7 +122,7 @@ class collection(Generic[T]):
         return self.items.__getitem__(key)
 
     def __contains__(self, obj) -> bool:
-        return self.items.__contains__(obj)
+        return obj in self._members
 
     def __iter__(self):
         return iter(self.items)
@@ -87,7 +133,7 @@ class collection(Generic[T]):
     __repr__ = __str__
 
     def __bool__(self):
-        return self.items != []
+        return bool(self._members)
 
     def append(self, value: T) -> None:
         if isinstance(value, self.type):
@@ -96,7 +142,7 @@ class collection(Generic[T]):
             raise TypeError(f"Object is not of type {self.type.__name__}")
 
     def remove(self, value: T) -> None:
-        if value in self.items:
+        if value in self._members:
             self.property._del(self.object, value)
 
     def index(self, key: T) -> int:
@@ -107,10 +153,10 @@ class collection(Generic[T]):
     # OCL members (from SMW by Ivan Porres, http://www.abo.fi/~iporres/smw)
 
     def size(self):
-        return len(self.items)
+        return len(self._members)
 
     def includes(self, o):
-        return o in self.items
+        return o in self._members
 
     def excludes(self, o):
         return not self.includes(o)
@@ -120,13 +166,13 @@ class collection(Generic[T]):
 
     def includesAll(self, c):
         for o in c:
-            if o not in self.items:
+            if o not in self._members:
                 return 0
         return 1
 
     def excludesAll(self, c):
         for o in c:
-            if o in self.items:
+            if o in self._members:
                 return 0
         return 1
 
@@ -140,7 +186,7 @@ class collection(Generic[T]):
         return [f(v) for v in self.items]
 
     def isEmpty(self):
-        return len(self.items) == 0
+        return not self._members
 
     def nonEmpty(self):
         return not self.isEmpty()
@@ -153,7 +199,9 @@ class collection(Generic[T]):
         try:
             i1 = self.items.index(item1)
             i2 = self.items.index(item2)
-            self.items[i1], self.items[i2] = self.items[i2], self.items[i1]
+            items = self.items
+            items[i1], items[i2] = items[i2], items[i1]
+            self._members = dict.fromkeys(items)
 
             self.object.handle(AssociationUpdated(self.object, self.property))
             return True
@@ -161,4 +209,6 @@ class collection(Generic[T]):
             return False
 
     def order(self, key):
-        self.items.sort(key=key)
+        items = self.items
+        items.sort(key=key)
+        self._members = dict.fromkeys(items)
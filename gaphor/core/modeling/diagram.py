@@ -8,16 +8,34 @@ import logging
 import uuid
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Sequence, Set, Union
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import gaphas
+from typing_extensions import Protocol
 
 from gaphor.core.modeling.collection import collection
 from gaphor.core.modeling.coremodel import Element, PackageableElement
 from gaphor.core.modeling.element import Id, RepositoryProtocol
 from gaphor.core.modeling.event import AssociationDeleted, DiagramItemCreated
 from gaphor.core.modeling.presentation import Presentation
-from gaphor.core.modeling.properties import association, relation_many, relation_one
+from gaphor.core.modeling.properties import (
+    association,
+    lazyassociation,
+    relation_many,
+    relation_one,
+)
+from gaphor.core.modeling.spatialindex import Bounds, SpatialIndex
 from gaphor.core.modeling.stylesheet import StyleSheet
 from gaphor.core.styling import Style, StyleNode
 
@@ -117,11 +135,33 @@ def attrstr(obj):
 
 
 class StyledDiagram:
+    """Style node for a diagram.
+
+    The diagram node also serves as context for style matching: items
+    obtained through ``styled_item()`` share their parent and child
+    nodes, so the tree is only built once. Matches on ancestors and
+    descendants are cached in the nodes. Use a new diagram node if items
+    are added, removed, moved or changed.
+    """
+
     def __init__(
         self, diagram: Diagram, selection: Optional[gaphas.view.Selection] = None
     ):
         self.diagram = diagram
         self.selection = selection or gaphas.view.Selection()
+        self._item_selection = selection
+        self._styled_items: Dict[Presentation, StyledItem] = {}
+        self._children: Optional[List[StyledItem]] = None
+        self.match_cache: Optional[Dict[object, bool]] = {}
+
+    def styled_item(self, item: Presentation) -> StyledItem:
+        try:
+            return self._styled_items[item]
+        except KeyError:
+            node = self._styled_items[item] = StyledItem(
+                item, self._item_selection, self
+            )
+            return node
 
     def name(self) -> str:
         return "diagram"
@@ -130,11 +170,13 @@ class StyledDiagram:
         return None
 
     def children(self) -> Iterator[StyledItem]:
-        return (
-            StyledItem(item, self.selection)
-            for item in self.diagram.get_all_items()
-            if not item.parent
-        )
+        if self._children is None:
+            self._children = [
+                self.styled_item(item)
+                for item in self.diagram.ownedPresentation
+                if not item.parent
+            ]
+        return iter(self._children)
 
     def attribute(self, name: str) -> str:
         fields = name.split(".")
@@ -149,21 +191,34 @@ class StyledItem:
 
     For convenience, a view can be added. The view will provide pseudo-
     classes for the item (focus, hover, etc.)
+
+    Items created by ``StyledDiagram.styled_item()`` reuse the parent
+    and child nodes of that diagram node.
     """
 
     def __init__(
-        self, item: Presentation, selection: Optional[gaphas.view.Selection] = None
+        self,
+        item: Presentation,
+        selection: Optional[gaphas.view.Selection] = None,
+        styled_diagram: Optional[StyledDiagram] = None,
     ):
         assert item.diagram
         self.item = item
         self.diagram = item.diagram
         self.selection = selection
+        self._styled_diagram = styled_diagram
+        self._name = removesuffix(type(item).__name__, "Item").lower()
+        self._children: Optional[List[StyledItem]] = None
+        self.match_cache: Optional[Dict[object, bool]] = {} if styled_diagram else None
 
     def name(self) -> str:
-        return removesuffix(type(self.item).__name__, "Item").lower()
+        return self._name
 
     def parent(self) -> Union[StyledItem, StyledDiagram]:
         parent = self.item.parent
+        styled_diagram = self._styled_diagram
+        if styled_diagram:
+            return styled_diagram.styled_item(parent) if parent else styled_diagram
         return (
             StyledItem(parent, self.selection)
             if parent
@@ -171,6 +226,13 @@ class StyledItem:
         )
 
     def children(self) -> Iterator[StyledItem]:
+        styled_diagram = self._styled_diagram
+        if styled_diagram:
+            if self._children is None:
+                self._children = [
+                    styled_diagram.styled_item(child) for child in self.item.children
+                ]
+            return iter(self._children)
         selection = self.selection
         return (StyledItem(child, selection) for child in self.item.children)
 
@@ -208,11 +270,52 @@ class PseudoCanvas:
                 save_func(item)
 
 
+class LazyItemProtocol(Protocol):
+    """A diagram item as read from the model file.
+
+    ``properties`` holds its values and references, as ``(name, value,
+    kind)`` tuples.
+    """
+
+    id: str
+    cls: type
+    properties: List[Tuple[str, object, str]]
+
+
+class LazyCanvasProtocol(Protocol):
+    """The diagram items of a lazily loaded diagram.
+
+    ``references`` holds the references from model elements to the
+    items.
+    """
+
+    references: list
+
+    def all_items(self) -> Iterator[LazyItemProtocol]:
+        ...
+
+    def materialize(self, diagram: Diagram) -> None:
+        ...
+
+
 class Diagram(PackageableElement):
-    """Diagrams may contain model elements and can be owned by a Package."""
+    """Diagrams may contain model elements and can be owned by a Package.
+
+    When a model is loaded lazily, the diagram items are not created
+    right away. Instead, ``lazy_canvas`` holds an object with a
+    ``materialize(diagram)`` method that creates them. This happens on
+    the first access to ``ownedPresentation``, or by calling
+    ``materialize()``.
+
+    The bounding boxes of the items, as they were last drawn, are kept
+    in ``spatial_index``. Items that need an update are left out until
+    they are drawn again.
+    """
 
     package: relation_one[Package]
 
+    lazy_canvas: Optional[LazyCanvasProtocol] = None
+
     def __init__(
         self, id: Optional[Id] = None, model: Optional[RepositoryProtocol] = None
     ):
@@ -234,12 +337,20 @@ class Diagram(PackageableElement):
         # so their `post_update()` method can be called.
         self._resolved_items: Set[gaphas.item.Item] = set()
 
-    ownedPresentation: relation_many[Presentation] = association(
-        "ownedPresentation", Presentation, composite=True, opposite="diagram"
-    )
+        # Bounds in diagram coordinates, with the bounds in item coordinates as data
+        self.spatial_index: SpatialIndex[Presentation, Bounds] = SpatialIndex()
+
+    ownedPresentation: relation_many[Presentation]
+
+    def materialize(self) -> None:
+        """Create the diagram items of a lazily loaded diagram."""
+        lazy_canvas, self.lazy_canvas = self.lazy_canvas, None
+        if lazy_canvas:
+            lazy_canvas.materialize(self)
 
     def _presentation_removed(self, event):
         if isinstance(event, AssociationDeleted) and event.old_value:
+            self.spatial_index.remove(event.old_value)
             self._update_views(removed_items=(event.old_value,))
 
     @property
@@ -294,9 +405,10 @@ class Diagram(PackageableElement):
         return item
 
     def lookup(self, id):
-        for item in self.get_all_items():
-            if item.id == id:
-                return item
+        self.materialize()
+        item = self.model.lookup_presentation(id)
+        if item and item.diagram is self:
+            return item
 
     def unlink(self):
         """Unlink all canvas items then unlink this diagram."""
@@ -341,9 +453,33 @@ class Diagram(PackageableElement):
         items_set = set(items)
         return (n for n in self.get_all_items() if n in items_set)
 
+    def set_item_bounds(self, item: Presentation, bounds: Bounds) -> None:
+        """Record the bounding box of an item, in diagram coordinates."""
+        x, y, w, h = bounds
+        c2i = item.matrix_i2c.inverse()
+        self.spatial_index.add(
+            item, bounds, c2i.transform_point(x, y) + c2i.transform_distance(w, h)
+        )
+
+    def _move_item_bounds(self, item: Presentation) -> None:
+        item_bounds = self.spatial_index.get_data(item)
+        if item_bounds:
+            x, y, w, h = item_bounds
+            i2c = item.matrix_i2c
+            self.spatial_index.add(
+                item,
+                i2c.transform_point(x, y) + i2c.transform_distance(w, h),
+                item_bounds,
+            )
+
     def request_update(
         self, item: gaphas.item.Item, update: bool = True, matrix: bool = True
     ) -> None:
+        if update:
+            self.spatial_index.remove(item)
+        elif matrix and item in self.spatial_index:
+            self._move_item_bounds(item)
+
         if update and matrix:
             self._update_views(dirty_items=(item,), dirty_matrix_items=(item,))
         elif update:
@@ -372,28 +508,33 @@ class Diagram(PackageableElement):
                 yield from gaphas.canvas.ancestors(self, item)
 
         all_dirty_items = list(reversed(list(sort(dirty_items_with_ancestors()))))
-        contexts = self._pre_update_items(all_dirty_items)
+        styled_diagram = StyledDiagram(self)
+        contexts = self._pre_update_items(all_dirty_items, styled_diagram)
 
         self._resolved_items.clear()
 
         self._connections.solve()
 
         all_dirty_items.extend(self._resolved_items)
-        self._post_update_items(reversed(list(sort(all_dirty_items))), contexts)
+        self._post_update_items(
+            reversed(list(sort(all_dirty_items))), contexts, styled_diagram
+        )
 
-    def _pre_update_items(self, items):
+    def _pre_update_items(self, items, styled_diagram):
         contexts = {}
         for item in items:
-            context = UpdateContext(style=self.style(StyledItem(item)))
+            context = UpdateContext(style=self.style(styled_diagram.styled_item(item)))
             item.pre_update(context)
             contexts[item] = context
         return contexts
 
-    def _post_update_items(self, items, contexts):
+    def _post_update_items(self, items, contexts, styled_diagram):
         for item in items:
             context = contexts.get(item)
             if not context:
-                context = UpdateContext(style=self.style(StyledItem(item)))
+                context = UpdateContext(
+                    style=self.style(styled_diagram.styled_item(item))
+                )
             item.post_update(context)
 
     def _on_constraint_solved(self, cinfo: gaphas.connections.Connection) -> None:
@@ -417,3 +558,10 @@ class Diagram(PackageableElement):
 Presentation.diagram = association(
     "diagram", Diagram, upper=1, opposite="ownedPresentation"
 )
+Diagram.ownedPresentation = lazyassociation(
+    "ownedPresentation",
+    Presentation,
+    materialize=Diagram.materialize,
+    composite=True,
+    opposite="diagram",
+)
@@ -6,12 +6,28 @@ from __future__ import annotations
 import logging
 import uuid
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, Callable, Iterator, Optional, Type, TypeVar, overload
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ClassVar,
+    Hashable,
+    Iterator,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    overload,
+)
 
 from typing_extensions import Protocol
 
 from gaphor.core.modeling.event import ElementUpdated
-from gaphor.core.modeling.properties import relation_many, relation_one, umlproperty
+from gaphor.core.modeling.properties import (
+    invalidate_dependents,
+    relation_many,
+    relation_one,
+    umlproperty,
+)
 
 if TYPE_CHECKING:
     from gaphor.core.modeling.coremodel import Comment
@@ -43,6 +59,8 @@ class Element:
     presentation: relation_many[Presentation]
     relationship: relation_many[Presentation]
 
+    _umlproperties: ClassVar[Tuple[int, Tuple[umlproperty, ...]]]
+
     def __init__(
         self, id: Optional[Id] = None, model: Optional[RepositoryProtocol] = None
     ):
@@ -75,14 +93,31 @@ class Element:
         return self._model
 
     @classmethod
-    def umlproperties(class_):
-        """Iterate over all properties."""
+    def umlproperties(class_) -> Tuple[umlproperty, ...]:
+        """All properties, ordered by name.
+
+        The properties are looked up once per class. Since properties
+        can be added to a class after it has been created, the lookup is
+        done again once new properties have been created.
+        """
+        cached: Optional[Tuple[int, Tuple[umlproperty, ...]]] = class_.__dict__.get(
+            "_umlproperties"
+        )
+        if cached and cached[0] == umlproperty.generation:
+            return cached[1]
+
         umlprop = umlproperty
-        for propname in dir(class_):
-            if not propname.startswith("_"):
-                prop = getattr(class_, propname)
-                if isinstance(prop, umlprop):
-                    yield prop
+        props = tuple(
+            prop
+            for prop in (
+                getattr(class_, propname)
+                for propname in dir(class_)
+                if not propname.startswith("_")
+            )
+            if isinstance(prop, umlprop)
+        )
+        class_._umlproperties = (umlproperty.generation, props)
+        return props
 
     def save(self, save_func):
         """Save the state by calling save_func(name, value)."""
@@ -111,6 +146,12 @@ class Element:
         for prop in self.umlproperties():
             prop.postload(self)
 
+    def materialize_presentations(self):
+        """Create the presentations of this element that are still held by
+        lazily loaded diagrams."""
+        for diagram in self.__dict__.pop("_lazy_diagrams", ()):
+            diagram.materialize()
+
     def unlink(self):
         """Unlink the element. All the elements references are destroyed.
 
@@ -126,15 +167,20 @@ class Element:
         try:
             self._unlink_lock += 1
 
+            self.materialize_presentations()
+
             for prop in self.umlproperties():
                 prop.unlink(self)
 
             self.handle(UnlinkEvent(self))
+            self.__dict__.pop("_derived_dependents", None)
         finally:
             self._unlink_lock -= 1
 
     def handle(self, event):
         """Propagate incoming events."""
+        if isinstance(event, ElementUpdated):
+            invalidate_dependents(self, event.property)
         model = self._model
         if model:
             model.handle(event)
@@ -187,9 +233,15 @@ class RepositoryProtocol(Protocol):
     def select(self, expression: None) -> Iterator[Element]:
         ...
 
+    def select_by(self, index: str, key: Hashable) -> Iterator[Element]:
+        ...
+
     def lookup(self, id: str) -> Optional[Element]:
         ...
 
+    def lookup_presentation(self, id: str) -> Optional[Presentation]:
+        ...
+
     def watcher(
         self, element: Element, default_handler: Optional[Handler] = None
     ) -> EventWatcherProtocol:
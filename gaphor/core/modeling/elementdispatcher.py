@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
 from gaphor.abc import Service
 from gaphor.core import event_handler
@@ -16,6 +16,7 @@ from gaphor.core.modeling.event import (
     ModelReady,
 )
 from gaphor.core.modeling.properties import umlproperty
+from gaphor.event import TransactionBegin, TransactionCommit, TransactionRollback
 
 log = logging.getLogger(__name__)
 
@@ -34,6 +35,14 @@ class EventWatcher:
         self.default_handler: Optional[Handler] = default_handler
         self._watched_paths: Dict[str, Handler] = dict()
 
+    @property
+    def paths(self) -> Tuple[str, ...]:
+        return tuple(self._watched_paths)
+
+    @property
+    def handlers(self) -> Tuple[Handler, ...]:
+        return tuple(self._watched_paths.values())
+
     def watch(self, path: str, handler: Optional[Handler] = None) -> EventWatcher:
         """Watch a certain path of elements starting with the DiagramItem. The
         handler is optional and will default the default provided at
@@ -53,7 +62,7 @@ class EventWatcher:
 
         dispatcher = self.element_dispatcher
         if dispatcher:
-            dispatcher.subscribe(self._watched_paths[path], self.element, path)
+            dispatcher.watch(self, path)
         return self
 
     def unsubscribe_all(self, *_args):
@@ -66,8 +75,44 @@ class EventWatcher:
         if not dispatcher:
             return
 
-        for path, handler in self._watched_paths.items():
-            dispatcher.unsubscribe(handler)
+        dispatcher.unwatch(self)
+
+
+class WatchNode:
+    """A property in a watch plan.
+
+    ``paths`` holds the indices of the watched paths that contain this
+    property, ``children`` the properties that are watched on the value
+    of this property.
+    """
+
+    __slots__ = ("property", "paths", "children")
+
+    def __init__(self, property: Optional[umlproperty]):
+        self.property = property
+        self.paths: Tuple[int, ...] = ()
+        self.children: Dict[umlproperty, WatchNode] = {}
+
+
+class WatchPlan:
+    """The properties watched for a set of paths, as a tree.
+
+    Paths with a common prefix share their nodes. Plans are compiled
+    once per element class and set of paths, and shared by all watchers
+    of that class and paths.
+    """
+
+    def __init__(self, paths: Sequence[Tuple[umlproperty, ...]]):
+        self.root = WatchNode(None)
+        for index, props in enumerate(paths):
+            node = self.root
+            for prop in props:
+                child = node.children.get(prop)
+                if not child:
+                    child = node.children[prop] = WatchNode(prop)
+                node = child
+                if index not in node.paths:
+                    node.paths += (index,)
 
 
 class ElementDispatcher(Service):
@@ -94,6 +139,17 @@ class ElementDispatcher(Service):
     This dispatcher keeps track of the kind of events that are dispatched. The
     dispatcher table is updated accordingly (so the right handlers are fired
     every time).
+
+    Event watchers are registered by a `WatchPlan`. For every
+    (element, property) the dispatcher keeps the watchers and the plan
+    nodes they are registered for, instead of a handler and remaining
+    path per watched path.
+
+    If ``coalesce`` is set, handler calls are postponed while a transaction
+    is open. When the transaction ends, each handler is called once per
+    (element, property) it was triggered for, with the last event. The
+    number of handler calls made and saved are counted in ``dispatched``
+    and ``coalesced``.
     """
 
     def __init__(self, event_manager, modeling_language):
@@ -108,17 +164,55 @@ class ElementDispatcher(Service):
         # handler: [(element, property), ..]
         self._reverse: Dict[Handler, List[Tuple[Element, umlproperty]]] = dict()
 
+        # Event watchers, by (event.element, event.property):
+        # { (watcher, plan node), ..}
+        self._watches: Dict[
+            Tuple[Element, umlproperty], Dict[Tuple[EventWatcher, WatchNode], None]
+        ] = dict()
+
+        # Registered watchers: (handlers by path, keys registered for)
+        self._watchers: Dict[
+            EventWatcher,
+            Tuple[Tuple[Handler, ...], Dict[Tuple[Element, umlproperty], None]],
+        ] = {}
+        self._unregistered: Dict[EventWatcher, None] = {}
+
+        # Compiled paths and plans, by element class
+        self._paths: Dict[Tuple[type, str], Tuple[umlproperty, ...]] = {}
+        self._plans: Dict[Tuple[type, Tuple[str, ...]], WatchPlan] = {}
+
+        self.coalesce = False
+        self.dispatched = 0
+        self.coalesced = 0
+        self._in_transaction = False
+
+        # Postponed handler calls, in order of first occurrence:
+        # (handler, event.element, event.property): last event
+        self._pending: Dict[Tuple[Handler, Element, umlproperty], ElementUpdated] = {}
+
         self.event_manager.subscribe(self.on_model_loaded)
         self.event_manager.subscribe(self.on_element_change_event)
+        self.event_manager.subscribe(self.on_transaction_begin)
+        self.event_manager.subscribe(self.on_transaction_end)
 
     def shutdown(self):
+        self.event_manager.unsubscribe(self.on_transaction_end)
+        self.event_manager.unsubscribe(self.on_transaction_begin)
         self.event_manager.unsubscribe(self.on_element_change_event)
         self.event_manager.unsubscribe(self.on_model_loaded)
+        self._pending.clear()
 
     def _path_to_properties(self, element, path):
         """Given a start element and a path, return a tuple of properties
         (association, attribute, etc.) representing the path."""
-        c = type(element)
+        key = (type(element), path)
+        try:
+            return self._paths[key]
+        except KeyError:
+            props = self._paths[key] = self._compile_path(type(element), path)
+            return props
+
+    def _compile_path(self, c, path):
         tpath = []
         for attr in path.split("."):
             cname = ""
@@ -207,6 +301,105 @@ class ElementDispatcher(Service):
         if not handlers:
             del self._handlers[key]
 
+    def _plan(self, element, paths: Tuple[str, ...]) -> WatchPlan:
+        key = (type(element), paths)
+        try:
+            return self._plans[key]
+        except KeyError:
+            plan = self._plans[key] = WatchPlan(
+                [self._path_to_properties(element, path) for path in paths]
+            )
+            return plan
+
+    def _add_watch(self, watcher, element, node, keys):
+        """Register the watcher for the children of a plan node."""
+        for child in node.children.values():
+            prop = child.property
+            key = (element, prop)
+            try:
+                watches = self._watches[key]
+            except KeyError:
+                watches = self._watches[key] = {}
+            watches[(watcher, child)] = None
+            keys[key] = None
+
+            if child.children:
+                if prop.upper == "*" or prop.upper > 1:
+                    for e in prop._get(element):
+                        self._add_watch(watcher, e, child, keys)
+                else:
+                    e = prop._get(element)
+                    if e:
+                        self._add_watch(watcher, e, child, keys)
+
+    def _remove_watch(self, watcher, element, node):
+        """Unregister the watcher for the children of a plan node."""
+        for child in node.children.values():
+            prop = child.property
+            key = (element, prop)
+            watches = self._watches.get(key)
+            if watches and (watcher, child) in watches:
+                del watches[(watcher, child)]
+                if not watches:
+                    del self._watches[key]
+
+            if child.children:
+                if prop.upper == "*" or prop.upper > 1:
+                    for e in prop._get(element):
+                        self._remove_watch(watcher, e, child)
+                else:
+                    e = prop._get(element)
+                    if e:
+                        self._remove_watch(watcher, e, child)
+
+    def watch(self, watcher: EventWatcher, path: str) -> None:
+        """Register an event watcher, that started watching path.
+
+        Watchers are registered by the time the next event is
+        dispatched, so a watcher that watches a number of paths in a row
+        is registered once. A watcher that is registered already is
+        registered again, with its current paths.
+        """
+        self._path_to_properties(watcher.element, path)
+        self._unregistered[watcher] = None
+
+    def unwatch(self, watcher: EventWatcher) -> None:
+        """Unregister an event watcher."""
+        self._unregistered.pop(watcher, None)
+        self._unwatch(watcher)
+
+    def _register_watchers(self):
+        while self._unregistered:
+            watcher = next(iter(self._unregistered))
+            del self._unregistered[watcher]
+            self._unwatch(watcher)
+            plan = self._plan(watcher.element, watcher.paths)
+            keys: Dict[Tuple[Element, umlproperty], None] = {}
+            self._watchers[watcher] = (watcher.handlers, keys)
+            self._add_watch(watcher, watcher.element, plan.root, keys)
+
+    def _unwatch(self, watcher):
+        _, keys = self._watchers.pop(watcher, ((), None))
+        if not keys:
+            return
+        for key in keys:
+            watches = self._watches.get(key)
+            if not watches:
+                continue
+            for entry in [e for e in watches if e[0] is watcher]:
+                del watches[entry]
+            if not watches:
+                del self._watches[key]
+
+    def _watch_handlers(self, key):
+        """The handlers of the event watchers registered for a key."""
+        watchers = self._watchers
+        return {
+            watchers[watcher][0][index]
+            for watcher, node in self._watches.get(key, ())
+            for index in node.paths
+        }
+
     def subscribe(self, handler, element, path):
         props = self._path_to_properties(element, path)
         self._add_handlers(element, props, handler)
@@ -234,31 +427,48 @@ class ElementDispatcher(Service):
 
     @event_handler(ElementUpdated)
     def on_element_change_event(self, event):
-        handlers = self._handlers.get((event.element, event.property))
-        if handlers:
-            try:
-                for handler in set(handlers.keys()):
+        self._register_watchers()
+        key = (event.element, event.property)
+        handlers = self._handlers.get(key)
+        watches = self._watches.get(key)
+        if not (handlers or watches):
+            return
+        try:
+            targets = set(handlers) if handlers else set()
+            if watches:
+                targets.update(self._watch_handlers(key))
+            if self.coalesce and self._in_transaction:
+                self._postpone(targets, event)
+            else:
+                for handler in targets:
+                    self.dispatched += 1
                     handler(event)
-            finally:
-                # Handle add/removal of handlers based on the kind of event
-                # Filter out handlers that have no remaining properties
-                if (
-                    isinstance(event, (AssociationSet, AssociationDeleted))
-                    and event.old_value
-                ):
-                    for handler, remainders in handlers.items():
-                        for remainder in remainders:
-                            self._remove_handlers(
-                                event.old_value, remainder[0], handler
-                            )
-
-                if (
-                    isinstance(event, (AssociationSet, AssociationAdded))
-                    and event.new_value
-                ):
-                    for handler, remainders in handlers.items():
-                        for remainder in remainders:
-                            self._add_handlers(event.new_value, remainder, handler)
+        finally:
+            # Handle add/removal of handlers based on the kind of event
+            # Filter out handlers that have no remaining properties
+            if (
+                isinstance(event, (AssociationSet, AssociationDeleted))
+                and event.old_value
+            ):
+                for handler, remainders in (handlers or {}).items():
+                    for remainder in remainders:
+                        self._remove_handlers(event.old_value, remainder[0], handler)
+                for watcher, node in list(watches or ()):
+                    if node.children:
+                        self._remove_watch(watcher, event.old_value, node)
+
+            if (
+                isinstance(event, (AssociationSet, AssociationAdded))
+                and event.new_value
+            ):
+                for handler, remainders in (handlers or {}).items():
+                    for remainder in remainders:
+                        self._add_handlers(event.new_value, remainder, handler)
+                for watcher, node in list(watches or ()):
+                    if node.children and watcher in self._watchers:
+                        self._add_watch(
+                            watcher, event.new_value, node, self._watchers[watcher][1]
+                        )
 
     @event_handler(ModelReady)
     def on_model_loaded(self, event):
@@ -266,3 +476,39 @@ class ElementDispatcher(Service):
             for h, remainders in list(value.items()):
                 for remainder in remainders:
                     self._add_handlers(key[0], (key[1],) + remainder, h)
+        self._unregistered.update(dict.fromkeys(self._watchers))
+        self._register_watchers()
+
+    @event_handler(TransactionBegin)
+    def on_transaction_begin(self, event):
+        self._in_transaction = True
+
+    @event_handler(TransactionCommit, TransactionRollback)
+    def on_transaction_end(self, event):
+        self._in_transaction = False
+        self.flush()
+
+    def _postpone(self, handlers, event):
+        pending = self._pending
+        for handler in handlers:
+            key = (handler, event.element, event.property)
+            if key in pending:
+                self.coalesced += 1
+            pending[key] = event
+
+    def flush(self):
+        """Call the handlers postponed in coalescing mode.
+
+        Handlers that have been unsubscribed in the mean time are not
+        called.
+        """
+        while self._pending:
+            pending = self._pending
+            self._pending = {}
+            for (handler, element, property), event in pending.items():
+                key = (element, property)
+                if handler in self._handlers.get(
+                    key, ()
+                ) or handler in self._watch_handlers(key):
+                    self.dispatched += 1
+                    handler(event)
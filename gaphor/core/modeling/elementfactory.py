@@ -9,6 +9,7 @@ from typing import (
     TYPE_CHECKING,
     Callable,
     Dict,
+    Hashable,
     Iterator,
     List,
     Optional,
@@ -23,8 +24,12 @@ from gaphor.core.modeling.diagram import Diagram
 from gaphor.core.modeling.element import Element, UnlinkEvent
 from gaphor.core.modeling.elementdispatcher import ElementDispatcher, EventWatcher
 from gaphor.core.modeling.event import (
+    AssociationAdded,
+    AssociationDeleted,
+    DiagramItemCreated,
     ElementCreated,
     ElementDeleted,
+    ElementUpdated,
     ModelFlushed,
     ModelReady,
 )
@@ -37,6 +42,65 @@ if TYPE_CHECKING:
 T = TypeVar("T", bound=Element)
 
 
+class ElementIndex:
+    """Index elements by a key, e.g. their name or owner.
+
+    The key of an element is computed again when one of the properties
+    in ``property_names`` changes. The index is filled the first time
+    it's used.
+    """
+
+    def __init__(self, key: Callable[[Element], Hashable], *property_names: str):
+        self.key = key
+        self.property_names = frozenset(property_names)
+        self.populated = False
+        self._keys: Dict[str, Hashable] = {}
+        self._elements: Dict[Hashable, Dict[str, Element]] = {}
+
+    def populate(self, elements: Iterator[Element]) -> None:
+        for element in elements:
+            self.add(element)
+        self.populated = True
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._elements.clear()
+        self.populated = False
+
+    def add(self, element: Element) -> None:
+        assert isinstance(element.id, str)
+        key = self.key(element)
+        self._keys[element.id] = key
+        self._elements.setdefault(key, {})[element.id] = element
+
+    def remove(self, element: Element) -> None:
+        assert isinstance(element.id, str)
+        try:
+            key = self._keys.pop(element.id)
+        except KeyError:
+            return
+        elements = self._elements[key]
+        del elements[element.id]
+        if not elements:
+            del self._elements[key]
+
+    def update(self, element: Element) -> None:
+        if element.id in self._keys and self._keys[element.id] != self.key(element):
+            self.remove(element)
+            self.add(element)
+
+    def select(self, key: Hashable) -> Iterator[Element]:
+        return iter(list(self._elements.get(key, {}).values()))
+
+
+def name_key(element: Element) -> Hashable:
+    return getattr(element, "name", None)
+
+
+def owner_key(element: Element) -> Hashable:
+    return element.owner
+
+
 class ElementFactory(Service):
     """The ElementFactory is used to create elements and do lookups to
     elements.
@@ -47,6 +111,15 @@ class ElementFactory(Service):
     remove - a model element is removed (element is to be removed element)
     model - a new model has been loaded (element is None) flush - model is
       flushed: all element are removed from the factory (element is None)
+
+    Elements selected by type are kept in an index per type, which is
+    created on the first ``select()`` for that type. Lookups by other
+    keys can be done through secondary indexes. A "name" and "owner"
+    index are provided by default.
+
+    Presentation elements are not owned by the factory, but they can be
+    looked up by id with ``lookup_presentation()``. Presentations are
+    indexed as long as they are owned by a diagram.
     """
 
     def __init__(
@@ -57,6 +130,12 @@ class ElementFactory(Service):
         self.event_manager = event_manager
         self.element_dispatcher = element_dispatcher
         self._elements: Dict[str, Element] = OrderedDict()
+        self._elements_by_type: Dict[type, Dict[str, Element]] = {}
+        self._indexes: Dict[str, ElementIndex] = {
+            "name": ElementIndex(name_key, "name"),
+            "owner": ElementIndex(owner_key, "owner"),
+        }
+        self._presentations: Dict[str, Presentation] = {}
         self._block_events = 0
 
     def shutdown(self):
@@ -76,10 +155,39 @@ class ElementFactory(Service):
         """
         if not type or not issubclass(type, Element) or issubclass(type, Presentation):
             raise TypeError(f"Type {type} is not a valid model element")
+        old = self._elements.get(id)
+        if old:
+            self._unindex(old)
         obj = type(id, self)
         self._elements[id] = obj
+        self._index(obj)
         return obj
 
+    def _index(self, element: Element) -> None:
+        elements_by_type = self._elements_by_type
+        for t in type(element).__mro__:
+            if t in elements_by_type:
+                elements_by_type[t][element.id] = element  # type: ignore[index]
+        for index in self._indexes.values():
+            if index.populated:
+                index.add(element)
+
+    def _unindex(self, element: Element) -> None:
+        elements_by_type = self._elements_by_type
+        for t in type(element).__mro__:
+            if t in elements_by_type:
+                elements_by_type[t].pop(element.id, None)  # type: ignore[arg-type]
+        for index in self._indexes.values():
+            if index.populated:
+                index.remove(element)
+
+    def _index_presentation(self, item: Presentation) -> None:
+        self._presentations[item.id] = item  # type: ignore[index]
+
+    def _unindex_presentation(self, item: Presentation) -> None:
+        if self._presentations.get(item.id) is item:  # type: ignore[arg-type]
+            del self._presentations[item.id]  # type: ignore[arg-type]
+
     def size(self) -> int:
         """Return the amount of elements currently in the factory."""
         return len(self._elements)
@@ -90,6 +198,10 @@ class ElementFactory(Service):
 
     __getitem__ = lookup
 
+    def lookup_presentation(self, id: str) -> Optional[Presentation]:
+        """Find a presentation element, on any diagram, with a specific id."""
+        return self._presentations.get(id)
+
     def __contains__(self, element: Element) -> bool:
         assert isinstance(element.id, str)
         return self.lookup(element.id) is element
@@ -111,10 +223,41 @@ class ElementFactory(Service):
         if expression is None:
             yield from self._elements.values()
         elif isinstance(expression, type):
-            yield from (e for e in self._elements.values() if isinstance(e, expression))
+            yield from self._select_type(expression).values()
         else:
             yield from (e for e in self._elements.values() if expression(e))
 
+    def _select_type(self, type: Type[T]) -> Dict[str, T]:
+        try:
+            return self._elements_by_type[type]  # type: ignore[return-value]
+        except KeyError:
+            elements: Dict[str, Element] = {
+                id: e for id, e in self._elements.items() if isinstance(e, type)
+            }
+            self._elements_by_type[type] = elements
+            return elements  # type: ignore[return-value]
+
+    def add_index(
+        self, name: str, key: Callable[[Element], Hashable], *property_names: str
+    ) -> None:
+        """Add a secondary index.
+
+        ``key(element)`` is computed again for an element if one of the
+        properties ``property_names`` of that element changes.
+        """
+        self._indexes[name] = ElementIndex(key, *property_names)
+
+    def select_by(self, index: str, key: Hashable) -> Iterator[Element]:
+        """Iterate elements for which the key of the secondary index ``index``
+        equals ``key``.
+
+        E.g. ``select_by("name", "Class")``.
+        """
+        element_index = self._indexes[index]
+        if not element_index.populated:
+            element_index.populate(self.values())
+        return element_index.select(key)
+
     def lselect(
         self, expression: Union[Callable[[Element], bool], Type[T], None] = None
     ) -> List[Element]:
@@ -152,11 +295,18 @@ class ElementFactory(Service):
         with self.block_events():
             for element in self.lselect(Diagram):
                 assert isinstance(element, Diagram)
+                # Do not create diagram items just to remove them
+                element.lazy_canvas = None
                 element.unlink()
 
             for element in self.lselect():
                 element.unlink()
 
+        self._elements_by_type.clear()
+        self._presentations.clear()
+        for index in self._indexes.values():
+            index.clear()
+
         self.handle(ModelFlushed(self))
 
     def model_ready(self) -> None:
@@ -183,6 +333,19 @@ class ElementFactory(Service):
                 del self._elements[element.id]
             except KeyError:
                 return
+            self._unindex(element)
             event = ElementDeleted(self, event.element)
+        elif isinstance(event, ElementUpdated):
+            name = event.property.name
+            for index in self._indexes.values():
+                if index.populated and name in index.property_names:
+                    index.update(event.element)
+            if event.property is Diagram.ownedPresentation:
+                if isinstance(event, AssociationAdded):
+                    self._index_presentation(event.new_value)
+                elif isinstance(event, AssociationDeleted):
+                    self._unindex_presentation(event.old_value)
+        elif isinstance(event, DiagramItemCreated):
+            self._index_presentation(event.element)
         if self.event_manager and not self._block_events:
             self.event_manager.handle(event)
@@ -0,0 +1,269 @@
+"""Content hashes of model elements and diagrams, for change detection."""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar
+
+from gaphor.abc import Service
+from gaphor.core import event_handler
+from gaphor.core.modeling.collection import collection
+from gaphor.core.modeling.diagram import Diagram, LazyItemProtocol, PseudoCanvas
+from gaphor.core.modeling.element import Element
+from gaphor.core.modeling.event import (
+    DiagramItemCreated,
+    DiagramItemDeleted,
+    ElementCreated,
+    ElementDeleted,
+    ElementUpdated,
+    ModelFlushed,
+    ModelReady,
+    RevertibeEvent,
+)
+from gaphor.core.modeling.presentation import Presentation
+from gaphor.core.modeling.properties import association
+
+T = TypeVar("T")
+
+
+def fingerprint(element: Element) -> str:
+    """Hash the ``save()`` output of an element.
+
+    The presentations of an element and the items of a diagram are left
+    out. They're part of the rollup of a diagram (see
+    `Fingerprints.diagram()`), and do not change when a lazily loaded
+    diagram creates its items.
+    """
+    lines: List[str] = [f"{type(element).__name__} {element.id}"]
+
+    def save_func(name, value):
+        if name == "presentation":
+            pass
+        elif isinstance(value, Element):
+            lines.append(f"{name}->{value.id}")
+        elif isinstance(value, collection):
+            lines.append(f"{name}->" + " ".join(str(v.id) for v in value))
+        elif isinstance(value, bool):
+            lines.append(f"{name}={int(value)}")
+        elif value is not None and not isinstance(value, PseudoCanvas):
+            lines.append(f"{name}={value}")
+
+    if isinstance(element, Diagram):
+        for prop in element.umlproperties():
+            if prop is not Diagram.ownedPresentation:
+                prop.save(element, save_func)
+    else:
+        element.save(save_func)
+
+    return hashlib.sha1("\n".join(lines).encode()).hexdigest()
+
+
+def lazy_fingerprint(item: LazyItemProtocol) -> str:
+    """Hash a diagram item as it was read from the model file.
+
+    The hash is the same as the `fingerprint()` of the item once it is
+    created, since the file holds the item's ``save()`` output. Unless
+    loading changes the item, for example by connecting a line.
+    """
+    lines: List[str] = [f"{item.cls.__name__} {item.id}"]
+    for name, value, kind in item.properties:
+        if kind == "val":
+            lines.append(f"{name}={value}")
+        elif kind == "ref":
+            lines.append(f"{name}->{value}")
+        else:
+            lines.append(f"{name}->" + " ".join(value))  # type: ignore[arg-type]
+
+    return hashlib.sha1("\n".join(lines).encode()).hexdigest()
+
+
+# Associations to elements that are shown as part of their owner,
+# although they're not composite
+SHOWN_WITH_OWNER = frozenset(("appliedStereotype",))
+
+
+def shown_elements(diagram: Diagram) -> Iterator[Element]:
+    """The diagram, its presentations and the elements they show.
+
+    A presentation shows its subject and the elements the subject owns,
+    such as attributes, operations with their parameters and applied
+    stereotypes with their slots. Elements these refer to, such as the
+    type of an attribute, are shown by name, so they're included too,
+    but not the elements they own.
+    """
+    shown: Dict[Element, None] = {}
+    walked: Set[Element] = set()
+
+    def walk(element: Element) -> Iterator[Element]:
+        stack = [element]
+        while stack:
+            e = stack.pop()
+            if e in walked:
+                continue
+            walked.add(e)
+            if e not in shown:
+                shown[e] = None
+                yield e
+            for prop in e.umlproperties():
+                if type(prop) is not association:
+                    continue
+                value = prop._get(e)
+                values = value if isinstance(value, collection) else (value,)
+                owned = prop.composite or prop.name in SHOWN_WITH_OWNER
+                for v in values:
+                    if v is None or isinstance(v, Presentation):
+                        continue
+                    if owned:
+                        stack.append(v)
+                    elif v not in shown:
+                        shown[v] = None
+                        yield v
+
+    yield diagram
+    for item in diagram.ownedPresentation:
+        yield item
+        if item.subject:
+            yield from walk(item.subject)
+
+
+class Fingerprints(Service):
+    """Keep content hashes for model elements and diagrams.
+
+    The fingerprint of an element is a hash of its ``save()`` output.
+    The fingerprint of a diagram is a Merkle-style rollup of the
+    fingerprints of the diagram, its presentations and the elements they
+    show. A rollup is dropped when any of these elements changes.
+
+    Fingerprints are computed on demand and kept until an event tells
+    the element changed. Values derived from an element can be kept
+    along with its fingerprint, see `memo()`.
+
+    Taking the fingerprint of a lazily loaded diagram creates its items.
+    """
+
+    def __init__(self, event_manager, element_factory):
+        self.event_manager = event_manager
+        self.element_factory = element_factory
+        self._elements: Dict[Element, str] = {}
+        self._diagrams: Dict[Diagram, str] = {}
+        # The diagrams whose rollup includes an element
+        self._rollups: Dict[Element, Set[Diagram]] = {}
+        self._memo: Dict[Element, Dict[str, object]] = {}
+        self._model: Optional[str] = None
+
+        event_manager.subscribe(self._on_element_change)
+        event_manager.subscribe(self._on_diagram_item_change)
+        event_manager.subscribe(self._on_model_change)
+
+    def shutdown(self):
+        self.event_manager.unsubscribe(self._on_model_change)
+        self.event_manager.unsubscribe(self._on_diagram_item_change)
+        self.event_manager.unsubscribe(self._on_element_change)
+        self.clear()
+
+    def element(self, element: Element) -> str:
+        """The fingerprint of an element."""
+        try:
+            return self._elements[element]
+        except KeyError:
+            digest = self._elements[element] = fingerprint(element)
+            return digest
+
+    def diagram(self, diagram: Diagram) -> str:
+        """The fingerprint of a diagram, its presentations and the elements
+        they show (see `shown_elements()`)."""
+        try:
+            return self._diagrams[diagram]
+        except KeyError:
+            pass
+        element = self.element
+        rollups = self._rollups
+        sha = hashlib.sha1()
+        for e in shown_elements(diagram):
+            sha.update(element(e).encode())
+            rollups.setdefault(e, set()).add(diagram)
+        digest = self._diagrams[diagram] = sha.hexdigest()
+        return digest
+
+    def model(self) -> str:
+        """The fingerprint of all elements and diagram items in the model.
+
+        Every element and item is hashed once. The items of a lazily
+        loaded diagram are hashed as they were read, so they are not
+        created.
+        """
+        if self._model is None:
+            element = self.element
+            digests: List[Tuple[str, str]] = []
+            for e in self.element_factory.values():
+                digests.append((e.id, element(e)))
+                if not isinstance(e, Diagram):
+                    continue
+                if e.lazy_canvas:
+                    digests.extend(
+                        (item.id, lazy_fingerprint(item))
+                        for item in e.lazy_canvas.all_items()
+                    )
+                else:
+                    digests.extend(
+                        (item.id, element(item)) for item in e.ownedPresentation
+                    )
+            sha = hashlib.sha1()
+            for _, digest in sorted(digests):
+                sha.update(digest.encode())
+            self._model = sha.hexdigest()
+        return self._model
+
+    def memo(self, element: Element, key: str, compute: Callable[[Element], T]) -> T:
+        """Return ``compute(element)``.
+
+        The value is kept until the element changes.
+        """
+        memo = self._memo.setdefault(element, {})
+        try:
+            return memo[key]  # type: ignore[return-value]
+        except KeyError:
+            value = memo[key] = compute(element)
+            return value
+
+    def clear(self):
+        self._elements.clear()
+        self._diagrams.clear()
+        self._rollups.clear()
+        self._memo.clear()
+        self._model = None
+
+    def invalidate(self, element: Element):
+        """Forget the fingerprint of element and the rollups of the diagrams
+        it is shown on."""
+        self._elements.pop(element, None)
+        self._memo.pop(element, None)
+        self._model = None
+
+        diagrams = self._diagrams
+        for diagram in self._rollups.pop(element, ()):
+            diagrams.pop(diagram, None)
+        if isinstance(element, Diagram):
+            diagrams.pop(element, None)
+        elif isinstance(element, Presentation):
+            diagrams.pop(element.diagram, None)  # type: ignore[arg-type]
+
+    @event_handler(ElementUpdated, RevertibeEvent, ElementCreated, ElementDeleted)
+    def _on_element_change(self, event):
+        self.invalidate(event.element)
+        # An item is moved to or removed from a diagram
+        for value in (
+            getattr(event, "old_value", None),
+            getattr(event, "new_value", None),
+        ):
+            if isinstance(value, Diagram):
+                self._diagrams.pop(value, None)
+
+    @event_handler(DiagramItemCreated, DiagramItemDeleted)
+    def _on_diagram_item_change(self, event):
+        self.invalidate(event.element)
+        self._diagrams.pop(event.diagram, None)
+
+    @event_handler(ModelReady, ModelFlushed)
+    def _on_model_change(self, event):
+        self.clear()
@@ -10,7 +10,10 @@ See the documentation on the mixins.
 
 from __future__ import annotations
 
-from typing import Callable, Generic, Sequence, TypeVar, overload
+import ast
+import functools
+import operator
+from typing import Callable, Generic, List, Optional, Sequence, TypeVar, overload
 
 __all__ = ["querymixin", "recursemixin"]
 
@@ -18,6 +21,7 @@ __all__ = ["querymixin", "recursemixin"]
 T = TypeVar("T")
 
 
+@functools.lru_cache(maxsize=256)
 def matcher(expr) -> Callable[[T], bool]:
     """Returns True if the expression returns True. The context for the
     expression is the element.
@@ -45,10 +49,19 @@ def matcher(expr) -> Callable[[T], bool]:
     False
     >>> matcher('it.nonexistent=="root"')(a)
     False
+    >>> matcher('it.name != "blah" and it.b.name == "b"')(a)
+    True
+
+    Matchers are cached by expression. Simple comparisons of an
+    attribute with a literal, like the ones above, are not evaluated,
+    but the attribute is compared directly.
 
     NOTE: the object ``it`` was introduced since properties (descriptors) can
     not be executed from within a dictionary context.
     """
+    comparison = attribute_comparison(expr)
+    if comparison:
+        return comparison
 
     compiled = compile(expr, "<matcher>", "eval")
 
@@ -62,6 +75,74 @@ def matcher(expr) -> Callable[[T], bool]:
     return real_matcher
 
 
+def attribute_comparison(expr) -> Optional[Callable[[T], bool]]:
+    """Create a matcher for ``it.attr == literal`` and ``it.attr != literal``
+    expressions.
+
+    Returns ``None`` for other expressions.
+
+    >>> attribute_comparison('it.name == "root"')  # doctest: +ELLIPSIS
+    <function attribute_comparison.<locals>.equals at 0x...>
+    >>> attribute_comparison('it.name == it.other') is None
+    True
+    """
+    try:
+        node = ast.parse(expr, mode="eval").body
+    except SyntaxError:
+        return None
+
+    if not (
+        isinstance(node, ast.Compare)
+        and len(node.ops) == 1
+        and isinstance(node.ops[0], (ast.Eq, ast.NotEq))
+    ):
+        return None
+
+    left, right = node.left, node.comparators[0]
+    if not attribute_path(left):
+        left, right = right, left
+    path = attribute_path(left)
+    if not path:
+        return None
+
+    try:
+        # Works for Python 3.7 literal nodes (Str, Num, NameConstant) as well
+        literal = ast.literal_eval(right)
+    except (ValueError, TypeError):
+        return None
+
+    get = operator.attrgetter(path)
+
+    if isinstance(node.ops[0], ast.Eq):
+
+        def equals(element: T) -> bool:
+            try:
+                return bool(get(element) == literal)
+            except AttributeError:
+                return False
+
+        return equals
+
+    def not_equals(element: T) -> bool:
+        try:
+            return bool(get(element) != literal)
+        except AttributeError:
+            return False
+
+    return not_equals
+
+
+def attribute_path(node) -> Optional[str]:
+    """The dotted path of an ``it.a.b`` expression."""
+    names: List[str] = []
+    while isinstance(node, ast.Attribute):
+        names.insert(0, node.attr)
+        node = node.value
+    if names and isinstance(node, ast.Name) and node.id == "it":
+        return ".".join(names)
+    return None
+
+
 class querymixin:
     """Implementation of the matcher as a mixin for lists.
 
@@ -9,7 +9,12 @@ from gaphas.item import Matrices
 
 from gaphor.core.modeling import Element
 from gaphor.core.modeling.event import DiagramItemDeleted, RevertibeEvent
-from gaphor.core.modeling.properties import association, relation_many, relation_one
+from gaphor.core.modeling.properties import (
+    association,
+    lazyassociation,
+    relation_many,
+    relation_one,
+)
 
 if TYPE_CHECKING:
     from gaphor.core.modeling.diagram import Diagram
@@ -125,8 +130,12 @@ class Presentation(Matrices, Element, Generic[S]):
             self.handle(MatrixUpdated(self, old_value))
 
 
-Element.presentation = association(
-    "presentation", Presentation, composite=True, opposite="subject"
+Element.presentation = lazyassociation(
+    "presentation",
+    Presentation,
+    materialize=Element.materialize_presentations,
+    composite=True,
+    opposite="subject",
 )
 Presentation.parent = association("parent", Presentation, upper=1, opposite="children")
 Presentation.children = association(
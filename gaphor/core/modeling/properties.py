@@ -26,7 +26,9 @@ methods:
 from __future__ import annotations
 
 import logging
+import weakref
 from typing import (
+    TYPE_CHECKING,
     Any,
     Callable,
     Generic,
@@ -34,6 +36,7 @@ from typing import (
     Optional,
     Sequence,
     Set,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -58,11 +61,25 @@ from gaphor.core.modeling.event import (
     RedefinedSet,
 )
 
-__all__ = ["attribute", "enumeration", "association", "derivedunion", "redefine"]
+if TYPE_CHECKING:
+    from gaphor.core.modeling.element import Element
+
+__all__ = [
+    "attribute",
+    "enumeration",
+    "association",
+    "lazyassociation",
+    "derivedunion",
+    "redefine",
+]
 
 
 log = logging.getLogger(__name__)
 
+# While a memoized derived property computes its value, the properties
+# it reads are recorded here, as (element, property) pairs.
+_reads: List[Set[Tuple[Element, umlproperty]]] = []
+
 
 E = TypeVar("E")
 
@@ -128,13 +145,20 @@ class umlproperty:
     lower: Lower = 0
     upper: Upper = 1
 
+    # Incremented whenever a property is created. Elements cache their
+    # properties per class and use this to detect added properties.
+    generation = 0
+
     def __init__(self, name: str):
+        umlproperty.generation += 1
         self._dependent_properties: Set[Union[derived, redefine]] = set()
         self.name = name
         self._name = "_" + name
 
     def __get__(self, obj, class_=None):
         if obj:
+            if _reads:
+                _reads[-1].add((obj, self))
             return self._get(obj)
         return self
 
@@ -419,15 +443,14 @@ class association(umlproperty):
         c: collection = self._get_many(obj)
         if value in c:
             if from_load:
-                c.items.remove(value)
-                c.items.append(value)
+                c._move_to_end(value)
             return
 
-        c.items.append(value)
+        c._add(value)
         try:
             self._set_opposite(obj, value, from_opposite)
         except Exception:
-            c.items.pop()
+            c._discard(value)
             raise
 
         self.handle(AssociationAdded(obj, self, value))
@@ -477,17 +500,11 @@ class association(umlproperty):
 
         c: collection = self._get_many(obj)
         if c:
-            items = c.items
-            try:
-                items.remove(value)
-            except ValueError:
-                pass
-            else:
-                if do_notify:
-                    self.handle(AssociationDeleted(obj, self, value))
+            if c._discard(value) and do_notify:
+                self.handle(AssociationDeleted(obj, self, value))
 
             # Remove items collection if empty
-            if not items:
+            if not c:
                 delattr(obj, self._name)
 
     def _del_opposite(self, obj, value, from_opposite):
@@ -511,6 +528,37 @@ class association(umlproperty):
                     value.unlink()
 
 
+class lazyassociation(association, Generic[E]):
+    """An association of which the values may not have been created yet.
+
+    Before the association is read, ``materialize(obj)`` is called to
+    create them. Internal access, such as loading and saving, does not
+    trigger this.
+
+    Diagram.ownedPresentation = lazyassociation('ownedPresentation',
+                                                Presentation,
+                                                materialize=Diagram.materialize)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        type: Type,
+        materialize: Callable[[E], None],
+        lower: Lower = 0,
+        upper: Upper = "*",
+        composite: bool = False,
+        opposite: Optional[str] = None,
+    ):
+        super().__init__(name, type, lower, upper, composite, opposite)
+        self.materialize = materialize
+
+    def __get__(self, obj, class_=None):
+        if obj:
+            self.materialize(obj)
+        return super().__get__(obj, class_)
+
+
 class AssociationStubError(Exception):
     pass
 
@@ -584,6 +632,15 @@ class derived(umlproperty, Generic[T]):
     applied to the derived property.
 
     NB. filter returns a *list* of filtered items, even when upper bound is 1.
+
+    Values are cached per element if the property has subsets. The
+    filter can depend on other elements, so if a subset changes, the
+    cached values of all elements are invalidated. ``cache_hits`` and
+    ``cache_misses`` count the cache lookups.
+
+    Properties without subsets can be memoized. The properties read by
+    the filter are recorded, and the value is cached until one of those
+    properties changes.
     """
 
     opposite = None
@@ -596,9 +653,14 @@ class derived(umlproperty, Generic[T]):
         upper: Upper,
         filter: Callable[[Any], List[Optional[T]]],
         *subsets: relation,
+        memoize: bool = False,
     ) -> None:
         super().__init__(name)
+        assert not (memoize and subsets), "Only properties without subsets are memoized"
+        self.memoize = memoize
         self.version = 1
+        self.cache_hits = 0
+        self.cache_misses = 0
         self.type = type
         self.lower = lower
         self.upper = upper
@@ -619,7 +681,7 @@ class derived(umlproperty, Generic[T]):
         )
 
     def postload(self, obj):
-        self.version += 1
+        self._invalidate(obj)
         if self.upper == 1:
             u = self.filter(obj)
             assert (
@@ -650,17 +712,45 @@ class derived(umlproperty, Generic[T]):
 
     def _get(self, obj):
         if self.subsets:
-            try:
-                uc = getattr(obj, self._name)
-                if uc.version != self.version:
-                    uc = self._update(obj)
+            uc = getattr(obj, self._name, None)
+            if uc and uc.version == self.version:
                 assert self is uc.owner
-            except AttributeError:
-                uc = self._update(obj)
-        else:
+                self.cache_hits += 1
+                return uc.data
+            self.cache_misses += 1
+        elif self.memoize:
+            return self._get_memoized(obj)
+        return self._update(obj).data
+
+    def _get_memoized(self, obj):
+        uc = obj.__dict__.get(self._name)
+        if uc:
+            self.cache_hits += 1
+            return uc.data
+        self.cache_misses += 1
+
+        reads: Set[Tuple[Element, umlproperty]] = set()
+        _reads.append(reads)
+        try:
             uc = self._update(obj)
+        finally:
+            _reads.pop()
+
+        for element, prop in reads:
+            dependents = element.__dict__.setdefault("_derived_dependents", {})
+            # Dependents are weak references, so an element does not keep
+            # the elements it read from alive.
+            dependents.setdefault(prop, set()).add((weakref.ref(obj), self))
         return uc.data
 
+    def _invalidate(self, obj):
+        """Make sure the value is computed again on the next lookup."""
+        if self.memoize:
+            obj.__dict__.pop(self._name, None)
+            invalidate_dependents(obj, self)
+        else:
+            self.version += 1
+
     def _set(self, obj, value):
         raise AttributeError("Can not set values on a union")
 
@@ -694,13 +784,13 @@ class derived(umlproperty, Generic[T]):
             # ), f"Can only handle [0..1] set-events, not {event} for {event.element}"
             old_value = self._get(event.element)
             # Make sure unions are created again
-            self.version += 1
+            self._invalidate(event.element)
             new_value = self._get(event.element)
             if old_value != new_value:
                 self.handle(DerivedSet(event.element, self, old_value, new_value))
         else:
             # Make sure unions are created again
-            self.version += 1
+            self._invalidate(event.element)
 
             if isinstance(event, AssociationSet):
                 self.handle(DerivedDeleted(event.element, self, event.old_value))
@@ -722,6 +812,17 @@ class derived(umlproperty, Generic[T]):
                 )
 
 
+def invalidate_dependents(element, prop) -> None:
+    """Invalidate the memoized derived properties that read ``prop`` of
+    ``element``."""
+    dependents = element.__dict__.get("_derived_dependents")
+    if dependents:
+        for ref, derived in dependents.pop(prop, ()):
+            obj = ref()
+            if obj is not None:
+                derived._invalidate(obj)
+
+
 def object_has_property(obj, prop):
     found = getattr(type(obj), prop.name, None)
     while isinstance(found, redefine):
@@ -735,6 +836,10 @@ class derivedunion(derived[T]):
       Element.union = derivedunion('union', subset1, subset2..subsetn)
 
     The subsets are the properties that participate in the union (Element.name).
+
+    A union only depends on the element it's defined on. If a subset
+    changes, only the cached value of that element is invalidated,
+    together with the unions that depend on this union.
     """
 
     def __init__(
@@ -763,6 +868,12 @@ class derivedunion(derived[T]):
                     u.add(tmp)
         return collectionlist(u)
 
+    def _invalidate(self, obj):
+        obj.__dict__.pop(self._name, None)
+        for d in self._dependent_properties:
+            if isinstance(d, derivedunion):
+                d._invalidate(obj)
+
     def propagate(self, event):
         """Re-emit state change for the derived union (as Derived*Event's).
 
@@ -778,7 +889,7 @@ class derivedunion(derived[T]):
         if event.property not in self.subsets:
             return
         # Make sure unions are created again
-        self.version += 1
+        self._invalidate(event.element)
 
         if not isinstance(event, AssociationUpdated):
             return
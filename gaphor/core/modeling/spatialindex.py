@@ -0,0 +1,109 @@
+"""A spatial index of diagram items, in diagram coordinates.
+
+Space is divided in a grid of square cells. Each cell holds the items
+that overlap it. Rectangles are ``(x, y, width, height)``, like they
+are in Gaphas.
+
+>>> index = SpatialIndex(cell_size=10)
+>>> index.add("a", (0, 0, 5, 5))
+>>> index.add("b", (20, 20, 30, 30))
+>>> sorted(index.find_intersect((0, 0, 25, 25)))
+['a', 'b']
+>>> sorted(index.find_intersect((10, 10, 5, 5)))
+[]
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Generic, Iterable, Iterator, Optional, Set, Tuple, TypeVar
+
+from gaphas.geometry import rectangle_intersects
+
+Bounds = Tuple[float, float, float, float]  # x, y, width, height
+Cell = Tuple[int, int]
+
+T = TypeVar("T")
+D = TypeVar("D")
+
+
+class SpatialIndex(Generic[T, D]):
+    """Find items by the area they cover.
+
+    Like a Gaphas Quadtree, an item can hold some data next to its
+    bounds.
+    """
+
+    def __init__(self, cell_size: float = 256.0) -> None:
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Set[T]] = {}
+        self._items: Dict[T, Tuple[Bounds, Optional[D]]] = {}
+
+    def _cells_of(self, bounds: Bounds) -> Iterator[Cell]:
+        x, y, w, h = bounds
+        size = self.cell_size
+        x0, y0 = math.floor(x / size), math.floor(y / size)
+        x1, y1 = math.floor((x + w) / size), math.floor((y + h) / size)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield cx, cy
+
+    def add(self, item: T, bounds: Bounds, data: Optional[D] = None) -> None:
+        """Add an item, or update its bounds."""
+        if item in self._items:
+            self.remove(item)
+        self._items[item] = (bounds, data)
+        cells = self._cells
+        for cell in self._cells_of(bounds):
+            try:
+                cells[cell].add(item)
+            except KeyError:
+                cells[cell] = {item}
+
+    def remove(self, item: T) -> None:
+        """Remove an item, if it is in the index."""
+        try:
+            bounds, _ = self._items.pop(item)
+        except KeyError:
+            return
+        cells = self._cells
+        for cell in self._cells_of(bounds):
+            items = cells[cell]
+            items.discard(item)
+            if not items:
+                del cells[cell]
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._items.clear()
+
+    def get_bounds(self, item: T) -> Bounds:
+        return self._items[item][0]
+
+    def get_data(self, item: T) -> Optional[D]:
+        return self._items[item][1]
+
+    def find_intersect(self, rect: Bounds) -> Set[T]:
+        """Find the items that overlap a rectangle."""
+        cells = self._cells
+        items = self._items
+        _, _, w, h = rect
+        size = self.cell_size
+        query: Iterable[Iterable[T]]
+        if (w / size + 1) * (h / size + 1) > len(cells):
+            # A large area: check the cells in use instead
+            query = cells.values()
+        else:
+            query = (cells.get(cell, ()) for cell in self._cells_of(rect))
+        found: Set[T] = set()
+        for cell_items in query:
+            for item in cell_items:
+                if item not in found and rectangle_intersects(items[item][0], rect):
+                    found.add(item)
+        return found
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self._items
@@ -1 +1,6 @@
-from gaphor.diagram.tests.fixtures import diagram, element_factory, event_manager
+from gaphor.diagram.tests.fixtures import (
+    diagram,
+    element_factory,
+    event_manager,
+    modeling_language,
+)
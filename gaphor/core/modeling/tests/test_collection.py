@@ -134,3 +134,50 @@ def test_swap():
     c.swap("a", "c")
     assert c.items == ["c", "b", "a"]
     assert o.events
+
+
+def test_items_keep_insertion_order():
+    c: collection[str] = collection(None, None, str)
+    for v in "abcd":
+        c._add(v)
+    c._discard("b")
+    c._add("b")
+
+    assert c.items == ["a", "c", "d", "b"]
+    assert list(c) == ["a", "c", "d", "b"]
+    assert c.index("b") == 3
+    assert "b" in c
+    assert len(c) == 4
+
+
+def test_discard_unknown_item():
+    c: collection[str] = collection(None, None, str)
+    c._add("a")
+
+    assert not c._discard("b")
+    assert c._discard("a")
+    assert not c
+
+
+def test_move_to_end():
+    c: collection[str] = collection(None, None, str)
+    c.items = ["a", "b", "c"]  # type: ignore[assignment]
+    c._move_to_end("a")
+
+    assert c.items == ["b", "c", "a"]
+
+
+def test_membership_after_swap_and_order():
+    o = MockElement()
+    c: collection[str] = collection(None, o, str)
+    c.items = ["b", "c", "a"]  # type: ignore[assignment]
+    c.swap("b", "a")
+    c._discard("c")
+
+    assert c.items == ["a", "b"]
+
+    c.order(lambda e: e != "b")
+
+    assert c.items == ["b", "a"]
+    assert "a" in c
+    assert "c" not in c
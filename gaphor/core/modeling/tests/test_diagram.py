@@ -93,3 +93,67 @@ def test_remove_presentation_triggers_view(element_factory):
     assert example.diagram is None
     assert example not in diagram.ownedPresentation
     assert example in view.removed_items
+
+
+def test_lookup_presentation(element_factory):
+    diagram = element_factory.create(Diagram)
+    example = diagram.create(Example)
+
+    assert element_factory.lookup_presentation(example.id) is example
+    assert diagram.lookup(example.id) is example
+
+
+def test_lookup_presentation_on_other_diagram(element_factory):
+    diagram = element_factory.create(Diagram)
+    other = element_factory.create(Diagram)
+    example = diagram.create(Example)
+
+    assert other.lookup(example.id) is None
+
+
+def test_unlinked_presentation_can_not_be_looked_up(element_factory):
+    diagram = element_factory.create(Diagram)
+    example = diagram.create(Example)
+
+    example.unlink()
+
+    assert element_factory.lookup_presentation(example.id) is None
+    assert diagram.lookup(example.id) is None
+
+
+def test_presentations_are_flushed(element_factory):
+    diagram = element_factory.create(Diagram)
+    example = diagram.create(Example)
+
+    element_factory.flush()
+
+    assert element_factory.lookup_presentation(example.id) is None
+
+
+def test_item_bounds_are_indexed(element_factory):
+    diagram = element_factory.create(Diagram)
+    presentation = diagram.create(Example)
+
+    diagram.set_item_bounds(presentation, (0, 0, 100, 50))
+
+    assert diagram.spatial_index.find_intersect((50, 25, 10, 10)) == {presentation}
+
+
+def test_updated_item_is_removed_from_index(element_factory):
+    diagram = element_factory.create(Diagram)
+    presentation = diagram.create(Example)
+    diagram.set_item_bounds(presentation, (0, 0, 100, 50))
+
+    presentation.request_update()
+
+    assert presentation not in diagram.spatial_index
+
+
+def test_unlinked_item_is_removed_from_index(element_factory):
+    diagram = element_factory.create(Diagram)
+    presentation = diagram.create(Example)
+    diagram.set_item_bounds(presentation, (0, 0, 100, 50))
+
+    presentation.unlink()
+
+    assert presentation not in diagram.spatial_index
@@ -42,6 +42,19 @@ def test_diagram_is_parent_of_item(diagram: Diagram):
     assert node.parent().name() == "diagram"
 
 
+def test_styled_items_share_parent_and_children(diagram: Diagram):
+    parent = diagram.create(DemoItem)
+    child = diagram.create(DemoItem, parent=parent)
+    styled_diagram = StyledDiagram(diagram)
+
+    node = styled_diagram.styled_item(child)
+
+    assert node.parent() is styled_diagram.styled_item(parent)
+    assert node.parent().parent() is styled_diagram
+    assert list(styled_diagram.children()) == [node.parent()]
+    assert list(node.parent().children()) == [node]
+
+
 def test_diagram_has_no_parent(diagram):
     node = StyledDiagram(diagram)
 
@@ -6,6 +6,7 @@ from gaphor.core.modeling import Element, ElementFactory
 from gaphor.core.modeling.elementdispatcher import ElementDispatcher, EventWatcher
 from gaphor.core.modeling.properties import association
 from gaphor.tests import TestCase
+from gaphor.transaction import Transaction
 from gaphor.UML.modelinglanguage import UMLModelingLanguage
 
 
@@ -194,6 +195,72 @@ def test_notification_of_change(
     assert len(event.events) == 2, event.events
 
 
+def test_coalesce_notifications_in_transaction(
+    dispatcher, uml_transition, uml_constraint, event, event_manager
+):
+    dispatcher.coalesce = True
+    element = uml_transition
+    element.guard = uml_constraint
+    dispatcher.subscribe(event.handler, element, "guard.specification")
+
+    with Transaction(event_manager):
+        for n in range(10):
+            uml_constraint.specification = f"x{n}"
+        assert not event.events
+
+    assert len(event.events) == 1
+    assert event.events[0].new_value == "x9"
+    assert dispatcher.dispatched == 1
+    assert dispatcher.coalesced == 9
+
+
+def test_coalesce_follows_path_changes(
+    dispatcher, uml_transition, uml_constraint, event, event_manager, element_factory
+):
+    dispatcher.coalesce = True
+    element = uml_transition
+    element.guard = uml_constraint
+    dispatcher.subscribe(event.handler, element, "guard.specification")
+
+    with Transaction(event_manager):
+        element.guard = element_factory.create(UML.Constraint)
+        element.guard.specification = "x"
+        uml_constraint.specification = "y"
+
+    assert [e.property for e in event.events] == [
+        UML.Transition.guard,
+        UML.Constraint.specification,
+    ]
+    assert event.events[1].element is element.guard
+
+
+def test_coalesce_skips_unsubscribed_handlers(
+    dispatcher, uml_transition, uml_constraint, event, event_manager
+):
+    dispatcher.coalesce = True
+    dispatcher.subscribe(event.handler, uml_transition, "guard")
+
+    with Transaction(event_manager):
+        uml_transition.guard = uml_constraint
+        dispatcher.unsubscribe(event.handler)
+
+    assert not event.events
+
+
+def test_no_coalescing_outside_transaction(
+    dispatcher, uml_transition, uml_constraint, event
+):
+    dispatcher.coalesce = True
+    uml_transition.guard = uml_constraint
+    dispatcher.subscribe(event.handler, uml_transition, "guard.specification")
+
+    uml_constraint.specification = "x"
+    uml_constraint.specification = "y"
+
+    assert len(event.events) == 2
+    assert dispatcher.coalesced == 0
+
+
 def test_notification_with_composition(
     dispatcher, uml_class, uml_operation, uml_constraint, event
 ):
@@ -236,6 +303,68 @@ def test_notification_with_incompatible_elements(
     assert len(event.events) == 2, event.events
 
 
+def test_event_watcher_follows_path_changes(
+    dispatcher, uml_class, uml_operation, uml_parameter, event
+):
+    EventWatcher(uml_class, dispatcher, event.handler).watch(
+        "ownedOperation.name"
+    ).watch("ownedOperation.formalParameter.name")
+
+    uml_class.ownedOperation = uml_operation
+    uml_operation.formalParameter = uml_parameter
+    del event.events[:]
+
+    uml_operation.name = "op"
+    uml_parameter.name = "p"
+
+    assert [e.property for e in event.events] == [
+        UML.Operation.name,
+        UML.Parameter.name,
+    ]
+
+    del uml_class.ownedOperation[uml_operation]
+    del event.events[:]
+    uml_operation.name = "other"
+    uml_parameter.name = "other"
+
+    assert not event.events
+
+
+def test_event_watcher_calls_handler_once_per_event(dispatcher, uml_class, event):
+    EventWatcher(uml_class, dispatcher, event.handler).watch("name").watch(
+        "ownedOperation.name"
+    ).watch("ownedOperation.parameter")
+
+    uml_class.name = "c"
+
+    assert len(event.events) == 1
+
+
+def test_event_watchers_share_plans(dispatcher, element_factory, event):
+    for _ in range(3):
+        EventWatcher(
+            element_factory.create(UML.Class), dispatcher, event.handler
+        ).watch("name").watch("ownedOperation.name")
+    dispatcher.on_model_loaded(None)
+
+    assert len(dispatcher._plans) == 1
+
+
+def test_event_watcher_unsubscribe_all(dispatcher, uml_class, uml_operation, event):
+    uml_class.ownedOperation = uml_operation
+    watcher = EventWatcher(uml_class, dispatcher, event.handler).watch(
+        "ownedOperation.name"
+    )
+    dispatcher.on_model_loaded(None)
+    assert dispatcher._watches
+
+    watcher.unsubscribe_all()
+    uml_operation.name = "op"
+
+    assert not dispatcher._watches
+    assert not event.events
+
+
 class A(Element):
     one: association
     two: association
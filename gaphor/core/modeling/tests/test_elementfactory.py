@@ -4,7 +4,7 @@ import pytest
 
 from gaphor.core import event_handler
 from gaphor.core.eventmanager import EventManager
-from gaphor.core.modeling import ElementFactory
+from gaphor.core.modeling import Element, ElementFactory
 from gaphor.core.modeling.event import (
     ElementCreated,
     ElementDeleted,
@@ -13,7 +13,7 @@ from gaphor.core.modeling.event import (
     ServiceEvent,
 )
 from gaphor.core.modeling.presentation import Presentation
-from gaphor.UML import Parameter
+from gaphor.UML import Class, Package, Parameter
 
 
 @pytest.fixture
@@ -43,6 +43,72 @@ def test_flush(factory):
     assert len(list(factory.values())) == 0, list(factory.values())
 
 
+def test_select_by_type_is_kept_up_to_date(factory):
+    p1 = factory.create(Parameter)
+    assert factory.lselect(Parameter) == [p1]
+
+    p2 = factory.create(Parameter)
+    c = factory.create(Class)
+    assert factory.lselect(Parameter) == [p1, p2]
+    assert factory.lselect(Class) == [c]
+
+    p1.unlink()
+    assert factory.lselect(Parameter) == [p2]
+
+
+def test_select_by_base_type(factory):
+    p = factory.create(Parameter)
+    c = factory.create(Class)
+
+    assert factory.lselect(Element) == [p, c]
+    assert factory.lselect(Element) == factory.lselect(lambda e: True)
+
+
+def test_select_by_type_after_flush(factory):
+    factory.create(Parameter)
+    assert factory.lselect(Parameter)
+
+    factory.flush()
+    assert factory.lselect(Parameter) == []
+
+    p = factory.create(Parameter)
+    assert factory.lselect(Parameter) == [p]
+
+
+def test_select_by_name(factory):
+    c = factory.create(Class)
+    c.name = "Foo"
+    assert list(factory.select_by("name", "Foo")) == [c]
+
+    c.name = "Bar"
+    assert list(factory.select_by("name", "Foo")) == []
+    assert list(factory.select_by("name", "Bar")) == [c]
+
+    c.unlink()
+    assert list(factory.select_by("name", "Bar")) == []
+
+
+def test_select_by_owner(factory):
+    package = factory.create(Package)
+    c = factory.create(Class)
+    assert c in factory.select_by("owner", None)
+
+    c.package = package
+    assert c not in factory.select_by("owner", None)
+    assert list(factory.select_by("owner", package)) == [c]
+
+    del c.package
+    assert list(factory.select_by("owner", package)) == []
+
+
+def test_custom_index(factory):
+    factory.add_index("default value", lambda e: e.defaultValue, "defaultValue")
+    p = factory.create(Parameter)
+    p.defaultValue = "1"
+
+    assert list(factory.select_by("default value", "1")) == [p]
+
+
 def test_without_application(factory):
     factory.create(Parameter)
     assert factory.size() == 1, factory.size()
@@ -0,0 +1,218 @@
+import io
+
+import pytest
+
+from gaphor import UML
+from gaphor.application import distribution
+from gaphor.core.modeling import Diagram
+from gaphor.core.modeling.fingerprints import Fingerprints
+from gaphor.storage import storage
+from gaphor.storage.xmlwriter import XMLWriter
+from gaphor.UML.classes import ClassItem
+
+
+@pytest.fixture
+def fingerprints(event_manager, element_factory):
+    fingerprints = Fingerprints(event_manager, element_factory)
+    yield fingerprints
+    fingerprints.shutdown()
+
+
+def test_fingerprint_is_stable(fingerprints, element_factory):
+    klass = element_factory.create(UML.Class)
+    klass.name = "Foo"
+
+    digest = fingerprints.element(klass)
+    fingerprints.clear()
+
+    assert fingerprints.element(klass) == digest
+
+
+def test_fingerprint_changes_with_element(fingerprints, element_factory):
+    klass = element_factory.create(UML.Class)
+    digest = fingerprints.element(klass)
+
+    klass.name = "Foo"
+
+    assert fingerprints.element(klass) != digest
+
+
+def test_fingerprint_changes_with_association(fingerprints, element_factory):
+    klass = element_factory.create(UML.Class)
+    digest = fingerprints.element(klass)
+
+    klass.ownedAttribute = element_factory.create(UML.Property)
+
+    assert fingerprints.element(klass) != digest
+
+
+def test_diagram_fingerprint_changes_with_subject(
+    fingerprints, element_factory, diagram
+):
+    klass = element_factory.create(UML.Class)
+    diagram.create(ClassItem, subject=klass)
+    digest = fingerprints.diagram(diagram)
+
+    klass.name = "Foo"
+
+    assert fingerprints.diagram(diagram) != digest
+
+
+def test_diagram_fingerprint_changes_with_attribute_type(
+    fingerprints, element_factory, diagram
+):
+    klass = element_factory.create(UML.Class)
+    attr = element_factory.create(UML.Property)
+    attr.type = element_factory.create(UML.Class)
+    klass.ownedAttribute = attr
+    diagram.create(ClassItem, subject=klass)
+    digest = fingerprints.diagram(diagram)
+
+    attr.type.name = "Bar"
+
+    assert fingerprints.diagram(diagram) != digest
+
+
+def test_diagram_fingerprint_changes_with_parameter(
+    fingerprints, element_factory, diagram
+):
+    klass = element_factory.create(UML.Class)
+    operation = element_factory.create(UML.Operation)
+    parameter = element_factory.create(UML.Parameter)
+    operation.formalParameter = parameter
+    klass.ownedOperation = operation
+    diagram.create(ClassItem, subject=klass)
+    digest = fingerprints.diagram(diagram)
+
+    parameter.name = "arg"
+
+    assert fingerprints.diagram(diagram) != digest
+
+
+def test_diagram_fingerprint_changes_with_stereotype_slot(
+    fingerprints, element_factory, diagram
+):
+    klass = element_factory.create(UML.Class)
+    instance = element_factory.create(UML.InstanceSpecification)
+    slot = element_factory.create(UML.Slot)
+    instance.slot = slot
+    klass.appliedStereotype = instance
+    diagram.create(ClassItem, subject=klass)
+    digest = fingerprints.diagram(diagram)
+
+    slot.value = "tagged"
+
+    assert fingerprints.diagram(diagram) != digest
+
+
+def test_diagram_fingerprint_changes_with_items(fingerprints, element_factory, diagram):
+    digest = fingerprints.diagram(diagram)
+
+    item = diagram.create(ClassItem, subject=element_factory.create(UML.Class))
+    created = fingerprints.diagram(diagram)
+    item.unlink()
+
+    assert created != digest
+    assert fingerprints.diagram(diagram) == digest
+
+
+def test_diagram_fingerprint_does_not_change_with_other_elements(
+    fingerprints, element_factory, diagram
+):
+    diagram.create(ClassItem, subject=element_factory.create(UML.Class))
+    other = element_factory.create(UML.Class)
+    digest = fingerprints.diagram(diagram)
+
+    other.name = "Foo"
+
+    assert fingerprints.diagram(diagram) == digest
+
+
+def test_model_fingerprint(fingerprints, element_factory):
+    klass = element_factory.create(UML.Class)
+    digest = fingerprints.model()
+
+    klass.name = "Foo"
+    changed = fingerprints.model()
+    klass.name = None
+
+    assert changed != digest
+    assert fingerprints.model() == digest
+
+
+def test_model_fingerprint_hashes_every_element_once(
+    fingerprints, element_factory, monkeypatch
+):
+    klass = element_factory.create(UML.Class)
+    for _ in range(2):
+        element_factory.create(Diagram).create(ClassItem, subject=klass)
+    hashed = []
+
+    def fingerprint(element):
+        hashed.append(element)
+        return element.id
+
+    monkeypatch.setattr("gaphor.core.modeling.fingerprints.fingerprint", fingerprint)
+    fingerprints.model()
+
+    assert len(hashed) == len(set(hashed))
+    assert {klass, *klass.presentation} <= set(hashed)
+
+
+def test_model_fingerprint_does_not_create_lazy_diagram_items(
+    fingerprints, element_factory, modeling_language
+):
+    path = distribution().locate_file("test-models/simple-items.gaphor")
+    # Loading can change a model slightly, e.g. lines are connected
+    storage.load(path, element_factory, modeling_language)
+    out = io.StringIO()
+    storage.save(XMLWriter(out), element_factory)
+    storage.load(io.StringIO(out.getvalue()), element_factory, modeling_language)
+    eager = fingerprints.model()
+
+    storage.load(
+        io.StringIO(out.getvalue()), element_factory, modeling_language, lazy=True
+    )
+    lazy_diagrams = element_factory.lselect(lambda e: getattr(e, "lazy_canvas", None))
+    lazy = fingerprints.model()
+
+    assert lazy_diagrams
+    assert all(diagram.lazy_canvas for diagram in lazy_diagrams)
+    assert lazy == eager
+
+
+def test_memo_is_kept_until_element_changes(fingerprints, element_factory):
+    klass = element_factory.create(UML.Class)
+    calls = []
+
+    def compute(element):
+        calls.append(element)
+        return element.name
+
+    fingerprints.memo(klass, "name", compute)
+    fingerprints.memo(klass, "name", compute)
+    klass.name = "Foo"
+
+    assert fingerprints.memo(klass, "name", compute) == "Foo"
+    assert len(calls) == 2
+
+
+def test_save_with_fingerprints(fingerprints, element_factory, diagram):
+    klass = element_factory.create(UML.Class)
+    diagram.create(ClassItem, subject=klass)
+
+    def save():
+        out = io.StringIO()
+        for _ in storage.save_generator(XMLWriter(out), element_factory, fingerprints):
+            pass
+        return out.getvalue()
+
+    first = save()
+    klass.name = "Foo"
+    second = save()
+
+    out = io.StringIO()
+    storage.save(XMLWriter(out), element_factory)
+
+    assert "Foo" not in first
+    assert second == out.getvalue()
@@ -0,0 +1,62 @@
+import pytest
+
+from gaphor.core.modeling.listmixins import attribute_comparison, matcher
+
+
+class A:
+    def __init__(self, name, **kwargs):
+        self.name = name
+        self.__dict__.update(kwargs)
+
+
+ELEMENTS = [A("a"), A("b", b=A("b")), A("c", b=A("c")), A(None), A(1)]
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        'it.name == "a"',
+        'it.name != "a"',
+        '"b" == it.name',
+        "it.name == None",
+        "it.name != None",
+        "it.name == 1",
+        "it.name == -1",
+        "it.name != True",
+        'it.name == ("a", 1)',
+        'it.b.name == "b"',
+        'it.b.name != "b"',
+        'it.missing != "a"',
+    ],
+)
+def test_attribute_comparison_matches_like_eval(expr):
+    compiled = compile(expr, "<test>", "eval")
+
+    def evaluated(element):
+        try:
+            return bool(eval(compiled, {}, {"it": element}))
+        except AttributeError:
+            return False
+
+    assert attribute_comparison(expr)
+    assert [matcher(expr)(e) for e in ELEMENTS] == [evaluated(e) for e in ELEMENTS]
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "it.name",
+        "it.name == it.b",
+        'it.name == "a" == it.b',
+        'it.name < "b"',
+        'other.name == "a"',
+        'it.name in ("a", "b")',
+    ],
+)
+def test_other_expressions_are_evaluated(expr):
+    assert attribute_comparison(expr) is None
+
+
+def test_matchers_are_cached():
+    assert matcher("it.name") is matcher("it.name")
+    assert matcher('it.name == "a"') is matcher('it.name == "a"')
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import gc
+import weakref
 from typing import List, Optional
 
 from gaphor.core import event_handler
@@ -428,6 +430,195 @@ def test_derivedunion():
     assert d in a.u
 
 
+def test_derivedunion_is_invalidated_per_element():
+    class A(Element):
+        a: relation_many[A]
+        u: relation_many[A]
+
+    A.a = association("a", A)
+    A.u = derivedunion("u", A, 0, "*", A.a)
+
+    a1 = A()
+    a2 = A()
+    a1.a = b = A()
+    a2.a = c = A()
+    assert list(a1.u) == [b]
+    assert list(a2.u) == [c]
+
+    misses = A.u.cache_misses
+    a1.a = d = A()
+
+    assert list(a2.u) == [c]
+    assert A.u.cache_misses == misses
+    assert set(a1.u) == {b, d}
+    assert A.u.cache_misses == misses + 1
+
+
+def test_derivedunion_of_derivedunion_is_invalidated():
+    class A(Element):
+        a: relation_many[A]
+        u: relation_many[A]
+        uu: relation_many[A]
+
+    A.a = association("a", A)
+    A.u = derivedunion("u", A, 0, "*", A.a)
+    A.uu = derivedunion("uu", A, 0, "*", A.u)
+
+    a = A()
+    assert list(a.uu) == []
+
+    a.a = b = A()
+
+    assert list(a.uu) == [b]
+
+
+def test_derivedunion_cache_hits():
+    class A(Element):
+        a: relation_many[A]
+        u: relation_many[A]
+
+    A.a = association("a", A)
+    A.u = derivedunion("u", A, 0, "*", A.a)
+
+    a = A()
+    a.u
+    a.u
+
+    assert A.u.cache_misses == 1
+    assert A.u.cache_hits == 1
+
+
+def test_memoized_derived_is_computed_once():
+    class A(Element):
+        name: attribute[str]
+        upper: relation_one[str]
+
+    calls = []
+
+    def upper(self):
+        calls.append(self)
+        return [self.name.upper() if self.name else None]
+
+    A.name = attribute("name", str)
+    A.upper = derived("upper", str, 0, 1, upper, memoize=True)
+
+    a = A()
+    a.name = "a"
+
+    assert a.upper == "A"
+    assert a.upper == "A"
+    assert len(calls) == 1
+    assert A.upper.cache_misses == 1
+    assert A.upper.cache_hits == 1
+
+
+def test_memoized_derived_is_invalidated_when_a_read_property_changes():
+    class A(Element):
+        name: attribute[str]
+        other: relation_one[A]
+        other_name: relation_one[str]
+
+    A.name = attribute("name", str)
+    A.other = association("other", A, upper=1)
+    A.other_name = derived(
+        "other_name",
+        str,
+        0,
+        1,
+        lambda self: [self.other and self.other.name],
+        memoize=True,
+    )
+
+    a = A()
+    b = A()
+    c = A()
+    b.name = "b"
+    c.name = "c"
+
+    assert a.other_name is None
+    a.other = b
+    assert a.other_name == "b"
+    b.name = "bb"
+    assert a.other_name == "bb"
+    a.other = c
+    assert a.other_name == "c"
+    b.name = "bbb"
+    assert a.other_name == "c"
+
+
+def test_memoized_derived_depending_on_memoized_derived():
+    class A(Element):
+        name: attribute[str]
+        upper: relation_one[str]
+        twice: relation_one[str]
+
+    A.name = attribute("name", str)
+    A.upper = derived(
+        "upper", str, 0, 1, lambda self: [self.name and self.name.upper()], memoize=True
+    )
+    A.twice = derived(
+        "twice", str, 0, 1, lambda self: [self.upper and self.upper * 2], memoize=True
+    )
+
+    a = A()
+    a.name = "a"
+    assert a.twice == "AA"
+
+    a.name = "b"
+    assert a.twice == "BB"
+
+
+def test_memoized_derived_does_not_keep_dependent_elements_alive():
+    class A(Element):
+        name: attribute[str]
+        other: relation_one[A]
+        other_name: relation_one[str]
+
+    A.name = attribute("name", str)
+    A.other = association("other", A, upper=1)
+    A.other_name = derived(
+        "other_name",
+        str,
+        0,
+        1,
+        lambda self: [self.other and self.other.name],
+        memoize=True,
+    )
+
+    a = A()
+    b = A()
+    b.name = "b"
+    a.other = b
+    assert a.other_name == "b"
+
+    a_ref = weakref.ref(a)
+    del a
+    gc.collect()
+
+    assert a_ref() is None
+    b.name = "bb"
+
+
+def test_unlink_clears_memoized_dependents():
+    class A(Element):
+        name: attribute[str]
+        upper: relation_one[str]
+
+    A.name = attribute("name", str)
+    A.upper = derived(
+        "upper", str, 0, 1, lambda self: [self.name and self.name.upper()], memoize=True
+    )
+
+    a = A()
+    a.name = "a"
+    assert a.upper == "A"
+    assert "_derived_dependents" in a.__dict__
+
+    a.unlink()
+
+    assert "_derived_dependents" not in a.__dict__
+
+
 def test_derivedunion_notify_for_single_derived_property():
     class A(Element):
         pass
@@ -525,3 +716,47 @@ def test_composite():
     a.unlink()
     assert a.is_unlinked
     assert b.is_unlinked
+
+
+def test_umlproperties_are_sorted_by_name():
+    class A(Element):
+        pass
+
+    A.b = attribute("b", str)
+    A.a = attribute("a", str)
+
+    names = [p.name for p in A.umlproperties()]
+
+    assert names.index("a") < names.index("b")
+
+
+def test_umlproperties_include_properties_added_later():
+    class A(Element):
+        pass
+
+    class B(A):
+        pass
+
+    A.a = attribute("a", str)
+    assert A.a in B.umlproperties()
+
+    A.b = attribute("b", str)
+    assert A.b in A.umlproperties()
+    assert A.b in B.umlproperties()
+
+
+def test_umlproperties_include_association_stubs():
+    class A(Element):
+        pass
+
+    class B(Element):
+        pass
+
+    A.one = association("one", B, upper=1)
+    stubs_before = [p for p in B.umlproperties() if p not in Element.umlproperties()]
+
+    A().one = B()
+
+    stubs_after = [p for p in B.umlproperties() if p not in Element.umlproperties()]
+    assert not stubs_before
+    assert stubs_after == [A.one.stub]
@@ -0,0 +1,60 @@
+import pytest
+
+from gaphor.core.modeling.spatialindex import SpatialIndex
+
+
+@pytest.fixture
+def index():
+    index = SpatialIndex(cell_size=10)
+    for i in range(10):
+        index.add(i, (i * 20, 0, 15, 15), data=f"item {i}")
+    return index
+
+
+def test_find_items(index):
+    assert index.find_intersect((0, 0, 30, 10)) == {0, 1}
+
+
+def test_find_items_outside_cells(index):
+    assert index.find_intersect((-100, -100, 10, 10)) == set()
+
+
+def test_find_items_in_large_area(index):
+    assert index.find_intersect((-1000, -1000, 2000, 2000)) == set(range(10))
+
+
+def test_find_items_with_negative_coordinates():
+    index = SpatialIndex(cell_size=10)
+    index.add("a", (-25, -25, 10, 10))
+
+    assert index.find_intersect((-20, -20, 1, 1)) == {"a"}
+    assert index.find_intersect((0, 0, 1, 1)) == set()
+
+
+def test_move_item(index):
+    index.add(0, (500, 500, 10, 10))
+
+    assert index.find_intersect((0, 0, 5, 5)) == set()
+    assert index.find_intersect((505, 505, 1, 1)) == {0}
+    assert index.get_bounds(0) == (500, 500, 10, 10)
+    assert len(index) == 10
+
+
+def test_remove_item(index):
+    index.remove(1)
+    index.remove(1)
+
+    assert 1 not in index
+    assert index.find_intersect((20, 0, 10, 10)) == set()
+    assert len(index) == 9
+
+
+def test_item_data(index):
+    assert index.get_data(3) == "item 3"
+
+
+def test_clear(index):
+    index.clear()
+
+    assert len(index) == 0
+    assert index.find_intersect((0, 0, 200, 20)) == set()
@@ -26,7 +26,7 @@ from gaphor.core.styling.properties import (
     TextDecoration,
     VerticalAlign,
 )
-from gaphor.core.styling.selectors import compile_selector_list
+from gaphor.core.styling.selectors import CompiledSelector, compile_selector_list
 
 
 class StyleNode(Protocol):
@@ -53,31 +53,81 @@ def merge_styles(styles) -> Style:
     return style
 
 
+Rule = Tuple[Tuple[int, int, int], int, Dict[str, object], CompiledSelector]
+
+
 class CompiledStyleSheet:
+    """A style sheet that can be matched against style nodes.
+
+    Only rules for the name of a node, or rules that match any node, are
+    evaluated. Rules that do not depend on the parent or children of a
+    node are evaluated once for every combination of node name, state
+    and attribute values the rules depend on.
+    """
+
+    MAX_CACHED_MATCHES = 10000
+
     def __init__(self, css: str):
         self.selectors = [
             (selspec[0], selspec[1], order, declarations)
             for order, (selspec, declarations) in enumerate(parse_style_sheet(css))
-            if selspec != "error"
+            if selspec != "error" and isinstance(declarations, dict)
         ]
+        self._candidates: Dict[str, Tuple[List[Rule], List[Rule], Tuple[str, ...]]] = {}
+        self._matches: Dict[tuple, Tuple[List[Rule], Style]] = {}
 
-    def match(self, node: StyleNode) -> Style:
-        results = sorted(
+    def _candidates_for(
+        self, name: str
+    ) -> Tuple[List[Rule], List[Rule], Tuple[str, ...]]:
+        rules = sorted(
             (
-                (specificity, order, declarations)
+                (specificity, order, declarations, pred)
                 for pred, specificity, order, declarations in self.selectors
-                if pred(node)
+                if pred.name in (name, None)
             ),
             key=MATCH_SORT_KEY,
         )
-        return merge_styles(decl for _, _, decl in results)
+        local_rules = [r for r in rules if r[3].attributes is not None]
+        other_rules = [r for r in rules if r[3].attributes is None]
+        attribute_names = {a for r in local_rules for a in r[3].attributes or ()}
+        return local_rules, other_rules, tuple(sorted(attribute_names))
+
+    def match(self, node: StyleNode) -> Style:
+        name = node.name()
+        try:
+            local_rules, other_rules, attribute_names = self._candidates[name]
+        except KeyError:
+            local_rules, other_rules, attribute_names = self._candidates[
+                name
+            ] = self._candidates_for(name)
+
+        state = tuple(node.state())
+        states = set(state)
+        key = (name, state, tuple(node.attribute(a) for a in attribute_names))
+        try:
+            local_matches, style = self._matches[key]
+        except KeyError:
+            local_matches = [
+                r for r in local_rules if r[3].state <= states and r[3](node)
+            ]
+            style = merge_styles(decl for _, _, decl, _ in local_matches)
+            if len(self._matches) >= self.MAX_CACHED_MATCHES:
+                self._matches.clear()
+            self._matches[key] = local_matches, style
+
+        other_matches = [r for r in other_rules if r[3].state <= states and r[3](node)]
+        if not other_matches:
+            return style.copy()
+
+        results = sorted(local_matches + other_matches, key=MATCH_SORT_KEY)
+        return merge_styles(decl for _, _, decl, _ in results)
 
 
 def parse_style_sheet(
     css,
 ) -> Generator[
     Union[
-        Tuple[Tuple[Callable[[object], bool], Tuple[int, int, int]], Dict[str, object]],
+        Tuple[Tuple[CompiledSelector, Tuple[int, int, int]], Dict[str, object]],
         Tuple[Literal["error"], Union[tinycss2.ast.ParseError, SelectorError]],
     ],
     None,
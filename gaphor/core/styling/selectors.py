@@ -3,6 +3,7 @@ Sapin and Guillaume Ayoub."""
 
 import re
 from functools import singledispatch
+from typing import Callable, FrozenSet, Optional
 
 from gaphor.core.styling import parser
 
@@ -18,11 +19,77 @@ def compile_selector_list(input):
     Returns a list of compiled selectors.
     """
     return [
-        (compile_node(selector), selector.specificity)
+        (CompiledSelector(compile_node(selector), selector), selector.specificity)
         for selector in parser.parse(input)
     ]
 
 
+STATES = ("root", "hover", "focus", "active", "drop")
+
+
+class CompiledSelector:
+    """A compiled selector, with the information needed to index it.
+
+    ``name`` is the name a node should have (``None`` matches any node)
+    and ``state`` the states a node should be in. A selector is local if
+    it only depends on the name, attributes and state of a node, not on
+    its parent or children. For local selectors ``attributes`` contains
+    the names of the attributes the selector depends on.
+    """
+
+    __slots__ = ("predicate", "name", "state", "attributes")
+
+    def __init__(self, predicate: Callable[[object], bool], selector):
+        self.predicate = predicate
+        rightmost = selector
+        while isinstance(rightmost, parser.CombinedSelector):
+            rightmost = rightmost.right
+        self.name: Optional[str] = next(
+            (
+                sel.lower_local_name
+                for sel in rightmost.simple_selectors
+                if isinstance(sel, parser.LocalNameSelector)
+            ),
+            None,
+        )
+        self.state: FrozenSet[str] = frozenset(
+            sel.name
+            for sel in rightmost.simple_selectors
+            if isinstance(sel, parser.PseudoClassSelector) and sel.name in STATES
+        )
+        self.attributes: Optional[FrozenSet[str]] = local_attributes(selector)
+
+    def __call__(self, el) -> bool:
+        return self.predicate(el)
+
+
+def local_attributes(selector) -> Optional[FrozenSet[str]]:
+    """The attribute names a local selector depends on.
+
+    Returns ``None`` if the selector is not local.
+    """
+    if not isinstance(selector, parser.CompoundSelector):
+        return None
+    names: FrozenSet[str] = frozenset()
+    for sel in selector.simple_selectors:
+        if isinstance(sel, parser.AttributeSelector):
+            names |= {sel.lower_name}
+        elif isinstance(sel, parser.PseudoClassSelector):
+            if sel.name not in STATES:
+                return None
+        elif isinstance(sel, parser.FunctionalPseudoClassSelector):
+            if sel.name not in ("is", "not"):
+                return None
+            for arg in parser.parse(sel.arguments):
+                arg_names = local_attributes(arg)
+                if arg_names is None:
+                    return None
+                names |= arg_names
+        elif not isinstance(sel, parser.LocalNameSelector):
+            return None
+    return names
+
+
 @singledispatch
 def compile_node(selector):
     """Dynamic dispatch selector nodes.
@@ -45,15 +112,70 @@ def compile_name_selector(selector: parser.LocalNameSelector):
 
 def ancestors(el):
     p = el.parent()
-    if p:
+    while p:
         yield p
-        yield from ancestors(p)
+        p = p.parent()
 
 
 def descendants(el):
-    for c in el.children():
-        yield c
-        yield from descendants(c)
+    stack = [el.children()]
+    while stack:
+        for c in stack[-1]:
+            yield c
+            stack.append(c.children())
+            break
+        else:
+            stack.pop()
+
+
+def any_ancestor(el, predicate):
+    """Test if ``predicate`` holds for any ancestor of ``el``.
+
+    Nodes can provide a ``match_cache`` dict. The result is then cached,
+    so an ancestor chain is walked only once for a predicate.
+    """
+    key = (any_ancestor, predicate)
+    result = False
+    visited = []
+    p = el.parent()
+    while p:
+        cache = getattr(p, "match_cache", None)
+        if cache is not None:
+            try:
+                result = cache[key]
+                break
+            except KeyError:
+                visited.append(cache)
+        if predicate(p):
+            result = True
+            break
+        p = p.parent()
+    for cache in visited:
+        cache[key] = result
+    return result
+
+
+def any_descendant(el, predicate):
+    """Test if ``predicate`` holds for any descendant of ``el``.
+
+    Results are cached like for ``any_ancestor()``.
+    """
+    if getattr(el, "match_cache", None) is None:
+        return any(predicate(c) for c in descendants(el))
+
+    key = (any_descendant, predicate)
+
+    def self_or_descendant(node):
+        cache = node.match_cache
+        try:
+            return cache[key]
+        except KeyError:
+            result = cache[key] = predicate(node) or any(
+                self_or_descendant(c) for c in node.children()
+            )
+            return result
+
+    return any(self_or_descendant(c) for c in el.children())
 
 
 @compile_node.register
@@ -62,7 +184,7 @@ def compile_combined_selector(selector: parser.CombinedSelector):
     if selector.combinator == " ":
 
         def left(el):
-            return any(left_inside(e) for e in ancestors(el))
+            return any_ancestor(el, left_inside)
 
     elif selector.combinator == ">":
 
@@ -111,7 +233,7 @@ def compile_pseudo_class_selector(selector: parser.PseudoClassSelector):
     name = selector.name
     if name == "empty":
         return lambda el: not next(el.children(), 0)
-    elif name in ("root", "hover", "focus", "active", "drop"):
+    elif name in STATES:
         return lambda el: name in el.state()
     else:
         raise parser.SelectorError("Unknown pseudo-class", name)
@@ -128,9 +250,11 @@ def compile_functional_pseudo_class_selector(
     sub_selectors = compile_selector_list(selector.arguments)
     selector.specificity = max(spec for _, spec in sub_selectors)
     if name == "has":
-        return lambda el: any(
-            any(sel(c) for sel, _ in sub_selectors) for c in descendants(el)
-        )
+
+        def has(el):
+            return any(sel(el) for sel, _ in sub_selectors)
+
+        return lambda el: any_descendant(el, has)
     elif name == "is":
         return lambda el: any(sel(el) for sel, _ in sub_selectors)
     elif name == "not":
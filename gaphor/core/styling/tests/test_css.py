@@ -167,6 +167,91 @@ def test_empty_compiled_style_sheet():
     assert props == {}
 
 
+def test_compiled_style_sheet_orders_rules_by_specificity():
+    css = """
+    mytype[subject] {
+        font-size: 3
+    }
+    mytype {
+        font-size: 2
+    }
+    * {
+        font-size: 1
+    }
+    """
+
+    compiled_style_sheet = CompiledStyleSheet(css)
+
+    assert compiled_style_sheet.match(Node("other")).get("font-size") == 1
+    assert compiled_style_sheet.match(Node("mytype")).get("font-size") == 2
+    assert (
+        compiled_style_sheet.match(Node("mytype", attributes={"subject": "foo"})).get(
+            "font-size"
+        )
+        == 3
+    )
+
+
+def test_compiled_style_sheet_matches_changed_attributes():
+    css = """
+    mytype[name=foo] {
+        font-size: 42
+    }
+    """
+    compiled_style_sheet = CompiledStyleSheet(css)
+    attributes = {"name": "foo"}
+    node = Node("mytype", attributes=attributes)
+
+    assert compiled_style_sheet.match(node).get("font-size") == 42
+
+    attributes["name"] = "bar"
+
+    assert compiled_style_sheet.match(node).get("font-size") is None
+
+
+def test_compiled_style_sheet_matches_state():
+    css = """
+    mytype:hover {
+        font-size: 42
+    }
+    """
+    compiled_style_sheet = CompiledStyleSheet(css)
+
+    assert compiled_style_sheet.match(Node("mytype")).get("font-size") is None
+    assert (
+        compiled_style_sheet.match(Node("mytype", state=("hover",))).get("font-size")
+        == 42
+    )
+
+
+def test_compiled_style_sheet_matches_parent_for_same_node():
+    css = """
+    mytype {
+        font-size: 1
+    }
+    parent mytype {
+        font-size: 42
+    }
+    """
+    compiled_style_sheet = CompiledStyleSheet(css)
+
+    assert compiled_style_sheet.match(Node("mytype")).get("font-size") == 1
+    assert (
+        compiled_style_sheet.match(Node("mytype", parent=Node("parent"))).get(
+            "font-size"
+        )
+        == 42
+    )
+
+
+def test_compiled_style_sheet_does_not_share_results():
+    compiled_style_sheet = CompiledStyleSheet("mytype { font-size: 42 }")
+
+    compiled_style_sheet.match(Node("mytype"))["font-size"] = 1
+
+    assert compiled_style_sheet.match(Node("mytype")).get("font-size") == 42
+
+
 def test_color():
     css = "mytype { color: #00ff00 }"
 
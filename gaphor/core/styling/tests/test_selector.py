@@ -300,3 +300,32 @@ def test_has_and_is_selector():
             children=[Node("foo", children=[Node("bar", state=("hover",))])],
         )
     )
+
+
+def test_has_pseudo_selector_in_later_sibling_tree():
+    css = "classitem:has(nested) {}"
+
+    (selector, specificity), payload = next(parse_style_sheet(css))
+
+    assert selector(
+        Node(
+            "classitem",
+            children=[
+                Node("middle", children=[Node("other")]),
+                Node("middle", children=[Node("nested")]),
+            ],
+        )
+    )
+
+
+def test_select_inside_combinator_in_deep_tree():
+    css = "classitem nested {}"
+    node = Node("classitem")
+    for _ in range(1000):
+        node = Node("middle", parent=node)
+    nested = Node("nested", parent=node)
+
+    (selector, specificity), payload = next(parse_style_sheet(css))
+
+    assert selector(nested)
+    assert not selector(Node("nested", parent=Node("middle")))
@@ -11,8 +11,9 @@ from __future__ import annotations
 from typing import Optional
 
 from cairo import LINE_JOIN_ROUND
+from gaphas.painter import BoundingBoxPainter as GaphasBoundingBoxPainter
 
-from gaphor.core.modeling.diagram import DrawContext, StyledItem
+from gaphor.core.modeling.diagram import DrawContext, StyledDiagram, StyledItem
 from gaphor.diagram.selection import Selection
 
 # The tolerance for Cairo. Bigger values increase speed and reduce accuracy
@@ -42,12 +43,15 @@ class ItemPainter:
     def __init__(self, selection: Optional[Selection] = None):
         self.selection: Selection = selection or Selection()
 
-    def paint_item(self, item, cairo):
+    def paint_item(self, item, cairo, styled_diagram=None):
         selection = self.selection
         diagram = item.diagram
-        style = maybe_gray_out(
-            diagram.style(StyledItem(item, selection)), item, selection
+        node = (
+            styled_diagram.styled_item(item)
+            if styled_diagram
+            else StyledItem(item, selection)
         )
+        style = maybe_gray_out(diagram.style(node), item, selection)
 
         cairo.save()
         try:
@@ -69,8 +73,46 @@ class ItemPainter:
             cairo.restore()
 
     def paint(self, items, cairo):
-        """Draw the items."""
+        """Draw the items.
+
+        Items that are known to be outside the clip region, according to
+        the spatial index of their diagram, are not drawn.
+        """
         cairo.set_tolerance(TOLERANCE)
         cairo.set_line_join(LINE_JOIN_ROUND)
+        x0, y0, x1, y1 = cairo.clip_extents()
+        clip = (x0, y0, x1 - x0, y1 - y0)
+        styled_diagram = None
         for item in items:
-            self.paint_item(item, cairo)
+            if not styled_diagram or styled_diagram.diagram is not item.diagram:
+                styled_diagram = StyledDiagram(item.diagram, self.selection)
+                spatial_index = item.diagram.spatial_index
+                visible = spatial_index.find_intersect(clip)
+            if item in visible or item not in spatial_index:
+                self.paint_item(item, cairo, styled_diagram)
+
+
+class BoundingBoxPainter(GaphasBoundingBoxPainter):
+    """Calculate the bounding boxes of items.
+
+    The bounding boxes are recorded in the spatial index of the diagram,
+    for `ItemPainter` to find the items to draw.
+    """
+
+    def paint_item(self, item, cairo):
+        bounds = super().paint_item(item, cairo)
+        if item.diagram:
+            xs, ys = zip(
+                *(
+                    cairo.device_to_user(x, y)
+                    for x, y in (
+                        (bounds.x, bounds.y),
+                        (bounds.x1, bounds.y),
+                        (bounds.x, bounds.y1),
+                        (bounds.x1, bounds.y1),
+                    )
+                )
+            )
+            x, y = min(xs), min(ys)
+            item.diagram.set_item_bounds(item, (x, y, max(xs) - x, max(ys) - y))
+        return bounds
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import replace
 from math import pi
-from typing import Callable, List, Optional, Tuple
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, Type, TypeVar
 
 from gaphas.geometry import Rectangle
 
@@ -341,6 +341,48 @@ class EditableText(Text):
         text_draw_focus_box(context, *focus_box)
 
 
+S = TypeVar("S")
+
+
+class ShapeCache:
+    """Reuse shapes when the shapes of an item are created again.
+
+    Shapes are looked up by key, for example the id of the element a
+    compartment row shows. A shape is only created if its key was not
+    used the previous time the shapes were created. Shapes that are not
+    used are dropped once the update is done::
+
+        with self.shape_cache as shapes:
+            self.shape = Box(*(shapes(row.id, Text, ...) for row in rows))
+
+    Reused shapes keep their text layout. ``created`` and ``reused``
+    count the shapes.
+    """
+
+    def __init__(self):
+        self._shapes: Dict[Hashable, object] = {}
+        self._used: Dict[Hashable, object] = {}
+        self.created = 0
+        self.reused = 0
+
+    def __call__(self, key: Hashable, create: Type[S], *args, **kwargs) -> S:
+        if key not in self._used and key in self._shapes:
+            self.reused += 1
+            shape = self._used[key] = self._shapes[key]
+            return shape  # type: ignore[return-value]
+        self.created += 1
+        shape = create(*args, **kwargs)
+        self._used.setdefault(key, shape)
+        return shape
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._shapes = self._used
+        self._used = {}
+
+
 def draw_default_head(context: DrawContext):
     """Default head drawer: move cursor to the first handle."""
     context.cairo.move_to(0, 0)
@@ -7,6 +7,7 @@ from gaphor.diagram.shapes import (
     Box,
     DrawContext,
     IconBox,
+    ShapeCache,
     Text,
     TextAlign,
     VerticalAlign,
@@ -183,3 +184,35 @@ def test_text_width_min_height(context):
 
     _, h = text.size(context)
     assert h == 40
+
+
+def test_shape_cache_reuses_shapes():
+    shapes = ShapeCache()
+    with shapes:
+        text = shapes("a", Text, "a")
+
+    with shapes:
+        assert shapes("a", Text, "a") is text
+
+    assert shapes.created == 1
+    assert shapes.reused == 1
+
+
+def test_shape_cache_drops_unused_shapes():
+    shapes = ShapeCache()
+    with shapes:
+        text = shapes("a", Text, "a")
+    with shapes:
+        pass
+
+    with shapes:
+        assert shapes("a", Text, "a") is not text
+
+
+def test_shape_cache_creates_shapes_for_duplicate_keys():
+    shapes = ShapeCache()
+    with shapes:
+        text = shapes("a", Text, "a")
+        other = shapes("a", Text, "a")
+
+    assert text is not other
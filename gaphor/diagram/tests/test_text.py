@@ -7,6 +7,7 @@ from gaphor.diagram.text import (
     TextAlign,
     TextDecoration,
     text_point_at_line,
+    text_size,
 )
 
 
@@ -101,3 +102,31 @@ def test_text_with_just_font_as_dict():
     w, h = Layout("Example", {"font-family": "sans", "font-size": 10}).size()
     assert w
     assert h
+
+
+def test_text_with_same_font_is_measured_once():
+    font = {"font-family": "sans", "font-size": 11}
+    text_size.cache_clear()
+
+    size = Layout("Measure me", font).size()
+    other_size = Layout("Measure me", font).size()
+
+    assert size == other_size
+    assert text_size.cache_info().misses == 1
+    assert text_size.cache_info().hits == 1
+
+
+def test_text_is_measured_again_for_other_font():
+    text_size.cache_clear()
+
+    Layout("Measure me", {"font-family": "sans", "font-size": 11}).size()
+    Layout("Measure me", {"font-family": "sans", "font-size": 14}).size()
+
+    assert text_size.cache_info().misses == 2
+
+
+def test_measured_text_has_no_pango_layout():
+    layout = Layout("Example", {"font-family": "sans", "font-size": 10})
+    layout.size()
+
+    assert layout._layout is None
@@ -1,6 +1,7 @@
 """Support classes for dealing with text."""
 
-from typing import Tuple, Union
+import functools
+from typing import Hashable, List, Optional, Tuple, Union
 
 from gaphas.canvas import instant_cairo_context
 from gaphas.geometry import Rectangle
@@ -10,8 +11,77 @@ from gi.repository import GLib, Pango, PangoCairo
 
 from gaphor.core.styling import FontStyle, FontWeight, Style, TextAlign, TextDecoration
 
+FontId = Tuple[str, float, Optional[FontWeight], Optional[FontStyle]]
+
+TEXT_SIZE_CACHE_SIZE = 10000
+
+# Pango layouts used to measure text, they are not shown.
+_measure_layouts: List[Pango.Layout] = []
+
+
+@functools.lru_cache(maxsize=None)
+def font_description(font_id: FontId) -> Pango.FontDescription:
+    font_family, font_size, font_weight, font_style = font_id
+    fd = Pango.FontDescription.new()
+    fd.set_family(font_family)
+    fd.set_absolute_size(font_size * Pango.SCALE)
+
+    if font_weight:
+        assert isinstance(font_weight, FontWeight)
+        fd.set_weight(getattr(Pango.Weight, font_weight.name))
+    if font_style:
+        assert isinstance(font_style, FontStyle)
+        fd.set_style(getattr(Pango.Style, font_style.name))
+    return fd
+
+
+def _setup_layout(layout, text, font_id, text_align, underline):
+    layout.set_font_description(font_id and font_description(font_id))
+    if underline:
+        # TODO: can this be done via Pango attributes instead?
+        layout.set_markup(f"<u>{GLib.markup_escape_text(text)}</u>", length=-1)
+    else:
+        layout.set_text(text, length=-1)
+    layout.set_alignment(getattr(Pango.Alignment, text_align.name))
+
+
+def _set_width(layout, width):
+    layout.set_width(-1 if width == -1 else int(width * Pango.SCALE))
+
+
+@functools.lru_cache(maxsize=TEXT_SIZE_CACHE_SIZE)
+def text_size(
+    text: str,
+    font_id: Optional[FontId],
+    width: float,
+    text_align: TextAlign,
+    underline: bool,
+) -> Tuple[int, int]:
+    """The size of text in pixels, when laid out with the given font.
+
+    Sizes are cached for all layouts. ``text_size.cache_info()`` tells
+    how well the cache performs.
+    """
+    layout = (
+        _measure_layouts.pop()
+        if _measure_layouts
+        else PangoCairo.create_layout(instant_cairo_context())
+    )
+    try:
+        _setup_layout(layout, text, font_id, text_align, underline)
+        _set_width(layout, width)
+        return layout.get_pixel_size()  # type: ignore[no-any-return]
+    finally:
+        _measure_layouts.append(layout)
+
 
 class Layout:
+    """Text, as it is measured and shown.
+
+    Text is measured through `text_size()`. A Pango layout of its own is
+    only created once the text is shown.
+    """
+
     def __init__(
         self,
         text="",
@@ -19,11 +89,13 @@ class Layout:
         text_align=TextAlign.CENTER,
         default_size=(0, 0),
     ):
-        self.layout = PangoCairo.create_layout(instant_cairo_context())
+        self._layout: Optional[Pango.Layout] = None
+        self._layout_state: Optional[Hashable] = None
         self.underline = False
-        self.font_id = None
+        self.font_id: Optional[FontId] = None
         self.text = ""
         self.width = -1
+        self.text_align = TextAlign.CENTER
         self.default_size = default_size
 
         if font:
@@ -32,6 +104,21 @@ class Layout:
             self.set_text(text)
         self.set_alignment(text_align)
 
+    @property
+    def layout(self) -> Pango.Layout:
+        """The Pango layout used to show the text."""
+        return self._shown_layout(self.width)
+
+    def _shown_layout(self, width) -> Pango.Layout:
+        state = (self.text, self.font_id, self.text_align, self.underline)
+        if self._layout is None:
+            self._layout = PangoCairo.create_layout(instant_cairo_context())
+        if state != self._layout_state:
+            _setup_layout(self._layout, *state)
+            self._layout_state = state
+        _set_width(self._layout, width)
+        return self._layout
+
     def set(self, text=None, font=None, width=None, text_align=None):
         # Since text expressions can return False, we should also accommodate for that
         if text not in (None, False):
@@ -51,78 +138,43 @@ class Layout:
         assert font_family, "Font family should be set"
         assert font_size, "Font size should be set"
 
-        font_id = (font_family, font_size, font_weight, font_style)
-        if font_id == self.font_id:
-            return
-
-        self.font_id = font_id
-
-        fd = Pango.FontDescription.new()
-        fd.set_family(font_family)
-        fd.set_absolute_size(font_size * Pango.SCALE)
-
-        if font_weight:
-            assert isinstance(font_weight, FontWeight)
-            fd.set_weight(getattr(Pango.Weight, font_weight.name))
-        if font_style:
-            assert isinstance(font_style, FontStyle)
-            fd.set_style(getattr(Pango.Style, font_style.name))
-
-        self.layout.set_font_description(fd)
-
-        underline = (
+        self.font_id = (font_family, font_size, font_weight, font_style)
+        self.underline = (
             font.get("text-decoration", TextDecoration.NONE) == TextDecoration.UNDERLINE
         )
 
-        if self.underline != underline:
-            self.underline = underline
-            self.update_text()
-
     def set_text(self, text: str):
-        if text != self.text:
-            self.text = text
-            self.update_text()
-
-    def update_text(self):
-        if self.underline:
-            # TODO: can this be done via Pango attributes instead?
-            self.layout.set_markup(
-                f"<u>{GLib.markup_escape_text(self.text)}</u>", length=-1
-            )
-        else:
-            self.layout.set_text(self.text, length=-1)
+        self.text = text
 
     def set_width(self, width: int):
         self.width = width
-        if width == -1:
-            self.layout.set_width(-1)
-        else:
-            self.layout.set_width(int(width * Pango.SCALE))
 
     def set_alignment(self, text_align: TextAlign):
-        self.layout.set_alignment(getattr(Pango.Alignment, text_align.name))
+        self.text_align = text_align
 
     def size(self):
         if not self.text:
             return self.default_size
-        self.set_width(self.width)
-        return self.layout.get_pixel_size()
+        return text_size(
+            self.text, self.font_id, self.width, self.text_align, self.underline
+        )
 
     def show_layout(self, cr, width=None, default_size=None):
-        layout = self.layout
         if not self.text:
             return default_size or self.default_size
-        if width is not None:
-            layout.set_width(int(width * Pango.SCALE))
+        if width is None:
+            width = self.width
 
         if isinstance(cr, FreeHandCairoContext):
-            PangoCairo.show_layout(cr.cr, layout)
+            PangoCairo.show_layout(cr.cr, self._shown_layout(width))
         elif isinstance(cr, CairoBoundingBoxContext):
-            w, h = layout.get_pixel_size()
+            w, h = text_size(
+                self.text, self.font_id, width, self.text_align, self.underline
+            )
             cr.rel_line_to(w, h)
             cr.stroke()
         else:
-            PangoCairo.show_layout(cr, layout)
+            PangoCairo.show_layout(cr, self._shown_layout(width))
 
 
 def focus_box_pos(
@@ -4,13 +4,13 @@ import logging
 import os
 
 import cairo
-from gaphas.painter import BoundingBoxPainter, FreeHandPainter
+from gaphas.painter import FreeHandPainter
 from gaphas.view import GtkView
 
 from gaphor.abc import ActionProvider, Service
 from gaphor.core import action, gettext
 from gaphor.core.modeling.diagram import StyledDiagram
-from gaphor.diagram.painter import ItemPainter
+from gaphor.diagram.painter import BoundingBoxPainter, ItemPainter
 from gaphor.ui.filedialog import save_file_dialog
 from gaphor.ui.questiondialog import QuestionDialog
 
@@ -1,15 +1,23 @@
 #!/usr/bin/python
 
+import hashlib
+import json
+import multiprocessing
 import optparse
 import os
 import re
 import sys
-from typing import List
+from typing import List, Optional, Tuple
 
-from gaphor.application import Session
-from gaphor.core.modeling import Diagram
+from gaphor.application import Session, distribution
+from gaphor.core.modeling import Diagram, StyleSheet
 from gaphor.storage import storage
 
+MANIFEST = ".gaphorconvert.json"
+
+# The session of a worker process, see `init_worker()`.
+_worker_session: Optional[Session] = None
+
 
 def pkg2dir(package):
     """Return directory path from package class."""
@@ -20,6 +28,95 @@ def pkg2dir(package):
     return "/".join(name)
 
 
+def fingerprint(diagram, format, fingerprints):
+    """A hash of everything that shows up in the rendered diagram.
+
+    This is the diagram with its items and the elements they show, as
+    rolled up by `fingerprints`, the style sheet, the output format and
+    the Gaphor version.
+    """
+    style_sheet = next(diagram.model.select(StyleSheet), None)
+
+    sha = hashlib.sha1(f"{distribution().version} {format}".encode())
+    # A style sheet may be created on load, with a new id
+    sha.update((style_sheet and style_sheet.styleSheet or "").encode())
+    sha.update(fingerprints.diagram(diagram).encode())
+    return sha.hexdigest()
+
+
+def load_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path, manifest):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+
+def create_session():
+    return Session(
+        services=[
+            "event_manager",
+            "component_registry",
+            "element_factory",
+            "element_dispatcher",
+            "modeling_language",
+            "fingerprints",
+            "diagram_export",
+        ]
+    )
+
+
+def load(session, model):
+    storage.load(
+        model,
+        session.get_service("element_factory"),
+        session.get_service("modeling_language"),
+    )
+
+
+def init_worker(model):
+    """Create the session of a worker process and load the model in it.
+
+    Workers are started as new processes, so they do not inherit the
+    state of the GUI libraries from the parent process.
+    """
+    global _worker_session
+    _worker_session = create_session()
+    load(_worker_session, model)
+
+
+def render_in_worker(job):
+    assert _worker_session
+    return render(_worker_session, job)
+
+
+def render(session, job):
+    """Render a diagram.
+
+    Each session creates its own cairo surfaces.
+    """
+    diagram_id, outfilename, format = job
+    factory = session.get_service("element_factory")
+    diagram_export = session.get_service("diagram_export")
+    diagram = factory.lookup(diagram_id)
+
+    if format == "pdf":
+        diagram_export.save_pdf(outfilename, diagram)
+    elif format == "svg":
+        diagram_export.save_svg(outfilename, diagram)
+    elif format == "png":
+        diagram_export.save_png(outfilename, diagram)
+    else:
+        raise RuntimeError(f"Unknown file format: {format}")
+    return outfilename
+
+
 def parse_options(argv):
 
     usage = "usage: %prog [options] file1 file2..."
@@ -56,6 +153,23 @@ def parse_options(argv):
         help="process diagrams which name matches given regular expression;"
         " name includes package name; regular expressions are case insensitive",
     )
+    parser.add_option(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        metavar="jobs",
+        type="int",
+        default=1,
+        help="number of diagrams to render in parallel, default 1",
+    )
+    parser.add_option(
+        "-i",
+        "--incremental",
+        dest="incremental",
+        action="store_true",
+        help=f"skip diagrams that did not change since the last run,"
+        f" as recorded in {MANIFEST} in the output directory",
+    )
 
     options, args = parser.parse_args(argv)
 
@@ -73,30 +187,24 @@ def main(argv=sys.argv[1:]):
         if options.verbose:
             print(msg, file=sys.stderr)
 
-    session = Session(
-        services=[
-            "event_manager",
-            "component_registry",
-            "element_factory",
-            "element_dispatcher",
-            "modeling_language",
-            "diagram_export",
-        ]
-    )
+    session = create_session()
     factory = session.get_service("element_factory")
-    modeling_language = session.get_service("modeling_language")
-    diagram_export = session.get_service("diagram_export")
+    fingerprints = session.get_service("fingerprints")
 
     name_re = None
     if options.regex:
         name_re = re.compile(options.regex, re.I)
 
+    manifest_path = os.path.join(options.dir or ".", MANIFEST)
+    manifest = load_manifest(manifest_path) if options.incremental else {}
+
     # we should have some gaphor files to be processed at this point
     for model in args:
         message(f"loading model {model}")
-        storage.load(model, factory, modeling_language)
+        load(session, model)
         message("ready for rendering")
 
+        jobs: List[Tuple[str, str, str]] = []
         for diagram in factory.select(Diagram):
             odir = pkg2dir(diagram.package)
 
@@ -118,17 +226,32 @@ def main(argv=sys.argv[1:]):
 
             outfilename = f"{odir}/{dname}.{options.format}"
 
+            if options.incremental:
+                digest = fingerprint(diagram, options.format, fingerprints)
+                if manifest.get(outfilename) == digest and os.path.exists(outfilename):
+                    message(f"unchanged: {pname}")
+                    continue
+                manifest[outfilename] = digest
+
             if not os.path.exists(odir):
                 message(f"creating dir {odir}")
                 os.makedirs(odir)
 
             message(f"rendering: {pname} -> {outfilename}...")
+            jobs.append((diagram.id, outfilename, options.format))
+
+        if options.jobs > 1 and len(jobs) > 1:
+            # Every worker loads the model in a session of its own
+            with multiprocessing.get_context("spawn").Pool(
+                min(options.jobs, len(jobs)),
+                initializer=init_worker,
+                initargs=(model,),
+            ) as pool:
+                for outfilename in pool.imap_unordered(render_in_worker, jobs):
+                    message(f"done: {outfilename}")
+        else:
+            for job in jobs:
+                render(session, job)
 
-            if options.format == "pdf":
-                diagram_export.save_pdf(outfilename, diagram)
-            elif options.format == "svg":
-                diagram_export.save_svg(outfilename, diagram)
-            elif options.format == "png":
-                diagram_export.save_png(outfilename, diagram)
-            else:
-                raise RuntimeError(f"Unknown file format: {options.format}")
+    if options.incremental:
+        save_manifest(manifest_path, manifest)
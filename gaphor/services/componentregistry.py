@@ -1,6 +1,6 @@
 """A registry for components (e.g. services) and event handling."""
 
-from typing import Iterator, Set, Tuple, Type, TypeVar
+from typing import Dict, Iterator, List, Tuple, Type, TypeVar
 
 from gaphor.abc import Service
 
@@ -13,10 +13,17 @@ class ComponentLookupError(LookupError):
 
 class ComponentRegistry(Service):
     """The ComponentRegistry provides a home for application wide
-    components."""
+    components.
+
+    Components are indexed by name. The components of a type are
+    cached by type, until a component is registered or unregistered.
+    """
 
     def __init__(self) -> None:
-        self._comp: Set[Tuple[str, object]] = set()
+        self._comp: Dict[Tuple[str, int], Tuple[str, object]] = {}
+        self._by_name: Dict[str, Dict[int, object]] = {}
+        self._names: Dict[int, List[str]] = {}
+        self._all_cache: Dict[type, List[Tuple[str, object]]] = {}
 
     def shutdown(self) -> None:
         pass
@@ -29,13 +36,32 @@ class ComponentRegistry(Service):
         return self.get(Service, name)  # type: ignore[misc] # noqa: F821
 
     def register(self, name: str, component: object) -> None:
-        self._comp.add((name, component))
+        key = (name, id(component))
+        if key in self._comp:
+            return
+        self._comp[key] = (name, component)
+        self._by_name.setdefault(name, {})[id(component)] = component
+        self._names.setdefault(id(component), []).append(name)
+        self._all_cache = {}
 
     def unregister(self, component: object) -> None:
-        self._comp = {(n, c) for n, c in self._comp if c is not component}
+        names = self._names.pop(id(component), None)
+        if not names:
+            return
+        for name in names:
+            del self._comp[(name, id(component))]
+            components = self._by_name[name]
+            del components[id(component)]
+            if not components:
+                del self._by_name[name]
+        self._all_cache = {}
 
     def get(self, base: Type[T], name: str) -> T:
-        found = [(n, c) for n, c in self._comp if isinstance(c, base) and n == name]
+        found = [
+            (name, c)
+            for c in self._by_name.get(name, {}).values()
+            if isinstance(c, base)
+        ]
         if len(found) > 1:
             raise ComponentLookupError(
                 f"More than one component matches {base}+{name}: {found}"
@@ -44,7 +70,13 @@ class ComponentRegistry(Service):
             raise ComponentLookupError(
                 f"Component with type {base} and name {name} is not registered"
             )
-        return found[0][1]
+        return found[0][1]  # type: ignore[return-value]
 
     def all(self, base: Type[T]) -> Iterator[Tuple[str, T]]:
-        return ((n, c) for n, c in self._comp if isinstance(c, base))
+        try:
+            found = self._all_cache[base]
+        except KeyError:
+            found = self._all_cache[base] = [
+                (n, c) for n, c in self._comp.values() if isinstance(c, base)
+            ]
+        return iter(found)  # type: ignore[arg-type]
@@ -0,0 +1,367 @@
+"""An append-only journal of model changes, kept next to a model file.
+
+Saving a model writes the whole model. With a journal, changes are
+appended to a sidecar file (``<model>.journal``) after every committed
+transaction instead. An explicit save compacts the journal: the full
+model is written and the journal is started afresh. When a model is
+loaded, its journal is replayed on top of it.
+
+The journal is a text file with one JSON document per line. The first
+line holds the SHA-1 digest of the model file the journal applies to.
+Every other line is a transaction: a list of records. Records are lists
+of ``[operation, element id, ...]``:
+
+* ``[CREATE, id, type]``: create a model element
+* ``[UNLINK, id]``: unlink an element or diagram item
+* ``[SET, id, property, value]``: set an attribute or association
+* ``[ADD, id, property, value id]``: add to an association
+* ``[REMOVE, id, property, value id]``: remove from an association
+* ``[ITEM, id, type, diagram id, data]``: the state of a diagram item
+
+Diagram items are recorded by state, as their geometry changes through
+revertible events. Model elements are recorded by the changes made to
+them.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, Iterator, List, Optional, Union
+
+from gaphor.abc import Service
+from gaphor.core import event_handler
+from gaphor.core.modeling.diagram import Diagram
+from gaphor.core.modeling.element import Element
+from gaphor.core.modeling.event import (
+    AssociationAdded,
+    AssociationDeleted,
+    AssociationSet,
+    AttributeUpdated,
+    DiagramItemCreated,
+    DiagramItemDeleted,
+    ElementCreated,
+    ElementDeleted,
+    RevertibeEvent,
+)
+from gaphor.core.modeling.presentation import Presentation
+from gaphor.core.modeling.properties import association as association_property
+from gaphor.diagram.copypaste import deserialize, serialize
+from gaphor.event import TransactionCommit
+from gaphor.storage.storage import file_digest
+
+logger = logging.getLogger(__name__)
+
+# Journal operations
+CREATE = "create"
+UNLINK = "unlink"
+SET = "set"
+ADD = "add"
+REMOVE = "remove"
+ITEM = "item"
+
+# Records are JSON arrays of an operation, an element id and arguments
+JournalRecord = List[Union[str, int, None, list]]
+
+
+def journal_path(filename: str) -> str:
+    """The journal file for a model file."""
+    return f"{filename}.journal"
+
+
+def read_journal(filename: str) -> Iterator[List[JournalRecord]]:
+    """Read the transactions journaled for a model file.
+
+    Nothing is read if there is no journal, or if the journal was
+    written for another version of the model file. A transaction that
+    was not completely written (e.g. due to a crash) ends the journal.
+    """
+    path = journal_path(filename)
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            logger.warning(f"Journal {path} has no valid header, it is ignored")
+            return
+        if header.get("base") != file_digest(filename):
+            logger.warning(f"Journal {path} belongs to another model, it is ignored")
+            return
+        for line in f:
+            try:
+                transaction = json.loads(line)
+            except ValueError:
+                logger.warning(f"Journal {path} ends with an incomplete transaction")
+                return
+            yield transaction
+
+
+def item_record(item: Presentation) -> JournalRecord:
+    """Record the state of a diagram item."""
+    data = []
+
+    def save_func(name, value):
+        if name != "diagram":
+            data.append((name, serialize(value)))
+
+    item.save(save_func)
+    assert item.diagram
+    return [ITEM, item.id, type(item).__name__, item.diagram.id, data]
+
+
+class Journal(Service):
+    """Record committed transactions in an append-only journal.
+
+    The journal is written only while a model file is `open()`, and if
+    the journal is enabled with the ``journal`` property.
+    """
+
+    def __init__(
+        self, event_manager, element_factory, modeling_language, properties=None
+    ):
+        self.event_manager = event_manager
+        self.element_factory = element_factory
+        self.modeling_language = modeling_language
+        self.enabled = bool(properties and properties.get("journal", False))
+        self.path: Optional[str] = None
+        self._records: List[JournalRecord] = []
+        self._items: Dict[Presentation, None] = {}
+
+        event_manager.subscribe(self._on_element_created)
+        event_manager.subscribe(self._on_element_deleted)
+        event_manager.subscribe(self._on_diagram_item_created)
+        event_manager.subscribe(self._on_diagram_item_deleted)
+        event_manager.subscribe(self._on_revertible_event)
+        event_manager.subscribe(self._on_attribute_updated)
+        event_manager.subscribe(self._on_association_set)
+        event_manager.subscribe(self._on_association_added)
+        event_manager.subscribe(self._on_association_deleted)
+        event_manager.subscribe(self._on_transaction_commit)
+
+    def shutdown(self):
+        self.event_manager.unsubscribe(self._on_element_created)
+        self.event_manager.unsubscribe(self._on_element_deleted)
+        self.event_manager.unsubscribe(self._on_diagram_item_created)
+        self.event_manager.unsubscribe(self._on_diagram_item_deleted)
+        self.event_manager.unsubscribe(self._on_revertible_event)
+        self.event_manager.unsubscribe(self._on_attribute_updated)
+        self.event_manager.unsubscribe(self._on_association_set)
+        self.event_manager.unsubscribe(self._on_association_added)
+        self.event_manager.unsubscribe(self._on_association_deleted)
+        self.event_manager.unsubscribe(self._on_transaction_commit)
+        self.close()
+
+    def open(self, filename: str) -> None:
+        """Journal changes to the model saved as filename.
+
+        The journal of filename is continued. If it was written for
+        another version of the file, for example because the file was
+        just saved, it is started afresh.
+        """
+        if not self.enabled:
+            return
+        path = journal_path(filename)
+        digest = file_digest(filename)
+        try:
+            with open(path, encoding="utf-8") as f:
+                current = json.loads(f.readline()).get("base") == digest
+        except (OSError, ValueError):
+            current = False
+        if not current:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"base": digest}) + "\n")
+        self.path = path
+        self._records.clear()
+        self._items.clear()
+
+    def close(self) -> None:
+        """Stop journaling."""
+        self.path = None
+        self._records.clear()
+        self._items.clear()
+
+    def replay(self, filename: str) -> int:
+        """Apply the journal of filename to the model.
+
+        The model should be loaded from filename. Returns the number of
+        transactions replayed.
+        """
+        factory = self.element_factory
+        count = 0
+        with factory.block_events():
+            for transaction in read_journal(filename):
+                self._replay_transaction(transaction)
+                count += 1
+        if count:
+            factory.model_ready()
+        return count
+
+    def _replay_transaction(self, transaction: List[JournalRecord]) -> None:
+        items = []
+        for record in transaction:
+            operation, element_id = record[:2]
+            try:
+                if operation == ITEM:
+                    item = self._replay_item(*record[1:])
+                    if item:
+                        items.append(item)
+                else:
+                    self._replay_record(record)
+            except Exception:
+                logger.error(
+                    f"Could not replay {operation} of {element_id}", exc_info=True
+                )
+        for item in items:
+            item.postload()
+
+    def _lookup(self, id: object) -> Optional[Element]:
+        if not isinstance(id, str) or not id:
+            return None
+        element: Optional[Element] = self.element_factory.lookup(
+            id
+        ) or self.element_factory.lookup_presentation(id)
+        return element
+
+    def _replay_record(self, record: JournalRecord) -> None:
+        operation, element_id, *args = record
+        if operation == CREATE:
+            cls = self.modeling_language.lookup_element(args[0])
+            self.element_factory.create_as(cls, element_id)
+            return
+
+        element = self._lookup(element_id)
+        if not element:
+            return
+        if operation == UNLINK:
+            element.unlink()
+            return
+
+        name, value = args
+        assert isinstance(name, str)
+        prop = getattr(type(element), name)
+        if operation == SET:
+            if isinstance(prop, association_property):
+                prop._set(element, self._lookup(value), from_opposite=True)
+            else:
+                prop._set(element, value)
+        elif operation == ADD:
+            prop._set(element, self._lookup(value), from_opposite=True)
+        elif operation == REMOVE:
+            prop._del(element, self._lookup(value), from_opposite=True)
+        else:
+            raise ValueError(f"Unknown journal operation {operation}")
+
+    def _replay_item(self, item_id, type_name, diagram_id, data):
+        diagram = self.element_factory.lookup(diagram_id)
+        if not isinstance(diagram, Diagram):
+            return None
+        item = diagram.lookup(item_id)
+        data = dict(data)
+        if item:
+            self._reset_item(item, data)
+        else:
+            cls = self.modeling_language.lookup_diagram_item(type_name)
+            item = diagram.create_as(cls, item_id)
+        for name, ser in data.items():
+            for value in deserialize(ser, self._lookup):
+                item.load(name, value)
+        return item
+
+    def _reset_item(self, item, data):
+        """Prepare an existing item to load its recorded state.
+
+        Values that are not recorded are cleared, connections that are
+        recorded again are kept.
+        """
+        for name in ("subject", "parent"):
+            if name not in data and getattr(item, name, None):
+                setattr(item, name, None)
+        connections = item.diagram.connections
+        for name, handle in (
+            ("head-connection", getattr(item, "head", None)),
+            ("tail-connection", getattr(item, "tail", None)),
+        ):
+            if not handle:
+                continue
+            cinfo = connections.get_connection(handle)
+            ser = data.get(name)
+            if cinfo and ser and cinfo.connected.id == ser[1]:
+                del data[name]
+            elif cinfo:
+                connections.disconnect_item(item, handle)
+
+    def _record(self, *record):
+        if self.path:
+            self._records.append(list(record))
+
+    def _record_item(self, item):
+        if self.path:
+            self._items[item] = None
+
+    @event_handler(ElementCreated)
+    def _on_element_created(self, event: ElementCreated):
+        self._record(CREATE, event.element.id, type(event.element).__name__)
+
+    @event_handler(ElementDeleted)
+    def _on_element_deleted(self, event: ElementDeleted):
+        if not isinstance(event.element, Presentation):
+            self._record(UNLINK, event.element.id)
+
+    @event_handler(DiagramItemCreated)
+    def _on_diagram_item_created(self, event: DiagramItemCreated):
+        self._record_item(event.element)
+
+    @event_handler(DiagramItemDeleted)
+    def _on_diagram_item_deleted(self, event: DiagramItemDeleted):
+        self._items.pop(event.element, None)
+        self._record(UNLINK, event.element.id)
+
+    @event_handler(RevertibeEvent)
+    def _on_revertible_event(self, event: RevertibeEvent):
+        if isinstance(event.element, Presentation):
+            self._record_item(event.element)
+
+    @event_handler(AttributeUpdated)
+    def _on_attribute_updated(self, event: AttributeUpdated):
+        if isinstance(event.element, Presentation):
+            self._record_item(event.element)
+        else:
+            self._record(SET, event.element.id, event.property.name, event.new_value)
+
+    def _record_association(self, operation, event, value):
+        # Diagram items record their associations, including the opposite end
+        if isinstance(event.element, Presentation):
+            self._record_item(event.element)
+        elif type(event.property) is association_property and not isinstance(
+            value, Presentation
+        ):
+            self._record(
+                operation, event.element.id, event.property.name, value and value.id
+            )
+
+    @event_handler(AssociationSet)
+    def _on_association_set(self, event: AssociationSet):
+        if not isinstance(event.old_value, Presentation):
+            self._record_association(SET, event, event.new_value)
+
+    @event_handler(AssociationAdded)
+    def _on_association_added(self, event: AssociationAdded):
+        self._record_association(ADD, event, event.new_value)
+
+    @event_handler(AssociationDeleted)
+    def _on_association_deleted(self, event: AssociationDeleted):
+        self._record_association(REMOVE, event, event.old_value)
+
+    @event_handler(TransactionCommit)
+    def _on_transaction_commit(self, event: TransactionCommit):
+        if not self.path:
+            return
+        records = self._records
+        records.extend(
+            item_record(item) for item in self._items if item.diagram is not None
+        )
+        if records:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(records, separators=(",", ":")) + "\n")
+        self._records = []
+        self._items.clear()
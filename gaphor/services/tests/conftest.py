@@ -1,6 +1,11 @@
 import pytest
 
-from gaphor.diagram.tests.fixtures import diagram, element_factory, event_manager
+from gaphor.diagram.tests.fixtures import (
+    diagram,
+    element_factory,
+    event_manager,
+    modeling_language,
+)
 from gaphor.services.undomanager import UndoManager
 
 
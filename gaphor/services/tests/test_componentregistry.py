@@ -0,0 +1,87 @@
+import pytest
+
+from gaphor.abc import ActionProvider, Service
+from gaphor.services.componentregistry import ComponentLookupError, ComponentRegistry
+
+
+class Provider(Service, ActionProvider):
+    def shutdown(self):
+        pass
+
+
+class Plain(Service):
+    def shutdown(self):
+        pass
+
+
+@pytest.fixture
+def registry():
+    return ComponentRegistry()
+
+
+def test_get_service_by_name(registry):
+    service = Plain()
+    registry.register("plain", service)
+
+    assert registry.get_service("plain") is service
+    assert registry.get(Plain, "plain") is service
+
+
+def test_get_service_of_other_type_fails(registry):
+    registry.register("plain", Plain())
+
+    with pytest.raises(ComponentLookupError):
+        registry.get(ActionProvider, "plain")
+
+
+def test_get_ambiguous_service_fails(registry):
+    registry.register("plain", Plain())
+    registry.register("plain", Plain())
+
+    with pytest.raises(ComponentLookupError):
+        registry.get_service("plain")
+
+
+def test_all_in_order_of_registration(registry):
+    plain, provider = Plain(), Provider()
+    registry.register("plain", plain)
+    registry.register("provider", provider)
+
+    assert list(registry.all(Service)) == [("plain", plain), ("provider", provider)]
+    assert list(registry.all(ActionProvider)) == [("provider", provider)]
+
+
+def test_all_is_updated_on_register_and_unregister(registry):
+    plain, provider = Plain(), Provider()
+    registry.register("plain", plain)
+    assert list(registry.all(ActionProvider)) == []
+
+    registry.register("provider", provider)
+    assert list(registry.all(ActionProvider)) == [("provider", provider)]
+
+    registry.unregister(provider)
+    assert list(registry.all(ActionProvider)) == []
+    assert list(registry.all(Service)) == [("plain", plain)]
+
+
+def test_unregister_component_with_several_names(registry):
+    plain = Plain()
+    registry.register("plain", plain)
+    registry.register("other", plain)
+
+    registry.unregister(plain)
+
+    assert list(registry.all(Service)) == []
+    with pytest.raises(ComponentLookupError):
+        registry.get_service("other")
+
+
+def test_unregister_while_iterating(registry):
+    services = [Plain() for _ in range(3)]
+    for n, service in enumerate(services):
+        registry.register(f"s{n}", service)
+
+    for _name, service in registry.all(Service):
+        registry.unregister(service)
+
+    assert list(registry.all(Service)) == []
@@ -0,0 +1,160 @@
+from io import StringIO
+
+import pytest
+
+from gaphor import UML
+from gaphor.core import Transaction
+from gaphor.core.eventmanager import EventManager
+from gaphor.core.modeling import ElementFactory, StyleSheet
+from gaphor.diagram.tests.fixtures import connect
+from gaphor.services.journal import Journal, journal_path, read_journal
+from gaphor.storage import storage
+from gaphor.storage.xmlwriter import XMLWriter
+from gaphor.UML.classes import AssociationItem, ClassItem
+
+
+@pytest.fixture
+def filename(tmp_path, element_factory, event_manager):
+    with Transaction(event_manager):
+        element_factory.create(StyleSheet)
+        diagram = element_factory.create(UML.Diagram)
+        diagram.create(ClassItem, subject=element_factory.create(UML.Class))
+    filename = str(tmp_path / "model.gaphor")
+    save(element_factory, filename)
+    return filename
+
+
+@pytest.fixture
+def journal(event_manager, element_factory, modeling_language, filename):
+    journal = Journal(event_manager, element_factory, modeling_language)
+    journal.enabled = True
+    journal.open(filename)
+    yield journal
+    journal.shutdown()
+
+
+def save(element_factory, filename):
+    with open(filename, "w") as out:
+        storage.save(XMLWriter(out), element_factory)
+
+
+def saved(element_factory):
+    out = StringIO()
+    storage.save(XMLWriter(out), element_factory)
+    return out.getvalue()
+
+
+def load_and_replay(filename, modeling_language):
+    event_manager = EventManager()
+    element_factory = ElementFactory(event_manager)
+    storage.load(filename, element_factory, modeling_language)
+    count = Journal(event_manager, element_factory, modeling_language).replay(filename)
+    return element_factory, count
+
+
+def test_journal_replays_model_changes(
+    journal, filename, event_manager, element_factory, modeling_language
+):
+    klass = next(element_factory.select(UML.Class))
+    with Transaction(event_manager):
+        klass.name = "Foo"
+        klass.isAbstract = True
+    with Transaction(event_manager):
+        attribute = element_factory.create(UML.Property)
+        attribute.name = "bar"
+        klass.ownedAttribute = attribute
+    with Transaction(event_manager):
+        other = element_factory.create(UML.Class)
+        other.name = "Other"
+        other.unlink()
+
+    replayed, count = load_and_replay(filename, modeling_language)
+
+    assert count == 3
+    assert saved(replayed) == saved(element_factory)
+
+
+def test_journal_replays_diagram_changes(
+    journal, filename, event_manager, element_factory, modeling_language
+):
+    diagram = next(element_factory.select(UML.Diagram))
+    item = next(iter(diagram.ownedPresentation))
+    with Transaction(event_manager):
+        item.matrix.translate(100, 50)
+        item.width = 200
+    with Transaction(event_manager):
+        other = diagram.create(ClassItem, subject=element_factory.create(UML.Class))
+        association = diagram.create(AssociationItem)
+        connect(association, association.head, item)
+        connect(association, association.tail, other)
+    with Transaction(event_manager):
+        other.matrix.translate(300, 0)
+
+    replayed, count = load_and_replay(filename, modeling_language)
+
+    assert count == 3
+    assert saved(replayed) == saved(element_factory)
+
+
+def test_journal_replays_deleted_items(
+    journal, filename, event_manager, element_factory, modeling_language
+):
+    diagram = next(element_factory.select(UML.Diagram))
+    with Transaction(event_manager):
+        for item in list(diagram.ownedPresentation):
+            item.unlink()
+
+    replayed, _ = load_and_replay(filename, modeling_language)
+
+    assert saved(replayed) == saved(element_factory)
+    assert not next(replayed.select(UML.Diagram)).ownedPresentation
+
+
+def test_journal_is_started_afresh_after_save(
+    journal, filename, event_manager, element_factory
+):
+    with Transaction(event_manager):
+        next(element_factory.select(UML.Class)).name = "Foo"
+
+    save(element_factory, filename)
+    journal.open(filename)
+
+    assert not list(read_journal(filename))
+
+
+def test_journal_of_other_model_is_ignored(
+    journal, filename, event_manager, element_factory, modeling_language
+):
+    with Transaction(event_manager):
+        next(element_factory.select(UML.Class)).name = "Foo"
+
+    with open(filename, "a") as f:
+        f.write("\n")
+
+    assert load_and_replay(filename, modeling_language)[1] == 0
+
+
+def test_incomplete_transaction_ends_journal(
+    journal, filename, event_manager, element_factory
+):
+    with Transaction(event_manager):
+        next(element_factory.select(UML.Class)).name = "Foo"
+
+    with open(journal_path(filename), "a") as f:
+        f.write('[["set",')
+
+    assert len(list(read_journal(filename))) == 1
+
+
+def test_journal_is_not_written_when_disabled(
+    filename, event_manager, element_factory, modeling_language
+):
+    journal = Journal(event_manager, element_factory, modeling_language)
+    journal.open(filename)
+
+    with Transaction(event_manager):
+        next(element_factory.select(UML.Class)).name = "Foo"
+    journal.shutdown()
+
+    assert journal.path is None
+    assert not list(read_journal(filename))
@@ -1,6 +1,7 @@
 """Test the UndoManager."""
 import pytest
 
+from gaphor import UML
 from gaphor.core import event_handler
 from gaphor.core.modeling import Element
 from gaphor.core.modeling.event import AssociationUpdated
@@ -425,3 +426,65 @@ def test_redo_stack(event_manager, element_factory, undo_manager):
     assert element_factory.size() == 2
 
     assert element_factory.lookup(p.id)
+
+
+@pytest.mark.parametrize("spill_after", [None, 0])
+def test_undo_and_redo_attribute_change(
+    event_manager, element_factory, undo_manager, spill_after
+):
+    undo_manager.spill_after = spill_after
+    with Transaction(event_manager):
+        c = element_factory.create(UML.Class)
+    with Transaction(event_manager):
+        c.name = "Foo"
+
+    undo_manager.undo_transaction()
+
+    assert c.name is None
+
+    undo_manager.redo_transaction()
+
+    assert c.name == "Foo"
+
+
+def test_undo_compressed_transaction(event_manager, element_factory, undo_manager):
+    undo_manager.spill_after = 0
+    with Transaction(event_manager):
+        c = element_factory.create(UML.Class)
+        c.package = element_factory.create(UML.Package)
+        c.name = "Foo"
+
+    assert undo_manager._undo_stack[0].compressed
+
+    undo_manager.undo_transaction()
+
+    assert element_factory.size() == 0
+
+    undo_manager.redo_transaction()
+
+    c = element_factory.lselect(UML.Class)[0]
+    assert c.name == "Foo"
+    assert c.package
+
+
+def test_undo_stack_is_bounded_by_memory(event_manager, element_factory, undo_manager):
+    undo_manager.spill_after = None
+    with Transaction(event_manager):
+        element_factory.create(UML.Class)
+    undo_manager.max_bytes = undo_manager.memory_usage()
+
+    for n in range(3):
+        with Transaction(event_manager):
+            element_factory.create(UML.Class)
+
+    assert len(undo_manager._undo_stack) == 1
+    assert undo_manager.memory_usage() <= undo_manager.max_bytes
+
+
+def test_latest_transaction_is_kept(event_manager, element_factory, undo_manager):
+    undo_manager.max_bytes = 0
+    with Transaction(event_manager):
+        element_factory.create(UML.Class)
+
+    assert len(undo_manager._undo_stack) == 1
+    assert undo_manager.memory_usage() > 0
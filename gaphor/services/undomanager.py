@@ -7,11 +7,22 @@ An undo action should be a callable object (called with no arguments).
 An undo action should return a callable object that acts as redo function.
 If None is returned the undo action is considered to be the redo action as well.
 
+Changes in the model are recorded as undo records: compact tuples of
+``(operation, element id, property, value)``. Values refer to other
+elements by id, so records do not keep elements alive. Revertible events
+are recorded by their type and their state, with elements replaced by
+ids; the event is rebuilt when it's undone. Plain callables are recorded
+as a ``CALL`` operation.
+
 NOTE: it would be nice to use actions in conjunction with functools.partial.
 """
 
+import io
 import logging
-from typing import Callable, List, Optional
+import pickle
+import sys
+import zlib
+from typing import Callable, List, Optional, Tuple, Type, Union
 
 from gaphor.abc import ActionProvider, Service
 from gaphor.action import action
@@ -31,6 +42,7 @@ from gaphor.core.modeling.event import (
     RevertibeEvent,
 )
 from gaphor.core.modeling.properties import association as association_property
+from gaphor.core.modeling.properties import umlproperty
 from gaphor.diagram.copypaste import deserialize, serialize
 from gaphor.event import (
     ActionEnabled,
@@ -43,6 +55,77 @@ from gaphor.transaction import Transaction, transactional
 
 logger = logging.getLogger(__name__)
 
+# Undo operations
+CALL = "call"
+REVERT = "revert"
+UNLINK = "unlink"
+RECREATE = "recreate"
+RECREATE_ITEM = "recreate-item"
+SET_ATTRIBUTE = "set-attribute"
+SET_ASSOCIATION = "set-association"
+ADD_ASSOCIATION = "add-association"
+DELETE_ASSOCIATION = "delete-association"
+
+UndoRecord = Tuple[str, Optional[str], object, object]
+
+_PLAIN_TYPES = frozenset((str, int, float, bool, bytes, type(None), tuple, list, dict))
+
+
+def record_size(record: UndoRecord) -> int:
+    """Estimate the memory used by an undo record, in bytes.
+
+    Element ids are shared with the elements, so they are not counted.
+    Other strings are, even if they're interned, so this is an upper
+    bound.
+    """
+    operation, element_id, prop, value = record
+    size = sys.getsizeof(record)
+    if operation not in (SET_ASSOCIATION, ADD_ASSOCIATION, DELETE_ASSOCIATION):
+        size += _sizeof(value)
+    return size
+
+
+def _sizeof(value) -> int:
+    if value is None or isinstance(value, (type, umlproperty)):
+        return 0
+    size = sys.getsizeof(value)
+    if type(value) in (tuple, list):
+        size += sum(_sizeof(v) for v in value)
+    elif type(value) is dict:
+        size += sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    return size
+
+
+def describe(record: UndoRecord) -> str:
+    operation, element_id, prop, value = record
+    if operation == CALL:
+        return getattr(value, "__doc__", None) or repr(value)
+    name = getattr(prop, "name", prop)
+    return f"{operation} {element_id} {name or ''} {value!r}"
+
+
+class _Pickler(pickle.Pickler):
+    """Pickle plain values; other objects are kept in a table."""
+
+    def __init__(self, file, objects):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.objects = objects
+
+    def persistent_id(self, obj):
+        if type(obj) in _PLAIN_TYPES:
+            return None
+        self.objects.append(obj)
+        return len(self.objects) - 1
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file, objects):
+        super().__init__(file)
+        self.objects = objects
+
+    def persistent_load(self, pid):
+        return self.objects[pid]
+
 
 class ActionStack:
     """A transaction.
@@ -52,28 +135,58 @@ class ActionStack:
     played back when a transaction is executed. This executing a
     transaction has the effect of performing the actions recorded, which
     will typically undo actions performed by the user.
+
+    A transaction can be compressed to save memory. ``nbytes`` is an
+    estimate of the memory used by the transaction.
     """
 
     def __init__(self):
-        self._actions: List[Callable[[], None]] = []
+        self._actions: List[UndoRecord] = []
+        self._compressed: Optional[bytes] = None
+        self._objects: List[object] = []
+        self.nbytes = sys.getsizeof(self._actions)
 
-    def add(self, action):
-        self._actions.append(action)
+    def add(self, record: UndoRecord):
+        self._actions.append(record)
+        self.nbytes += record_size(record) + 8
 
     def can_execute(self):
-        return self._actions and True or False
+        return bool(self._actions or self._compressed)
 
-    @transactional
-    def execute(self):
-        self._actions.reverse()
+    @property
+    def compressed(self) -> bool:
+        return self._compressed is not None
+
+    def compress(self):
+        """Store the records zlib compressed."""
+        if self._compressed is not None or not self._actions:
+            return
+        f = io.BytesIO()
+        _Pickler(f, self._objects).dump(self._actions)
+        self._compressed = zlib.compress(f.getvalue())
+        self._actions = []
+        self.nbytes = (
+            sys.getsizeof(self._compressed)
+            + sys.getsizeof(self._objects)
+            + sum(_sizeof(o) for o in self._objects)
+        )
+
+    def records(self) -> List[UndoRecord]:
+        if self._compressed is None:
+            return self._actions
+        f = io.BytesIO(zlib.decompress(self._compressed))
+        records: List[UndoRecord] = _Unpickler(f, self._objects).load()
+        return records
 
-        for act in self._actions:
-            logger.debug("%s", act.__doc__)
+    @transactional
+    def execute(self, perform: Callable[[UndoRecord], None]):
+        for record in reversed(self.records()):
+            logger.debug("Undo %s %s", record[0], record[1])
             try:
-                act()
+                perform(record)
             except Exception:
                 logger.error(
-                    "Error while undoing action %s", act.__doc__, exc_info=True
+                    "Error while undoing action %s", describe(record), exc_info=True
                 )
 
 
@@ -94,6 +207,12 @@ class UndoManager(Service, ActionProvider):
     (e.i action()) If something is returned by an action, that is
     considered the callable to be used to undo or redo the last
     performed action.
+
+    The stacks are bounded by memory: if a stack uses more than
+    ``max_bytes``, the oldest transactions are dropped. The latest
+    transaction is always kept. All but the last ``spill_after``
+    transactions are compressed; set it to ``None`` to keep all
+    transactions uncompressed.
     """
 
     def __init__(self, event_manager, element_factory):
@@ -101,7 +220,8 @@ class UndoManager(Service, ActionProvider):
         self.element_factory: RepositoryProtocol = element_factory
         self._undo_stack: List[ActionStack] = []
         self._redo_stack: List[ActionStack] = []
-        self._stack_depth = 20
+        self.max_bytes = 64 * 1024 * 1024
+        self.spill_after: Optional[int] = 5
         self._current_transaction = None
         self._undoing = 0
 
@@ -138,10 +258,16 @@ class UndoManager(Service, ActionProvider):
         assert not self._current_transaction
         self._current_transaction = ActionStack()
 
-    def add_undo_action(self, action, requires_transaction=True):
-        """Add an action to undo."""
+    def add_undo_action(
+        self, action: Union[UndoRecord, Callable[[], None]], requires_transaction=True
+    ):
+        """Add an action to undo.
+
+        The action is either an undo record or a callable.
+        """
+        record: UndoRecord = (CALL, None, None, action) if callable(action) else action
         if self._current_transaction:
-            self._current_transaction.add(action)
+            self._current_transaction.add(record)
             self._action_executed()
         elif requires_transaction:
             undo_stack = list(self._undo_stack)
@@ -149,7 +275,7 @@ class UndoManager(Service, ActionProvider):
 
             try:
                 with Transaction(self.event_manager):
-                    action()
+                    self._perform(record)
             finally:
                 # Restore stacks and act like nothing happened
                 self._redo_stack = redo_stack
@@ -164,8 +290,7 @@ class UndoManager(Service, ActionProvider):
         if self._current_transaction.can_execute():
             self.clear_redo_stack()
             self._undo_stack.append(self._current_transaction)
-            while len(self._undo_stack) > self._stack_depth:
-                del self._undo_stack[0]
+            self._limit(self._undo_stack)
 
         self._current_transaction = None
 
@@ -184,7 +309,7 @@ class UndoManager(Service, ActionProvider):
         try:
             with Transaction(self.event_manager):
                 try:
-                    erroneous_tx.execute()
+                    erroneous_tx.execute(self._perform)
                 except Exception:
                     logger.error("Could not rollback transaction", exc_info=True)
         finally:
@@ -217,7 +342,7 @@ class UndoManager(Service, ActionProvider):
         try:
             self._undoing += 1
             with Transaction(self.event_manager):
-                transaction.execute()
+                transaction.execute(self._perform)
         finally:
             # Restore stacks and put latest tx on the redo stack
             self._redo_stack = redo_stack
@@ -226,8 +351,7 @@ class UndoManager(Service, ActionProvider):
             self._undo_stack = undo_stack
             self._undoing -= 1
 
-        while len(self._redo_stack) > self._stack_depth:
-            del self._redo_stack[0]
+        self._limit(self._redo_stack)
 
         self._action_executed()
 
@@ -245,7 +369,7 @@ class UndoManager(Service, ActionProvider):
         try:
             self._undoing += 1
             with Transaction(self.event_manager):
-                transaction.execute()
+                transaction.execute(self._perform)
         finally:
             self._redo_stack = redo_stack
             self._undoing -= 1
@@ -266,6 +390,21 @@ class UndoManager(Service, ActionProvider):
     def can_redo(self):
         return bool(self._redo_stack)
 
+    def memory_usage(self) -> int:
+        """The estimated memory used by the undo and redo stacks, in bytes."""
+        transactions = self._undo_stack + self._redo_stack
+        if self._current_transaction:
+            transactions.append(self._current_transaction)
+        return sum(tx.nbytes for tx in transactions)
+
+    def _limit(self, stack: List[ActionStack]) -> None:
+        if self.spill_after is not None:
+            for tx in stack[: max(len(stack) - self.spill_after, 0)]:
+                tx.compress()
+        nbytes = sum(tx.nbytes for tx in stack)
+        while len(stack) > 1 and nbytes > self.max_bytes:
+            nbytes -= stack.pop(0).nbytes
+
     def _action_executed(self, event=None):
         self.event_manager.handle(ActionEnabled("win.edit-undo", self.can_undo()))
         self.event_manager.handle(ActionEnabled("win.edit-redo", self.can_redo()))
@@ -274,11 +413,8 @@ class UndoManager(Service, ActionProvider):
     def deep_lookup(self, id: str) -> Element:
         element: Optional[Element] = self.element_factory.lookup(id)
         if not element:
-            for diagram in self.element_factory.select(Diagram):
-                presentation: Element
-                for presentation in diagram.ownedPresentation:
-                    if presentation.id == id:
-                        return presentation
+            element = self.element_factory.lookup_presentation(id)
+        if not element:
             raise ValueError(f"Element with id {id} not found in model")
         return element
 
@@ -314,67 +450,89 @@ class UndoManager(Service, ActionProvider):
         self.event_manager.unsubscribe(self.undo_association_add_event)
         self.event_manager.unsubscribe(self.undo_association_delete_event)
 
-    @event_handler(RevertibeEvent)
-    def undo_reversible_event(self, event: RevertibeEvent):
-        element_id = event.element.id
+    def _perform(self, record: UndoRecord) -> None:
+        operation, element_id, prop, value = record
+        if operation == CALL:
+            assert callable(value)
+            value()
+            return
 
-        def _undo_reversible_event():
+        assert element_id
+        element: Element
+        if operation == RECREATE:
+            assert isinstance(prop, type)
+            element = self.element_factory.create_as(prop, element_id)
+            self.event_manager.handle(ElementCreated(self.element_factory, element))
+        elif operation == RECREATE_ITEM:
+            assert isinstance(prop, type) and isinstance(value, tuple)
+            diagram_id, data = value
+            diagram: Diagram = self.deep_lookup(diagram_id)  # type: ignore[assignment]
+            element = diagram.create_as(prop, element_id)
+            for name, ser in data:
+                for v in deserialize(ser, lambda ref: None):
+                    element.load(name, v)
+        else:
             element = self.deep_lookup(element_id)
-            event.revert(element)
-
-        _undo_reversible_event.__doc__ = (
-            f"Reverse event {event.__class__.__name__} for element {event.element}."
-        )
+            if operation == REVERT:
+                assert isinstance(prop, type) and isinstance(value, tuple)
+                self._revertible_event(prop, element, value).revert(element)
+            elif operation == UNLINK:
+                element.unlink()
+            elif operation == SET_ATTRIBUTE:
+                assert isinstance(prop, umlproperty)
+                prop._set(element, value)
+            elif operation in (SET_ASSOCIATION, ADD_ASSOCIATION):
+                assert isinstance(prop, association_property)
+                assert value is None or isinstance(value, str)
+                prop._set(
+                    element, value and self.deep_lookup(value), from_opposite=True
+                )
+            elif operation == DELETE_ASSOCIATION:
+                assert isinstance(prop, association_property)
+                assert isinstance(value, str)
+                prop._del(element, self.deep_lookup(value), from_opposite=True)
+            else:
+                raise ValueError(f"Unknown undo operation {operation}")
+
+    def _revertible_event(
+        self, event_type: Type[RevertibeEvent], element: Element, state: tuple
+    ) -> RevertibeEvent:
+        """Rebuild a revertible event from its recorded state."""
+        event = event_type.__new__(event_type)
+        event.element = element
+        for name, value, is_element in state:
+            setattr(event, name, self.deep_lookup(value) if is_element else value)
+        return event
 
+    @event_handler(RevertibeEvent)
+    def undo_reversible_event(self, event: RevertibeEvent):
+        state = []
+        for name, value in vars(event).items():
+            if name == "element":
+                continue
+            elif isinstance(value, Element):
+                state.append((name, value.id, True))
+            else:
+                state.append((name, value, False))
         self.add_undo_action(
-            _undo_reversible_event, requires_transaction=event.requires_transaction
+            (REVERT, event.element.id, type(event), tuple(state)),
+            requires_transaction=event.requires_transaction,
         )
 
     @event_handler(ElementCreated)
     def undo_create_element_event(self, event: ElementCreated):
-        element_id = event.element.id
-
-        def _undo_create_event():
-            element = self.deep_lookup(element_id)
-            element.unlink()
-
-        _undo_create_event.__doc__ = f"Undo create element {event.element}."
-        del event
-
-        self.add_undo_action(_undo_create_event)
+        self.add_undo_action((UNLINK, event.element.id, None, None))
 
     @event_handler(ElementDeleted)
     def undo_delete_element_event(self, event: ElementDeleted):
-        element_type = type(event.element)
-        element_id = event.element.id
-
-        def _undo_delete_event():
-            element = self.element_factory.create_as(element_type, element_id)
-            self.event_manager.handle(ElementCreated(self.element_factory, element))
-
-        _undo_delete_event.__doc__ = f"Recreate element {element_type} ({element_id})."
-        del event
-
-        self.add_undo_action(_undo_delete_event)
+        self.add_undo_action((RECREATE, event.element.id, type(event.element), None))
 
     @event_handler(DiagramItemCreated)
     def undo_create_diagram_item_event(self, event: DiagramItemCreated):
-        element_id = event.element.id
-
-        def _undo_create_event():
-            element = self.deep_lookup(element_id)
-            element.unlink()
-
-        _undo_create_event.__doc__ = f"Undo create diagram item {event.element}."
-        del event
-
-        self.add_undo_action(_undo_create_event)
+        self.add_undo_action((UNLINK, event.element.id, None, None))
 
     @event_handler(DiagramItemDeleted)
     def undo_delete_diagram_item_event(self, event: DiagramItemDeleted):
-        diagram_id = event.diagram.id
-        element_type = type(event.element)
-        element_id = event.element.id
         data = {}
 
         def save_func(name, value):
@@ -382,91 +540,43 @@ class UndoManager(Service, ActionProvider):
 
         event.element.save(save_func)
 
-        def _undo_delete_event():
-            diagram: Diagram = self.deep_lookup(diagram_id)  # type: ignore[assignment]
-            element = diagram.create_as(element_type, element_id)
-            for name, ser in data.items():
-                for value in deserialize(ser, lambda ref: None):
-                    element.load(name, value)
-
-        _undo_delete_event.__doc__ = f"Undo delete diagram item {event.element}."
-        del event
-
-        self.add_undo_action(_undo_delete_event)
+        self.add_undo_action(
+            (
+                RECREATE_ITEM,
+                event.element.id,
+                type(event.element),
+                (event.diagram.id, tuple(data.items())),
+            )
+        )
 
     @event_handler(AttributeUpdated)
     def undo_attribute_change_event(self, event: AttributeUpdated):
-        attribute = event.property
-        element_id = event.element.id
-        value = event.old_value
-
-        def _undo_attribute_change_event():
-            element = self.deep_lookup(element_id)
-            attribute._set(element, value)
-
-        _undo_attribute_change_event.__doc__ = (
-            f"Revert {event.element}.{attribute.name} to {value}."
+        self.add_undo_action(
+            (SET_ATTRIBUTE, event.element.id, event.property, event.old_value)
         )
-        del event
-
-        self.add_undo_action(_undo_attribute_change_event)
 
     @event_handler(AssociationSet)
     def undo_association_set_event(self, event: AssociationSet):
         association = event.property
         if type(association) is not association_property:
             return
-        element_id = event.element.id
         value_id = event.old_value and event.old_value.id
-
-        def _undo_association_set_event():
-            element = self.deep_lookup(element_id)
-            value = value_id and self.deep_lookup(value_id)
-            association._set(element, value, from_opposite=True)
-
-        _undo_association_set_event.__doc__ = (
-            f"Revert {event.element}.{association.name} to {event.old_value}."
-        )
-        del event
-
-        self.add_undo_action(_undo_association_set_event)
+        self.add_undo_action((SET_ASSOCIATION, event.element.id, association, value_id))
 
     @event_handler(AssociationAdded)
     def undo_association_add_event(self, event: AssociationAdded):
         association = event.property
         if type(association) is not association_property:
             return
-        element_id = event.element.id
-        value_id = event.new_value.id
-
-        def _undo_association_add_event():
-            element = self.deep_lookup(element_id)
-            value = self.deep_lookup(value_id)
-            association._del(element, value, from_opposite=True)
-
-        _undo_association_add_event.__doc__ = (
-            f"{event.element}.{association.name} delete {event.new_value}."
+        self.add_undo_action(
+            (DELETE_ASSOCIATION, event.element.id, association, event.new_value.id)
         )
-        del event
-
-        self.add_undo_action(_undo_association_add_event)
 
     @event_handler(AssociationDeleted)
     def undo_association_delete_event(self, event: AssociationDeleted):
         association = event.property
         if type(association) is not association_property:
             return
-        element_id = event.element.id
-        value_id = event.old_value.id
-
-        def _undo_association_delete_event():
-            element = self.deep_lookup(element_id)
-            value = self.deep_lookup(value_id)
-            association._set(element, value, from_opposite=True)
-
-        _undo_association_delete_event.__doc__ = (
-            f"{event.element}.{association.name} add {event.old_value}."
+        self.add_undo_action(
+            (ADD_ASSOCIATION, event.element.id, association, event.old_value.id)
         )
-        del event
-
-        self.add_undo_action(_undo_association_delete_event)
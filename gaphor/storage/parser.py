@@ -28,6 +28,11 @@ class name in the gaphor.diagram module.
 
 The generator parse_generator(filename, loader) may be used if the loading
 takes a long time. The yielded values are the percentage of the file read.
+
+The XML can be parsed by different backends: "expat" (using
+xml.parsers.expat directly), "sax" (xml.sax) and "lxml" (if lxml is
+installed). All backends produce the same result. By default the fastest
+available backend is used.
 """
 
 from __future__ import annotations
@@ -35,11 +40,19 @@ from __future__ import annotations
 import io
 import logging
 import os
+import time
 from collections import OrderedDict
-from typing import IO, Dict, List, Optional, Tuple, Union
+from typing import IO, Callable, Dict, List, Optional, Tuple, Union
+from xml.parsers import expat
 from xml.sax import handler
+from xml.sax.xmlreader import IncrementalParser
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None  # type: ignore[assignment]
 
-__all__ = ["parse", "ParserException"]
+__all__ = ["parse", "ParserException", "backends"]
 
 log = logging.getLogger(__name__)
 
@@ -163,7 +176,7 @@ class GaphorLoader(handler.ContentHandler):
         self.gaphor_version = None
         self.elements: Dict[str, Union[element, canvasitem]] = OrderedDict()
         self._stack: List[Tuple[Union[element, canvas, canvasitem], State]] = []
-        self.text = ""
+        self._text: List[str] = []
         self._start_element_handlers = (
             self.start_element,
             self.start_canvas,
@@ -179,8 +192,13 @@ class GaphorLoader(handler.ContentHandler):
         if len(self._stack) != 0:
             raise ParserException("Invalid XML document.")
 
+    @property
+    def text(self) -> str:
+        """The text read since the last start tag."""
+        return "".join(self._text)
+
     def startElement(self, name, attrs):
-        self.text = ""
+        self._text.clear()
 
         state = self.state()
 
@@ -297,35 +315,206 @@ class GaphorLoader(handler.ContentHandler):
             self.endElement(name[1])
 
     def characters(self, content):
-        """Read characters."""
-        self.text = self.text + content
+        """Read characters.
+
+        Text is kept as a list of chunks, so long values do not need to
+        be copied for every chunk read.
+        """
+        self._text.append(content)
 
 
-def parse(filename):
+def parse(filename, backend=None):
     """Parse a file and return a dictionary ID:element/canvasitem."""
     loader = GaphorLoader()
 
-    for _ in parse_generator(filename, loader):
+    for _ in parse_generator(filename, loader, backend):
         pass
     return loader.elements
 
 
-def parse_generator(filename, loader):
+def parse_generator(filename, loader, backend=None):
     """The generator based version of parse().
 
-    parses the file filename and load it with ContentHandler loader.
+    parses the file filename and load it with ContentHandler loader. The
+    backend is the name of one of the parser backends. If no backend is
+    provided, the fastest available backend is used.
     """
     assert isinstance(loader, GaphorLoader), "loader should be a GaphorLoader"
-    from xml.sax import make_parser
 
-    parser = make_parser()
-
-    parser.setFeature(handler.feature_namespaces, 1)
-    parser.setContentHandler(loader)
+    parser = make_parser(loader, backend)
 
     yield from parse_file(filename, parser)
 
 
+def make_parser(loader, backend=None):
+    """Create a parser that feeds its parse events to loader.
+
+    The parser has a ``feed(data)`` and a ``close()`` method.
+    """
+    if backend is None:
+        backend = next(iter(backends))
+    try:
+        return backends[backend](loader)
+    except KeyError:
+        raise ParserException(f"No parser backend named {backend}")
+
+
+def local_name(name):
+    """Strip the namespace of a tag name, if the namespace is ours.
+
+    Names are formatted as ``{namespace}localname``. None is returned
+    for names in foreign namespaces.
+
+    >>> local_name("{http://gaphor.sourceforge.net/model}Class")
+    'Class'
+    >>> local_name("Class")
+    'Class'
+    >>> local_name("{http://example.com/other}Class") is None
+    True
+    """
+    if name[0] != "{":
+        return name
+    ns, local = name[1:].split("}", 1)
+    return local if ns == XMLNS else None
+
+
+class SaxParser:
+    """Parser backend based on xml.sax.
+
+    Namespaces are resolved by the SAX parser, the loader's
+    startElementNS() and endElementNS() methods translate them.
+    """
+
+    def __init__(self, loader):
+        from xml.sax import make_parser
+
+        parser = make_parser()
+        assert isinstance(parser, IncrementalParser)
+        self.parser = parser
+        self.parser.setFeature(handler.feature_namespaces, 1)
+        self.parser.setContentHandler(loader)
+
+    def feed(self, data):
+        self.parser.feed(data)
+
+    def close(self):
+        self.parser.close()
+
+
+class ExpatParser:
+    """Parser backend that calls the loader from xml.parsers.expat directly.
+
+    This avoids the overhead of the SAX layer, such as the creation of
+    attribute objects for every tag.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        parser = expat.ParserCreate(namespace_separator="}")
+        parser.buffer_text = True
+        parser.StartElementHandler = self.start_element
+        parser.EndElementHandler = self.end_element
+        parser.CharacterDataHandler = loader.characters
+        self.parser = parser
+        loader.startDocument()
+
+    def start_element(self, name, attrs):
+        # Like the SAX backend, foreign elements are skipped, but their
+        # child elements are not
+        ns, _, local = name.rpartition("}")
+        if ns and ns != XMLNS:
+            return
+        if any("}" in key for key in attrs):
+            attrs = {key.rpartition("}")[2]: val for key, val in attrs.items()}
+        self.loader.startElement(local, attrs)
+
+    def end_element(self, name):
+        ns, _, local = name.rpartition("}")
+        if ns and ns != XMLNS:
+            return
+        self.loader.endElement(local)
+
+    def feed(self, data):
+        try:
+            self.parser.Parse(data, False)
+        except expat.ExpatError as e:
+            raise ParserException(f"Invalid XML: {e}") from e
+
+    def close(self):
+        try:
+            self.parser.Parse(b"", True)
+        except expat.ExpatError as e:
+            raise ParserException(f"Invalid XML: {e}") from e
+        self.loader.endDocument()
+
+
+class LxmlParser:
+    """Parser backend based on lxml's pull parser.
+
+    Elements are discarded as soon as they have been handed to the
+    loader, so no element tree is kept in memory.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.parser = etree.XMLPullParser(
+            events=("start", "end"), remove_comments=True, remove_pis=True
+        )
+        loader.startDocument()
+
+    def feed(self, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        try:
+            self.parser.feed(data)
+        except etree.XMLSyntaxError as e:
+            raise ParserException(f"Invalid XML: {e}") from e
+        self.handle_events()
+
+    def close(self):
+        try:
+            self.parser.close()
+        except etree.XMLSyntaxError as e:
+            raise ParserException(f"Invalid XML: {e}") from e
+        self.handle_events()
+        self.loader.endDocument()
+
+    def handle_events(self):
+        loader = self.loader
+        for event, elem in self.parser.read_events():
+            # Like the SAX backend, foreign elements are skipped, but
+            # their child elements are not
+            name = local_name(elem.tag)
+            if name is None:
+                if event == "end":
+                    elem.clear()
+            elif event == "start":
+                attrib = elem.attrib
+                if any(key[0] == "{" for key in attrib.keys()):
+                    attrs = {key.rsplit("}", 1)[-1]: val for key, val in attrib.items()}
+                else:
+                    attrs = dict(attrib)
+                loader.startElement(name, attrs)
+            else:
+                if elem.text:
+                    loader.characters(elem.text)
+                loader.endElement(name)
+                # Free elements that have been handled
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+
+# Parser backends, fastest first. The lxml backend needs to build (and
+# discard) an element tree, which makes it slower than the others.
+backends: Dict[str, Callable[[GaphorLoader], object]] = {
+    "expat": ExpatParser,
+    "sax": SaxParser,
+}
+if etree is not None:
+    backends["lxml"] = LxmlParser
+
+
 class ProgressGenerator:
     """A generator that yields the progress of taking from a file input object
     and feeding it into an output object.
@@ -335,18 +524,33 @@ class ProgressGenerator:
     reading and that it will be closed elsewhere.
     """
 
-    def __init__(self, input, output, block_size=512):
+    def __init__(
+        self,
+        input,
+        output,
+        block_size=4096,
+        max_block_size=1024 * 1024,
+        progress_interval=0.05,
+    ):
         """Initialize the progress generator.
 
         The input parameter is a file object.  The output parameter is
         usually a SAX parser but can be anything that implements a
-        feed() method.  The block size is the size of each block that is
-        read from the input.
+        feed() method.  The block size is the size of the first block
+        that is read from the input.
+
+        The block size is doubled, up to max_block_size, as long as
+        feeding a block takes less than a quarter of the progress
+        interval. It's halved again if feeding takes longer than the
+        interval. Progress is reported at most once every
+        progress_interval seconds.
         """
 
         self.input = input
         self.output = output
         self.block_size = block_size
+        self.max_block_size = max(block_size, max_block_size)
+        self.progress_interval = progress_interval
         if isinstance(self.input, io.IOBase):
             orig_pos = self.input.tell()
             self.file_size = self.input.seek(0, 2)
@@ -359,17 +563,36 @@ class ProgressGenerator:
         input and feeding it into the output.
 
         The progress yielded in each iteration is the percentage of data
-        read, relative to the to input file size.
+        read, relative to the to input file size. Progress for the last
+        block is always reported.
         """
 
-        block = self.input.read(self.block_size)
-        read_size = len(block)
+        min_block_size = block_size = self.block_size
+        max_block_size = self.max_block_size
+        interval = self.progress_interval
+        feed = self.output.feed
+        read = self.input.read
+
+        last_report = time.monotonic()
+        read_size = 0
+        block = read(block_size)
 
         while block:
-            self.output.feed(block)
-            block = self.input.read(self.block_size)
             read_size += len(block)
-            yield (read_size * 100) / self.file_size
+            start = time.monotonic()
+            feed(block)
+            now = time.monotonic()
+
+            elapsed = now - start
+            if elapsed < interval / 4:
+                block_size = min(block_size * 2, max_block_size)
+            elif elapsed > interval:
+                block_size = max(block_size // 2, min_block_size)
+
+            block = read(block_size)
+            if not block or now - last_report >= interval:
+                last_report = now
+                yield (read_size * 100) / self.file_size
 
 
 def parse_file(filename, parser):
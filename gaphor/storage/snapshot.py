@@ -0,0 +1,272 @@
+"""Binary snapshots of models, to reopen a model without parsing XML.
+
+A snapshot holds the model as it was loaded from a model file. It is
+stored in a cache directory, by the SHA-1 digest of the model file. A
+model file that changed gets a new snapshot.
+
+Snapshots are written with `marshal`, so they can only be read by the
+Python version that wrote them. A snapshot is also bound to the Gaphor
+version and the modeling languages it was written with. The snapshot
+contains:
+
+* a table of ids; elements refer to each other by index in this table
+* a table of element and diagram item types
+* for each element its type, id and properties, and for diagrams their
+  items
+
+Properties are stored as ``(name, kind, value)``, in the order they are
+saved. Values of attributes are stored as-is, other values are stored as
+they are written in the XML file. References are indices in the id
+table, reference lists are stored as integer arrays.
+"""
+
+import logging
+import marshal
+import os
+import sys
+from array import array
+from typing import Dict, List, Optional, Tuple, Type
+
+from gaphor import application
+from gaphor.core.modeling.collection import collection
+from gaphor.core.modeling.diagram import Diagram, PseudoCanvas
+from gaphor.core.modeling.element import Element
+from gaphor.core.modeling.presentation import Presentation
+from gaphor.core.modeling.properties import attribute, enumeration
+from gaphor.storage import storage
+
+SNAPSHOT_VERSION = 1
+SNAPSHOTS_KEPT = 10
+
+# Property kinds
+VALUE = 0
+REFERENCE = 1
+REFLIST = 2
+
+log = logging.getLogger(__name__)
+
+
+def header(
+    modeling_language,
+) -> Tuple[str, int, str, Tuple[str, ...], Tuple[int, int], int]:
+    """Snapshots with another header can not be read."""
+    return (
+        "gaphor-snapshot",
+        SNAPSHOT_VERSION,
+        application.distribution().version,
+        tuple(sorted(id for id, _ in modeling_language.modeling_languages)),
+        sys.version_info[:2],
+        marshal.version,
+    )
+
+
+class _Dumper:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.types: Dict[Tuple[str, bool], int] = {}
+        self._native: Dict[Tuple[type, str], bool] = {}
+
+    def id(self, id: str) -> int:
+        try:
+            return self.ids[id]
+        except KeyError:
+            index = self.ids[id] = len(self.ids)
+            return index
+
+    def type(self, element: Element) -> int:
+        key = (type(element).__name__, isinstance(element, Presentation))
+        try:
+            return self.types[key]
+        except KeyError:
+            index = self.types[key] = len(self.types)
+            return index
+
+    def native(self, element, name) -> bool:
+        key = (type(element), name)
+        try:
+            return self._native[key]
+        except KeyError:
+            prop = getattr(type(element), name, None)
+            native = self._native[key] = isinstance(prop, (attribute, enumeration))
+            return native
+
+    def properties(self, element: Element) -> List[tuple]:
+        properties: List[tuple] = []
+
+        def save_func(name, value):
+            if isinstance(value, Element):
+                if value.id:
+                    properties.append((name, REFERENCE, self.id(value.id)))
+            elif isinstance(value, collection):
+                if value:
+                    refs = array("I", [self.id(v.id) for v in value if v.id])
+                    properties.append((name, REFLIST, refs.tobytes()))
+            elif value is None or isinstance(value, PseudoCanvas):
+                pass
+            elif self.native(element, name):
+                properties.append((name, VALUE, value))
+            else:
+                text = str(int(value) if isinstance(value, bool) else value)
+                properties.append((name, VALUE, text))
+
+        element.save(save_func)
+        return properties
+
+    def item(self, item: Presentation, parent: int, items: List[tuple]) -> None:
+        index = self.id(item.id)
+        items.append((index, self.type(item), parent, self.properties(item)))
+        for child in item.children:
+            self.item(child, index, items)
+
+    def element(self, element: Element) -> tuple:
+        items: List[tuple] = []
+        if isinstance(element, Diagram):
+            for item in element.ownedPresentation:
+                if not item.parent:
+                    self.item(item, -1, items)
+        return (
+            self.id(element.id),
+            self.type(element),
+            self.properties(element),
+            items,
+        )
+
+
+def dump(factory, modeling_language) -> bytes:
+    """Create a snapshot of the model in factory."""
+    dumper = _Dumper()
+    elements = [dumper.element(element) for element in factory.values()]
+    ids = sorted(dumper.ids, key=dumper.ids.__getitem__)
+    types = sorted(dumper.types, key=dumper.types.__getitem__)
+    return marshal.dumps((header(modeling_language), ids, types, elements))
+
+
+def load(data: bytes, factory, modeling_language) -> None:
+    """Load a model from a snapshot."""
+    snapshot_header, ids, types, elements = marshal.loads(data)
+    if tuple(snapshot_header) != header(modeling_language):
+        raise ValueError(f"Unsupported snapshot {snapshot_header}")
+
+    classes: List[Type[Element]] = []
+    for name, is_item in types:
+        cls = (
+            modeling_language.lookup_diagram_item(name)
+            if is_item
+            else modeling_language.lookup_element(name)
+        )
+        if not cls:
+            raise ValueError(f"Type {name} can not be loaded: no such element")
+        classes.append(cls)
+
+    objects: List[Optional[Element]] = [None] * len(ids)
+    created: List[Tuple[Element, list]] = []
+
+    factory.flush()
+    with factory.block_events():
+        for index, type_index, properties, items in elements:
+            element = factory.create_as(classes[type_index], ids[index])
+            objects[index] = element
+            created.append((element, properties))
+            for item_index, item_type, parent, item_properties in items:
+                item = element.create_as(
+                    classes[item_type],
+                    ids[item_index],
+                    parent=objects[parent] if parent >= 0 else None,
+                )
+                objects[item_index] = item
+                created.append((item, item_properties))
+
+        for element, properties in created:
+            for name, kind, value in properties:
+                if kind == VALUE:
+                    element.load(name, value)
+                elif kind == REFERENCE:
+                    _load_reference(element, name, objects[value])
+                else:
+                    refs = [objects[ref] for ref in array("I", value)]
+                    if None in refs:
+                        log.error(f"Invalid reference for element {element}.{name}")
+                    prop = getattr(type(element), name)
+                    for ref in refs:
+                        if ref is not None:
+                            prop.load(element, ref)
+
+        storage.ensure_style_sheet_is_present(factory)
+
+        for element, _ in created:
+            element.postload()
+    factory.model_ready()
+
+
+def _load_reference(element, name, ref):
+    if ref is None:
+        log.error(f"Invalid reference for element {element}.{name}")
+    else:
+        element.load(name, ref)
+
+
+def snapshot_path(filename, cache_dir, digest: Optional[str] = None) -> str:
+    """The snapshot for the current contents of a model file.
+
+    The file is hashed, unless its digest is passed.
+    """
+    return os.path.join(
+        cache_dir, f"{digest or storage.file_digest(filename)}.snapshot"
+    )
+
+
+def write(
+    filename, factory, modeling_language, cache_dir, digest: Optional[str] = None
+) -> None:
+    """Write a snapshot of the model in factory, as saved in filename.
+
+    Only the most recently used snapshots are kept in the cache.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = snapshot_path(filename, cache_dir, digest)
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(dump(factory, modeling_language))
+    os.replace(f"{path}.tmp", path)
+
+    snapshots = sorted(
+        (
+            os.path.join(cache_dir, name)
+            for name in os.listdir(cache_dir)
+            if name.endswith(".snapshot")
+        ),
+        key=os.path.getmtime,
+        reverse=True,
+    )
+    for old in snapshots[SNAPSHOTS_KEPT:]:
+        os.remove(old)
+
+
+def load_generator(filename, factory, modeling_language, cache_dir):
+    """Load a model file, from its snapshot if there is one.
+
+    Otherwise the model is loaded from XML, and a snapshot is written.
+    Progress is reported like `storage.load_generator()` does.
+    """
+    digest = storage.file_digest(filename)
+    path = snapshot_path(filename, cache_dir, digest)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        pass
+    else:
+        try:
+            load(data, factory, modeling_language)
+        except Exception:
+            log.warning(f"Snapshot {path} could not be loaded", exc_info=True)
+        else:
+            # Keep recently used snapshots
+            os.utime(path)
+            yield 100
+            return
+
+    yield from storage.load_generator(filename, factory, modeling_language)
+    try:
+        write(filename, factory, modeling_language, cache_dir, digest)
+    except OSError:
+        log.warning(f"Could not write a snapshot of {filename}", exc_info=True)
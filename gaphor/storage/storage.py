@@ -6,11 +6,14 @@ file save(filename)     store the current model in a file
 
 __all__ = ["load", "save"]
 
+import hashlib
 import io
 import logging
 import os.path
 import uuid
 from functools import partial
+from typing import Dict, Iterator, List, Tuple
+from xml.sax.saxutils import escape, quoteattr
 
 from gaphor import application
 from gaphor.core.modeling.collection import collection
@@ -32,9 +35,25 @@ def save(writer=None, factory=None, status_queue=None):
             status_queue(status)
 
 
-def save_generator(writer, factory):
+def save_generator(writer, factory, fingerprints=None):
     """Save the current model using @writer, which is a
-    gaphor.storage.xmlwriter.XMLWriter instance."""
+    gaphor.storage.xmlwriter.XMLWriter instance.
+
+    A writer with `write_directly` set, such as XMLWriter, is not fed SAX
+    events. Instead, its output stream is written to by `XMLSerializer`,
+    which produces the same output.
+    With a `Fingerprints` service, the XML of elements that did not
+    change since the last save is reused.
+    """
+    if getattr(writer, "write_directly", False):
+        yield from XMLSerializer(
+            writer.out, writer.encoding, fingerprints
+        ).save_generator(factory)
+        return
+
+    # Lazily loaded diagram items are written by XMLSerializer only
+    for diagram in factory.lselect(Diagram):
+        diagram.materialize()
 
     writer.startDocument()
     writer.startPrefixMapping("", NAMESPACE_MODEL)
@@ -145,6 +164,225 @@ def save_element(name, value, writer):
         save_value(name, value)
 
 
+class XMLSerializer:
+    """Write a model as XML text.
+
+    The output is the same as the output of an XMLWriter fed by
+    `save_generator`. Instead of writing separate tags, the XML of each
+    element is formatted in one go from cached tag templates. Elements
+    are written in batches.
+
+    Diagrams that are loaded lazily are not materialized. Their items are
+    written as they were read, see `LazyCanvas`.
+
+    The XML of model elements is kept by `fingerprints`, if provided,
+    until the element changes.
+    """
+
+    def __init__(self, out, encoding="utf-8", fingerprints=None):
+        self.out = out
+        self.encoding = encoding
+        self.fingerprints = fingerprints
+        self._reference_tags: Dict[str, Tuple[str, str]] = {}
+        self._collection_tags: Dict[str, Tuple[str, str]] = {}
+        self._value_tags: Dict[str, Tuple[str, str]] = {}
+        self._deferred: Dict[Element, Dict[str, _DeferredReference]] = {}
+
+    def save_generator(self, factory, batch_size=25):
+        """Write all elements in factory.
+
+        Progress is reported for every batch of elements written.
+        """
+        out = self.out
+        out.write(
+            f'<?xml version="1.0" encoding="{self.encoding}"?>\n'
+            f'<gaphor xmlns="{NAMESPACE_MODEL}"'
+            f" version={quoteattr(FILE_FORMAT_VERSION)}"
+            f" gaphor-version={quoteattr(application.distribution().version)}"
+        )
+
+        self._deferred = deferred_references(factory)
+        size = factory.size()
+        separator = ">\n"
+        batch: List[str] = []
+        for n, e in enumerate(factory.values(), start=1):
+            assert e.id
+            batch.append(self.element(e))
+
+            if n % batch_size == 0:
+                out.write(separator + "\n".join(batch))
+                separator = "\n"
+                batch.clear()
+                yield (n * 100) / size
+
+        if batch:
+            out.write(separator + "\n".join(batch))
+            separator = "\n"
+
+        out.write("/>" if separator == ">\n" else "\n</gaphor>")
+
+    def element(self, element):
+        """Return the XML for a model element."""
+        if (
+            self.fingerprints
+            and not isinstance(element, (Diagram, Presentation))
+            and element not in self._deferred
+        ):
+            return self.fingerprints.memo(element, "xml", self._element)
+        return self._element(element)
+
+    def _element(self, element):
+        return self._tag(
+            f"<{element.__class__.__name__} id={quoteattr(str(element.id))}",
+            element.__class__.__name__,
+            self._properties(element),
+        )
+
+    def item(self, item):
+        """Return the XML for a diagram item, including its children."""
+        assert isinstance(item, Presentation)
+        parts = self._properties(item)
+        parts.extend(self.item(child) for child in item.children)
+        return self._tag(
+            f"<item id={quoteattr(item.id)} type={quoteattr(item.__class__.__name__)}",
+            "item",
+            parts,
+        )
+
+    def lazy_item(self, lazy_item):
+        """Return the XML for a diagram item that has not been created."""
+        parts: List[str] = []
+        for name, value, kind in lazy_item.properties:
+            if kind == "val":
+                self._value(parts, name, escape(value))
+            elif kind == "ref":
+                self._reference(parts, name, value)
+            else:
+                self._reflist(parts, name, value)
+        parts.extend(self.lazy_item(child) for child in lazy_item.items)
+        return self._tag(
+            f"<item id={quoteattr(lazy_item.id)}"
+            f" type={quoteattr(lazy_item.cls.__name__)}",
+            "item",
+            parts,
+        )
+
+    def _tag(self, start, name, parts):
+        if parts:
+            return f"{start}>\n" + "\n".join(parts) + f"\n</{name}>"
+        return f"{start}/>"
+
+    def _properties(self, element):
+        parts: List[str] = []
+        deferred = self._deferred.get(element)
+        lazy_canvas = isinstance(element, Diagram) and element.lazy_canvas
+        if deferred or lazy_canvas:
+            for prop in element.umlproperties():
+                if deferred and prop.name in deferred:
+                    self._deferred_property(parts, element, prop, deferred[prop.name])
+                elif lazy_canvas and prop is Diagram.ownedPresentation:
+                    # Older models do not store the diagram's items
+                    refids = [item.id for item in lazy_canvas.all_items()]
+                    if refids:
+                        self._reflist(parts, prop.name, refids)
+                else:
+                    prop.save(element, partial(self._property, parts))
+            if isinstance(element, Diagram):
+                self._property(parts, "canvas", PseudoCanvas(element))
+        else:
+            element.save(partial(self._property, parts))
+        return parts
+
+    def _deferred_property(self, parts, element, prop, deferred):
+        """Write references to created and not created diagram items.
+
+        References are written in the order they were read, followed by
+        the references added since.
+        """
+        refids: List[str] = []
+
+        def save_refids(name, value):
+            refids.extend(
+                v.id for v in (value if isinstance(value, collection) else [value])
+            )
+
+        # Do not create the items of a lazy diagram to list them
+        if prop is not Diagram.ownedPresentation or not element.lazy_canvas:
+            prop.save(element, save_refids)
+        live = set(refids)
+        read = set(deferred.refids)
+        refids = [
+            refid
+            for refid in deferred.refids
+            if refid in live
+            or (refid in deferred.lazy and deferred.lazy[refid].lazy_canvas)
+        ] + [refid for refid in refids if refid and refid not in read]
+        if not refids:
+            return
+        if deferred.many:
+            self._reflist(parts, prop.name, refids)
+        else:
+            self._reference(parts, prop.name, refids[0])
+
+    def _property(self, parts, name, value):
+        if isinstance(value, Element):
+            if value.id:
+                self._reference(parts, name, value.id)
+        elif isinstance(value, collection):
+            if value:
+                self._reflist(parts, name, [v.id for v in value if v.id])
+        elif isinstance(value, PseudoCanvas):
+            items: List[str] = []
+            lazy_canvas = value.diagram.lazy_canvas
+            if isinstance(lazy_canvas, LazyCanvas):
+                items.extend(self.lazy_item(item) for item in lazy_canvas.items)
+            else:
+                value.save(lambda item: items.append(self.item(item)))
+            parts.append(self._tag("<canvas", "canvas", items))
+        elif value is not None:
+            if isinstance(value, bool):
+                # Write booleans as 0/1.
+                self._value(parts, name, int(value))
+            else:
+                self._value(parts, name, escape(str(value)))
+
+    def _reference(self, parts, name, refid):
+        start, end = self._tags(self._reference_tags, name, "<ref refid=")
+        parts.append(f"{start}{quoteattr(refid)}/>{end}")
+
+    def _reflist(self, parts, name, refids):
+        refs = [f"<ref refid={quoteattr(refid)}/>" for refid in refids]
+        start, end = self._tags(self._collection_tags, name, "<reflist")
+        parts.append(
+            f"{start}>\n" + "\n".join(refs) + f"\n</reflist>{end}"
+            if refs
+            else f"{start}/>{end}"
+        )
+
+    def _value(self, parts, name, text):
+        start, end = self._tags(self._value_tags, name, "<val>")
+        parts.append(f"{start}{text}</val>{end}")
+
+    def _tags(self, cache, name, inner):
+        try:
+            return cache[name]
+        except KeyError:
+            tags = cache[name] = (f"<{name}>\n{inner}", f"\n</{name}>")
+            return tags
+
+
+def deferred_references(factory):
+    """References from model elements to diagram items that have not been
+    created, by element and property name."""
+    deferred: Dict[Element, Dict[str, _DeferredReference]] = {}
+    for diagram in factory.select(Diagram):
+        lazy_canvas = diagram.lazy_canvas
+        if isinstance(lazy_canvas, LazyCanvas):
+            for ref in lazy_canvas.references:
+                deferred.setdefault(ref.element, {})[ref.name] = ref
+    return deferred
+
+
 def load_elements(elements, factory, modeling_language, gaphor_version="1.0.0"):
     for _ in load_elements_generator(
         elements, factory, modeling_language, gaphor_version
@@ -251,27 +489,48 @@ def _load_attributes_and_references(elements, update_status_queue):
                     elem.element.load(name, ref.element)
 
 
-def load(filename, factory, modeling_language, status_queue=None):
+def load(
+    filename,
+    factory,
+    modeling_language,
+    status_queue=None,
+    streaming=True,
+    lazy=False,
+):
     """Load a file and create a model if possible.
 
     Optionally, a status queue function can be given, to which the
     progress is written (as status_queue(progress)).
     """
-    for status in load_generator(filename, factory, modeling_language):
+    for status in load_generator(filename, factory, modeling_language, streaming, lazy):
         if status_queue:
             status_queue(status)
 
 
-def load_generator(filename, factory, modeling_language):
+def load_generator(filename, factory, modeling_language, streaming=True, lazy=False):
     """Load a file and create a model if possible.
 
     This function is a generator. It will yield values from 0 to 100 (%)
     to indicate its progression.
+
+    By default the model is created while the file is parsed (see
+    `StreamingLoader`). If ``streaming`` is ``False``, the file is parsed
+    completely first and the model is created from the parsed elements
+    afterwards.
+
+    If ``lazy`` is ``True``, diagram items are not created until a
+    diagram is used (see `LazyCanvas`). This only applies to streaming
+    loads of models created with Gaphor 1.1.0 or newer.
     """
     if isinstance(filename, io.IOBase):
         log.info("Loading file from file descriptor")
     else:
         log.info(f"Loading file {os.fsdecode(os.path.basename(filename))}")
+
+    if streaming:
+        yield from _load_streaming_generator(filename, factory, modeling_language, lazy)
+        return
+
     try:
         # Use the incremental parser and yield the percentage of the file.
         loader = parser.GaphorLoader()
@@ -287,6 +546,14 @@ def load_generator(filename, factory, modeling_language):
         log.exception("File could no be parsed")
         raise
 
+    yield from _load_parsed_elements_generator(
+        filename, elements, factory, modeling_language, gaphor_version
+    )
+
+
+def _load_parsed_elements_generator(
+    filename, elements, factory, modeling_language, gaphor_version
+):
     if version_lower_than(gaphor_version, (0, 17, 0)):
         raise ValueError(
             f"Gaphor model version should be at least 0.17.0 (found {gaphor_version})"
@@ -311,6 +578,406 @@ def load_generator(filename, factory, modeling_language):
     factory.model_ready()
 
 
+def _load_streaming_generator(filename, factory, modeling_language, lazy=False):
+    factory.flush()
+    with factory.block_events():
+        loader = StreamingLoader(factory, modeling_language, lazy)
+        try:
+            for percentage in parser.parse_generator(filename, loader):
+                yield percentage * 0.9
+        except OSError:
+            log.exception("File could no be parsed")
+            raise
+        except Exception as e:
+            log.warning(f"file {filename} could not be loaded ({e})")
+            raise
+
+    if not loader.streaming:
+        # Old models need to be upgraded before elements can be created
+        yield from _load_parsed_elements_generator(
+            filename,
+            loader.elements,
+            factory,
+            modeling_language,
+            loader.gaphor_version,
+        )
+        return
+
+    log.info(f"Read {len(loader.created)} elements from file")
+
+    with factory.block_events():
+        try:
+            ensure_style_sheet_is_present(factory)
+
+            size = len(loader.created)
+            for n, element in enumerate(loader.created, start=1):
+                element.postload()
+                if n % 30 == 0:
+                    yield 90 + (n * 10) / size
+            yield 100
+        except Exception as e:
+            log.warning(f"file {filename} could not be loaded ({e})")
+            raise
+    factory.model_ready()
+
+
+class _PendingReference:
+    """A reference that can not be loaded until all referenced elements have
+    been created."""
+
+    __slots__ = ("element", "name", "refids", "many", "missing")
+
+    def __init__(self, element, name, refids, many, missing):
+        self.element = element
+        self.name = name
+        self.refids = refids
+        self.many = many
+        self.missing = missing
+
+
+class _LazyItem:
+    """A diagram item read from the model file, that has not been created yet.
+
+    ``properties`` holds the values and references of the item, in file
+    order, as ``(name, value, kind)`` tuples. ``kind`` is one of
+    ``"val"``, ``"ref"`` and ``"reflist"``.
+    """
+
+    __slots__ = ("id", "cls", "properties", "items")
+
+    def __init__(self, id, cls):
+        self.id = id
+        self.cls = cls
+        self.properties: List[Tuple[str, object, str]] = []
+        self.items: List[_LazyItem] = []
+
+
+class _DeferredReference:
+    """A reference from a model element to diagram items that have not been
+    created yet.
+
+    ``refids`` are all ids referenced, in file order. ``lazy`` maps the
+    ids of the diagram items to their diagram. References are shared by
+    the lazy canvases of all diagrams involved.
+    """
+
+    __slots__ = ("element", "name", "refids", "many", "lazy")
+
+    def __init__(self, element, name, refids, many, lazy):
+        self.element = element
+        self.name = name
+        self.refids = refids
+        self.many = many
+        self.lazy = lazy
+
+
+class LazyCanvas:
+    """The diagram items of a lazily loaded diagram.
+
+    The items are kept as read from the model file. They're created by
+    `materialize()`, which is called by the diagram when its items are
+    needed. Until then, the items are saved as they were read.
+    References from model elements to the items are kept here as well.
+    """
+
+    def __init__(self, modeling_language):
+        self.modeling_language = modeling_language
+        self.items: List[_LazyItem] = []
+        self.references: List[_DeferredReference] = []
+
+    def all_items(self) -> Iterator[_LazyItem]:
+        """All items, including nested items, in file order."""
+        stack = [iter(self.items)]
+        while stack:
+            for item in stack[-1]:
+                yield item
+                stack.append(iter(item.items))
+                break
+            else:
+                stack.pop()
+
+    def materialize(self, diagram):
+        """Create the diagram items on diagram."""
+        model = diagram.model
+        created: List[Tuple[_LazyItem, Presentation]] = []
+        items: Dict[str, Presentation] = {}
+
+        def create_items(lazy_items, parent=None):
+            for lazy_item in lazy_items:
+                item = diagram.create_as(lazy_item.cls, lazy_item.id, parent=parent)
+                items[lazy_item.id] = item
+                created.append((lazy_item, item))
+                create_items(lazy_item.items, parent=item)
+
+        def lookup(refid, element, name):
+            ref = items.get(refid) or model.lookup(refid)
+            if ref is None:
+                log.error(
+                    f"Invalid ID for reference ({refid}) for element {element}.{name}"
+                )
+            return ref
+
+        with model.block_events():
+            create_items(self.items)
+
+            for deferred in self.references:
+                element = deferred.element
+                for refid, lazy_diagram in deferred.lazy.items():
+                    if lazy_diagram is diagram:
+                        element.load(deferred.name, items[refid])
+                element.__dict__.get("_lazy_diagrams", {}).pop(diagram, None)
+
+            for lazy_item, item in created:
+                for name, value, kind in lazy_item.properties:
+                    if kind == "val":
+                        item.load(name, value)
+                    elif kind == "ref":
+                        ref = lookup(value, item, name)
+                        if ref is not None:
+                            item.load(name, ref)
+                    else:
+                        for refid in value:  # type: ignore[attr-defined]
+                            ref = lookup(refid, item, name)
+                            if ref is not None:
+                                item.load(name, ref)
+
+            for _, item in created:
+                item.postload()
+
+        # The watchers of the new items are registered by the element
+        # dispatcher with the next event, now their properties are loaded.
+
+
+class StreamingLoader(parser.GaphorLoader):
+    """Create model elements while the model file is being parsed.
+
+    Elements and diagram items are created as soon as their start tag is
+    read. Values are loaded as soon as they are complete. References are
+    loaded right away if all referenced elements exist. Otherwise they're
+    queued until the missing elements have been created. The ordering of
+    reference lists is kept by loading a list as a whole.
+
+    Models older than 1.1.0 require upgrades that need the complete parsed
+    model. For those models the loader behaves like a plain
+    `parser.GaphorLoader` and ``streaming`` is set to ``False``.
+
+    If ``lazy`` is set, diagram items are not created. They are kept in a
+    `LazyCanvas` on their diagram instead, together with the references
+    from model elements to them.
+    """
+
+    def __init__(self, factory, modeling_language, lazy=False):
+        self.factory = factory
+        self.modeling_language = modeling_language
+        self.lazy = lazy
+        super().__init__()
+
+    def startDocument(self):
+        super().startDocument()
+        self.streaming = True
+        # All elements and diagram items created, in document order:
+        self.created: List[Element] = []
+        # Diagram items are not managed by the element factory:
+        self._items: Dict[str, Presentation] = {}
+        # Pending references, by the id of the element they wait for:
+        self._pending: Dict[str, List[_PendingReference]] = {}
+        # Diagrams of diagram items that are not created, by item id:
+        self._lazy_items: Dict[str, Diagram] = {}
+
+    def endDocument(self):
+        super().endDocument()
+        for refid, pending in self._pending.items():
+            for ref in pending:
+                log.error(
+                    f"Invalid ID for reference ({refid}) for element {ref.element}.{ref.name}"
+                )
+        self._pending.clear()
+        self._items.clear()
+        self._lazy_items.clear()
+
+    def start_root(self, state, name, attrs):
+        handled = super().start_root(state, name, attrs)
+        if handled and (
+            not self.gaphor_version
+            or version_lower_than(self.gaphor_version, (1, 1, 0))
+        ):
+            self.streaming = False
+        return handled
+
+    def start_element(self, state, name, attrs):
+        if not self.streaming:
+            return super().start_element(state, name, attrs)
+
+        if state == parser.GAPHOR:
+            id = attrs["id"]
+            if self.factory.lookup(id):
+                log.exception(
+                    f"File corrupt: duplicate element. Remove element {name} with id {id} and try again"
+                )
+            cls = self.modeling_language.lookup_element(name)
+            assert cls, f"Type {name} can not be loaded: no such element"
+            element = self.factory.create_as(cls, id)
+            self.push(element, name == "Diagram" and parser.DIAGRAM or parser.ELEMENT)
+            self.element_created(element)
+            return True
+
+    def start_canvas(self, state, name, attrs):
+        if not self.streaming:
+            return super().start_canvas(state, name, attrs)
+
+        if state == parser.DIAGRAM and name == "canvas":
+            if self.lazy:
+                diagram = self.peek()
+                diagram.lazy_canvas = LazyCanvas(self.modeling_language)
+                self.push(diagram.lazy_canvas, parser.CANVAS)
+            else:
+                self.push(self.peek(), parser.CANVAS)
+            return True
+
+    def start_canvas_item(self, state, name, attrs):
+        if not self.streaming:
+            return super().start_canvas_item(state, name, attrs)
+
+        if state in (parser.CANVAS, parser.ITEM) and name == "item":
+            id = attrs["id"]
+            assert (
+                id not in self._items and id not in self._lazy_items
+            ), f"{id} already defined"
+            ci = parser.canvasitem(id, attrs["type"])
+            ci = upgrade_canvas_item_to_1_0_2(ci)
+            ci = upgrade_canvas_item_to_1_3_0(ci)
+            cls = self.modeling_language.lookup_diagram_item(ci.type)
+            assert cls, f"No diagram item for type {ci.type}"
+            if self.lazy:
+                self.lazy_item_read(_LazyItem(id, cls), state)
+                return True
+            if state == parser.CANVAS:
+                diagram, parent = self.peek(), None
+            else:
+                parent = self.peek()
+                diagram = parent.diagram
+            item = diagram.create_as(cls, id, parent=parent)
+            self._items[id] = item
+            self.push(item, parser.ITEM)
+            self.element_created(item)
+            return True
+
+    def start_reference(self, state, name, attrs):
+        if not self.streaming:
+            return super().start_reference(state, name, attrs)
+
+        # Collect the reference list, it's loaded when it's complete
+        if state == parser.ATTR and name == "reflist":
+            self.push([], parser.REFLIST)
+            return True
+
+        elif state == parser.ATTR and name == "ref":
+            self.load_references(2, self.peek(1), [attrs["refid"]])
+            self.push(None, parser.REF)
+            return True
+
+        elif state == parser.REFLIST and name == "ref":
+            self.peek().append(attrs["refid"])
+            self.push(None, parser.REF)
+            return True
+
+    def endElement(self, name):
+        if not self.streaming:
+            return super().endElement(name)
+
+        state = self.state()
+        if state == parser.VAL:
+            element, element_state = self._stack[-3]
+            if isinstance(element, _LazyItem):
+                element.properties.append((self.peek(2), self.text, "val"))
+            elif element_state != parser.CANVAS:
+                element.load(self.peek(2), self.text)
+        elif state == parser.REFLIST:
+            self.load_references(3, self.peek(2), self.peek())
+        self.pop()
+
+    def lookup(self, id):
+        element = self.factory.lookup(id)
+        return self._items.get(id) if element is None else element
+
+    def load_references(self, depth, name, refids):
+        """Load references for the element ``depth`` levels up the stack."""
+        element, element_state = self._stack[-depth]
+        if element_state == parser.CANVAS:
+            return
+
+        many = depth == 3
+        if isinstance(element, _LazyItem):
+            element.properties.append(
+                (name, refids, "reflist") if many else (name, refids[0], "ref")
+            )
+            return
+
+        if (
+            name == "ownedComment"
+            and element_state != parser.ITEM
+            and version_lower_than(self.gaphor_version, (2, 1, 0))
+        ):
+            name = "comment"
+
+        lookup = self.lookup
+        lazy_items = self._lazy_items
+        missing = {
+            refid
+            for refid in refids
+            if lookup(refid) is None and refid not in lazy_items
+        }
+        if missing:
+            pending = _PendingReference(element, name, refids, many, len(missing))
+            for refid in missing:
+                self._pending.setdefault(refid, []).append(pending)
+        else:
+            self._load_references(element, name, refids, many)
+
+    def _load_references(self, element, name, refids, many):
+        lazy_items = self._lazy_items
+        if lazy_items and any(refid in lazy_items for refid in refids):
+            self.defer_references(element, name, refids, many)
+        for refid in refids:
+            if refid not in lazy_items:
+                element.load(name, self.lookup(refid))
+
+    def defer_references(self, element, name, refids, many):
+        """Keep references to diagram items that are not created, until their
+        diagrams are materialized."""
+        lazy_items = self._lazy_items
+        lazy = {refid: lazy_items[refid] for refid in refids if refid in lazy_items}
+        deferred = _DeferredReference(element, name, refids, many, lazy)
+        lazy_diagrams = element.__dict__.setdefault("_lazy_diagrams", {})
+        for diagram in dict.fromkeys(lazy.values()):
+            lazy_diagrams[diagram] = None
+            lazy_canvas = diagram.lazy_canvas
+            assert lazy_canvas
+            lazy_canvas.references.append(deferred)
+
+    def element_created(self, element):
+        self.created.append(element)
+        self._resolve_pending(element.id)
+
+    def lazy_item_read(self, lazy_item, state):
+        if state == parser.CANVAS:
+            diagram = self.peek(2)
+        else:
+            diagram = self._lazy_items[self.peek().id]
+        self.peek().items.append(lazy_item)
+        self._lazy_items[lazy_item.id] = diagram
+        self.push(lazy_item, parser.ITEM)
+        self._resolve_pending(lazy_item.id)
+
+    def _resolve_pending(self, id):
+        for pending in self._pending.pop(id, ()):
+            pending.missing -= 1
+            if not pending.missing:
+                self._load_references(
+                    pending.element, pending.name, pending.refids, pending.many
+                )
+
+
 def version_lower_than(gaphor_version, version):
     """Only major and minor versions are checked.
 
@@ -368,6 +1035,15 @@ def clone_canvasitem(item, subject_id):
     return new_item
 
 
+def file_digest(filename) -> str:
+    """The SHA-1 digest of a file."""
+    sha = hashlib.sha1()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
 def ensure_style_sheet_is_present(factory):
     style_sheet = next(factory.select(StyleSheet), None)
     if not style_sheet:
@@ -0,0 +1,160 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from gaphor.storage.parser import (
+    GaphorLoader,
+    ParserException,
+    ProgressGenerator,
+    backends,
+    element,
+    parse,
+    parse_generator,
+)
+
+LONG_VALUE_MODEL = """<?xml version="1.0" encoding="utf-8"?>
+<gaphor xmlns="http://gaphor.sourceforge.net/model" version="3.0" gaphor-version="2.2.1">
+<Comment id="1">
+<body>
+<val>{body}</val>
+</body>
+</Comment>
+</gaphor>
+"""
+
+
+class FeedRecorder:
+    def __init__(self):
+        self.blocks = []
+
+    def feed(self, block):
+        self.blocks.append(block)
+
+
+def test_long_value_is_read_in_full():
+    body = "\n".join(f"line {n} &amp; more" for n in range(10000))
+    loader = GaphorLoader()
+
+    for _ in parse_generator(StringIO(LONG_VALUE_MODEL.format(body=body)), loader):
+        pass
+
+    assert loader.elements["1"].values["body"] == body.replace("&amp;", "&")
+
+
+def test_progress_is_reported_for_last_block():
+    output = FeedRecorder()
+
+    progress = list(
+        ProgressGenerator(StringIO("x" * 10000), output, progress_interval=3600)
+    )
+
+    assert progress == [100]
+    assert "".join(output.blocks) == "x" * 10000
+
+
+def test_progress_is_reported_for_every_block_without_interval():
+    output = FeedRecorder()
+
+    progress = list(
+        ProgressGenerator(
+            StringIO("x" * 1000), output, block_size=100, progress_interval=0
+        )
+    )
+
+    assert progress == [10 * n for n in range(1, 11)]
+    assert {len(b) for b in output.blocks} == {100}
+
+
+def test_block_size_grows_up_to_max_block_size():
+    output = FeedRecorder()
+
+    for _ in ProgressGenerator(
+        StringIO("x" * 100000), output, block_size=100, max_block_size=6400
+    ):
+        pass
+
+    sizes = [len(b) for b in output.blocks]
+    assert sizes[:7] == [100, 200, 400, 800, 1600, 3200, 6400]
+    assert max(sizes) == 6400
+
+
+ROOT = Path(__file__).parent.parent.parent.parent
+MODEL_FILES = sorted(
+    [*ROOT.glob("test-models/*.gaphor"), *ROOT.glob("models/*.gaphor")]
+)
+
+
+def dump(elements):
+    def dump_canvasitems(canvasitems):
+        return [ci.id for ci in canvasitems]
+
+    def dump_element(e):
+        if isinstance(e, element):
+            canvas = e.canvas and (
+                e.canvas.values,
+                e.canvas.references,
+                dump_canvasitems(e.canvas.canvasitems),
+            )
+        else:
+            canvas = dump_canvasitems(e.canvasitems)
+        return (type(e).__name__, e.id, e.type, e.values, e.references, canvas)
+
+    return [dump_element(e) for e in elements.values()]
+
+
+@pytest.mark.parametrize("backend", ["expat", "lxml"])
+@pytest.mark.parametrize("model", MODEL_FILES, ids=lambda p: p.name)
+def test_parser_backends_produce_the_same_elements(backend, model):
+    if backend not in backends:
+        pytest.skip(f"Parser backend {backend} is not available")
+
+    assert dump(parse(model, backend)) == dump(parse(model, "sax"))
+
+
+FOREIGN_NAMESPACE_MODEL = """<?xml version="1.0" encoding="utf-8"?>
+<gaphor xmlns="http://gaphor.sourceforge.net/model" xmlns:x="http://example.com/x" version="3.0" gaphor-version="2.2.1">
+<x:extension x:kind="wrapper">
+<Class id="1">
+<name>
+<val>Wrapped</val>
+</name>
+<x:note><x:text>ignored</x:text></x:note>
+<ownedAttribute>
+<reflist>
+<ref refid="2"/>
+</reflist>
+</ownedAttribute>
+</Class>
+</x:extension>
+<Property id="2">
+<x:extension>
+<name>
+<val>attr</val>
+</name>
+</x:extension>
+</Property>
+</gaphor>
+"""
+
+
+@pytest.mark.parametrize("backend", ["expat", "lxml"])
+def test_parser_backends_handle_foreign_elements_like_sax(backend):
+    if backend not in backends:
+        pytest.skip(f"Parser backend {backend} is not available")
+
+    elements = parse(StringIO(FOREIGN_NAMESPACE_MODEL), backend)
+
+    assert dump(elements) == dump(parse(StringIO(FOREIGN_NAMESPACE_MODEL), "sax"))
+    assert elements["1"].values == {"name": "Wrapped"}
+    assert elements["1"].references == {"ownedAttribute": ["2"]}
+    assert elements["2"].values == {"name": "attr"}
+
+
+def test_default_parser_backend_is_expat():
+    assert next(iter(backends)) == "expat"
+
+
+def test_unknown_parser_backend():
+    with pytest.raises(ParserException):
+        parse(StringIO(LONG_VALUE_MODEL.format(body="")), "unknown")
@@ -0,0 +1,138 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from gaphor.application import distribution
+from gaphor.core.eventmanager import EventManager
+from gaphor.core.modeling import ElementFactory
+from gaphor.services.modelinglanguage import ModelingLanguageService
+from gaphor.storage import snapshot, storage
+from gaphor.storage.xmlwriter import XMLWriter
+
+MODELS = [
+    *sorted((Path(distribution().locate_file("models"))).glob("*.gaphor")),
+    *sorted((Path(distribution().locate_file("examples"))).glob("*.gaphor")),
+]
+
+
+@pytest.fixture
+def modeling_language():
+    # Models contain UML and SysML elements
+    return ModelingLanguageService(EventManager())
+
+
+def new_element_factory():
+    return ElementFactory(EventManager())
+
+
+def saved(element_factory):
+    out = StringIO()
+    storage.save(XMLWriter(out), element_factory)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: model.name)
+def test_snapshot_loads_the_same_model_as_xml(model, modeling_language):
+    element_factory = new_element_factory()
+    storage.load(model, element_factory, modeling_language)
+    # Loading can change a model slightly, e.g. lines are connected
+    from_xml = new_element_factory()
+    storage.load(StringIO(saved(element_factory)), from_xml, modeling_language)
+    from_snapshot = new_element_factory()
+
+    snapshot.load(
+        snapshot.dump(element_factory, modeling_language),
+        from_snapshot,
+        modeling_language,
+    )
+
+    assert from_snapshot.size() == from_xml.size()
+    assert saved(from_snapshot) == saved(from_xml)
+
+
+def test_snapshot_is_written_on_first_load(tmp_path, modeling_language):
+    model = distribution().locate_file("test-models/simple-items.gaphor")
+    for _ in snapshot.load_generator(
+        model, new_element_factory(), modeling_language, tmp_path
+    ):
+        pass
+
+    assert Path(snapshot.snapshot_path(model, tmp_path)).exists()
+
+
+def test_model_file_is_hashed_once_on_first_load(
+    tmp_path, modeling_language, monkeypatch
+):
+    model = distribution().locate_file("test-models/simple-items.gaphor")
+    digests = []
+
+    def file_digest(filename):
+        digests.append(filename)
+        return "digest"
+
+    monkeypatch.setattr(storage, "file_digest", file_digest)
+    for _ in snapshot.load_generator(
+        model, new_element_factory(), modeling_language, tmp_path
+    ):
+        pass
+
+    assert digests == [model]
+    assert (tmp_path / "digest.snapshot").exists()
+
+
+def test_model_is_loaded_from_snapshot(tmp_path, modeling_language, monkeypatch):
+    model = distribution().locate_file("test-models/simple-items.gaphor")
+    from_xml = new_element_factory()
+    storage.load(model, from_xml, modeling_language)
+    snapshot.write(model, from_xml, modeling_language, tmp_path)
+
+    def no_xml(*args):
+        raise AssertionError("Model should be loaded from the snapshot")
+
+    monkeypatch.setattr(storage, "load_generator", no_xml)
+    from_snapshot = new_element_factory()
+    for _ in snapshot.load_generator(model, from_snapshot, modeling_language, tmp_path):
+        pass
+
+    assert saved(from_snapshot) == saved(from_xml)
+
+
+def test_invalid_snapshot_falls_back_to_xml(tmp_path, modeling_language):
+    model = distribution().locate_file("test-models/simple-items.gaphor")
+    Path(snapshot.snapshot_path(model, tmp_path)).write_bytes(b"invalid")
+    element_factory = new_element_factory()
+
+    for _ in snapshot.load_generator(
+        model, element_factory, modeling_language, tmp_path
+    ):
+        pass
+
+    assert element_factory.size()
+
+
+def test_snapshot_of_another_gaphor_version_is_rejected(modeling_language, monkeypatch):
+    data = snapshot.dump(new_element_factory(), modeling_language)
+
+    class OtherDistribution:
+        version = "0.0.0"
+
+    monkeypatch.setattr(snapshot.application, "distribution", OtherDistribution)
+
+    with pytest.raises(ValueError):
+        snapshot.load(data, new_element_factory(), modeling_language)
+
+
+def test_snapshot_with_other_modeling_languages_is_rejected(
+    modeling_language, monkeypatch
+):
+    data = snapshot.dump(new_element_factory(), modeling_language)
+
+    monkeypatch.setattr(
+        ModelingLanguageService,
+        "modeling_languages",
+        property(lambda self: iter([("UML", "UML")])),
+    )
+
+    with pytest.raises(ValueError):
+        snapshot.load(data, new_element_factory(), modeling_language)
@@ -7,7 +7,7 @@ import pytest
 
 from gaphor import UML
 from gaphor.application import distribution
-from gaphor.core.modeling import StyleSheet
+from gaphor.core.modeling import Diagram, StyleSheet
 from gaphor.diagram.general import CommentItem
 from gaphor.storage import storage
 from gaphor.storage.xmlwriter import XMLWriter
@@ -271,3 +271,168 @@ class StorageTestCase(TestCase):
                 )
 
         self.assertRaises(ValueError, load_old_model)
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        "test-models/simple-items.gaphor",
+        "test-models/multiple-messages.gaphor",
+        "examples/all-elements.gaphor",
+    ],
+)
+def test_streaming_and_three_pass_load_create_the_same_model(
+    model, element_factory, modeling_language
+):
+    path = distribution().locate_file(model)
+
+    def load_and_save(streaming):
+        with open(path) as ifile:
+            storage.load(
+                ifile,
+                factory=element_factory,
+                modeling_language=modeling_language,
+                streaming=streaming,
+            )
+        pf = PseudoFile()
+        storage.save(XMLWriter(pf), factory=element_factory)
+        element_factory.flush()
+        return pf.data
+
+    three_pass = load_and_save(streaming=False)
+    streaming = load_and_save(streaming=True)
+
+    if model == "test-models/multiple-messages.gaphor":
+        # Upgraded message items get a new id
+        expr = re.compile('id="[^"]*"')
+        three_pass = expr.sub("%ID%", three_pass)
+        streaming = expr.sub("%ID%", streaming)
+
+    assert streaming == three_pass
+
+
+class SaxXMLWriter(XMLWriter):
+    """An XMLWriter that is fed SAX events by save_generator()."""
+
+    write_directly = False
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        "test-models/simple-items.gaphor",
+        "test-models/dbus.gaphor",
+        "examples/all-elements.gaphor",
+    ],
+)
+def test_serializer_output_is_identical_to_xml_writer_output(
+    model, element_factory, modeling_language
+):
+    path = distribution().locate_file(model)
+    with open(path) as ifile:
+        storage.load(
+            ifile, factory=element_factory, modeling_language=modeling_language
+        )
+
+    sax_output = PseudoFile()
+    storage.save(SaxXMLWriter(sax_output), factory=element_factory)
+    serializer_output = PseudoFile()
+    storage.save(XMLWriter(serializer_output), factory=element_factory)
+
+    assert serializer_output.data == sax_output.data
+
+
+def test_serializer_output_for_empty_model(element_factory):
+    sax_output = PseudoFile()
+    storage.save(SaxXMLWriter(sax_output), factory=element_factory)
+    serializer_output = PseudoFile()
+    storage.save(XMLWriter(serializer_output), factory=element_factory)
+
+    assert serializer_output.data == sax_output.data
+    assert serializer_output.data.endswith("/>")
+
+
+def load_and_save(path, element_factory, modeling_language, lazy=False):
+    storage.load(
+        path, factory=element_factory, modeling_language=modeling_language, lazy=lazy
+    )
+    pf = PseudoFile()
+    storage.save(XMLWriter(pf), factory=element_factory)
+    return pf.data
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        "test-models/simple-items.gaphor",
+        "examples/all-elements.gaphor",
+    ],
+)
+def test_lazy_load_saves_the_model_as_read(model, element_factory, modeling_language):
+    path = distribution().locate_file(model)
+    # Items of lazy diagrams are saved as read, without upgrades
+    current = load_and_save(path, element_factory, modeling_language)
+    lazy = load_and_save(
+        StringIO(current), element_factory, modeling_language, lazy=True
+    )
+
+    assert element_factory.lselect(lambda e: getattr(e, "lazy_canvas", None))
+    assert lazy == current
+
+
+def test_lazy_load_does_not_create_diagram_items(element_factory, modeling_language):
+    path = distribution().locate_file("examples/all-elements.gaphor")
+    load_and_save(path, element_factory, modeling_language, lazy=True)
+    diagram = element_factory.lselect(Diagram)[0]
+
+    assert all(d.lazy_canvas for d in element_factory.select(Diagram))
+
+    items = diagram.ownedPresentation
+
+    assert items
+    assert not diagram.lazy_canvas
+    assert all(item.subject.presentation for item in items if item.subject)
+
+
+def test_materialized_lazy_diagram_can_be_saved(element_factory, modeling_language):
+    path = distribution().locate_file("examples/all-elements.gaphor")
+    eager = load_and_save(path, element_factory, modeling_language)
+    load_and_save(path, element_factory, modeling_language, lazy=True)
+    for diagram in element_factory.select(Diagram):
+        diagram.materialize()
+
+    pf = PseudoFile()
+    storage.save(XMLWriter(pf), factory=element_factory)
+    element_factory.flush()
+
+    # Only the order of presentations can differ
+    assert sorted(pf.data.splitlines()) == sorted(eager.splitlines())
+
+
+def test_unlink_element_materializes_its_diagrams(element_factory, modeling_language):
+    path = distribution().locate_file("examples/all-elements.gaphor")
+    load_and_save(path, element_factory, modeling_language)
+    klass = next(c for c in element_factory.select(UML.Class) if c.presentation)
+    klass_id, diagram_id = klass.id, klass.presentation[0].diagram.id
+    load_and_save(path, element_factory, modeling_language, lazy=True)
+    klass = element_factory.lookup(klass_id)
+    diagram = element_factory.lookup(diagram_id)
+
+    klass.unlink()
+
+    assert not diagram.lazy_canvas
+    assert not any(item.subject is klass for item in diagram.ownedPresentation)
+
+
+def test_presentation_of_lazy_loaded_element_is_complete(
+    element_factory, modeling_language
+):
+    path = distribution().locate_file("examples/all-elements.gaphor")
+    load_and_save(path, element_factory, modeling_language)
+    klass = next(c for c in element_factory.select(UML.Class) if c.presentation)
+    klass_id = klass.id
+    item_ids = {item.id for item in klass.presentation}
+    load_and_save(path, element_factory, modeling_language, lazy=True)
+    klass = element_factory.lookup(klass_id)
+
+    assert {item.id for item in klass.presentation} == item_ids
@@ -15,6 +15,11 @@ except ImportError:
 
 
 class XMLWriter(xml.sax.handler.ContentHandler):
+
+    # The XML may be written to `out` directly, instead of being fed as SAX
+    # events. Subclasses that need the SAX events should unset this.
+    write_directly = True
+
     def __init__(self, out=None, encoding=None):
         if out is None:
             out = sys.stdout
@@ -29,6 +34,16 @@ class XMLWriter(xml.sax.handler.ContentHandler):
         self._in_start_tag = False
         self._next_newline = False
 
+    @property
+    def out(self):
+        """The output stream written to."""
+        return self._out
+
+    @property
+    def encoding(self):
+        """The encoding mentioned in the XML declaration."""
+        return self._encoding
+
     def _write(self, text, start_tag=False, end_tag=False):
         """Write data.
 
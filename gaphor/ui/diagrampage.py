@@ -4,12 +4,7 @@ import logging
 from typing import Dict, Optional, Sequence, Tuple
 
 from gaphas.guide import GuidePainter
-from gaphas.painter import (
-    BoundingBoxPainter,
-    FreeHandPainter,
-    HandlePainter,
-    PainterChain,
-)
+from gaphas.painter import FreeHandPainter, HandlePainter, PainterChain
 from gaphas.segment import LineSegmentPainter
 from gaphas.tool.rubberband import RubberbandPainter, RubberbandState
 from gaphas.view import GtkView
@@ -24,7 +19,7 @@ from gaphor.diagram.diagramtoolbox import ToolDef
 from gaphor.diagram.diagramtools import apply_default_tool_set, apply_placement_tool_set
 from gaphor.diagram.diagramtools.placement import create_item
 from gaphor.diagram.event import DiagramItemPlaced
-from gaphor.diagram.painter import ItemPainter
+from gaphor.diagram.painter import BoundingBoxPainter, ItemPainter
 from gaphor.diagram.selection import Selection
 from gaphor.diagram.support import get_diagram_item
 from gaphor.transaction import Transaction
@@ -1,13 +1,14 @@
 """The file service is responsible for loading and saving the user data."""
 
 import logging
+import os
 
-from gi.repository import Gtk
+from gi.repository import GLib, Gtk
 
 from gaphor.abc import ActionProvider, Service
 from gaphor.core import action, event_handler, gettext
 from gaphor.event import SessionShutdown, SessionShutdownRequested
-from gaphor.storage import storage, verify
+from gaphor.storage import snapshot, storage, verify
 from gaphor.storage.xmlwriter import XMLWriter
 from gaphor.ui.errorhandler import error_handler
 from gaphor.ui.event import FileLoaded, FileSaved
@@ -22,6 +23,11 @@ MAX_RECENT = 10
 log = logging.getLogger(__name__)
 
 
+def snapshot_dir():
+    """The directory where model snapshots are cached."""
+    return os.path.join(GLib.get_user_cache_dir(), "gaphor", "snapshots")
+
+
 def error_message(e):
     if not isinstance(e, IOError):
         return gettext(
@@ -43,16 +49,30 @@ def error_message(e):
 class FileManager(Service, ActionProvider):
     """The file service, responsible for loading and saving Gaphor models."""
 
-    def __init__(self, event_manager, element_factory, modeling_language, main_window):
+    def __init__(
+        self,
+        event_manager,
+        element_factory,
+        modeling_language,
+        main_window,
+        fingerprints=None,
+        journal=None,
+        properties=None,
+    ):
         """File manager constructor.
 
-        There is no current filename yet.
+        There is no current filename yet. Models are reopened from
+        snapshots if the ``snapshots`` property is set.
         """
         self.event_manager = event_manager
         self.element_factory = element_factory
         self.modeling_language = modeling_language
         self.main_window = main_window
+        self.fingerprints = fingerprints
+        self.journal = journal
+        self.snapshots = bool(properties and properties.get("snapshots", False))
         self._filename = None
+        self._saved_fingerprint = None
 
         event_manager.subscribe(self._on_session_shutdown_request)
 
@@ -79,6 +99,21 @@ class FileManager(Service, ActionProvider):
 
     filename = property(get_filename, set_filename)
 
+    @property
+    def model_changed(self):
+        """Has the model changed since it was loaded or saved?
+
+        With fingerprints, a model that is changed back (e.g. by undo)
+        is not considered changed.
+        """
+        if self.fingerprints and self._saved_fingerprint:
+            return self.fingerprints.model() != self._saved_fingerprint
+        return self.main_window.model_changed
+
+    def _record_fingerprint(self):
+        if self.fingerprints:
+            self._saved_fingerprint = self.fingerprints.model()
+
     def load(self, filename):
         """Load the Gaphor model from the supplied file name.
 
@@ -97,10 +132,7 @@ class FileManager(Service, ActionProvider):
         )
 
         try:
-            loader = storage.load_generator(
-                filename.encode("utf-8"), self.element_factory, self.modeling_language
-            )
-            worker = GIdleThread(loader, queue)
+            worker = GIdleThread(self.load_generator(filename), queue)
 
             worker.start()
             worker.wait()
@@ -109,6 +141,9 @@ class FileManager(Service, ActionProvider):
                 worker.reraise()
 
             self.filename = filename
+            if self.journal:
+                self.journal.replay(filename)
+                self.journal.open(filename)
             self.event_manager.handle(FileLoaded(self, filename))
         except Exception:
             error_handler(
@@ -124,6 +159,25 @@ class FileManager(Service, ActionProvider):
         finally:
             status_window.destroy()
 
+    def load_generator(self, filename):
+        """Load the model, from a snapshot if enabled.
+
+        The fingerprint of the loaded model is recorded as well.
+        Progress is reported like `storage.load_generator()` does.
+        """
+        if self.snapshots:
+            yield from snapshot.load_generator(
+                filename.encode("utf-8"),
+                self.element_factory,
+                self.modeling_language,
+                snapshot_dir(),
+            )
+        else:
+            yield from storage.load_generator(
+                filename.encode("utf-8"), self.element_factory, self.modeling_language
+            )
+        self._record_fingerprint()
+
     def verify_orphans(self):
         """Verify that no orphaned elements are saved.
 
@@ -175,16 +229,17 @@ class FileManager(Service, ActionProvider):
             queue=queue,
         )
         try:
-            with open(filename.encode("utf-8"), "w") as out:
-                saver = storage.save_generator(XMLWriter(out), self.element_factory)
-                worker = GIdleThread(saver, queue)
-                worker.start()
-                worker.wait()
+            worker = GIdleThread(self.save_generator(filename), queue)
+            worker.start()
+            worker.wait()
 
             if worker.error:
                 worker.reraise()
 
             self.filename = filename
+            if self.journal:
+                # The model is saved in full, start a new journal
+                self.journal.open(filename)
             self.event_manager.handle(FileSaved(self, filename))
         except Exception as e:
             error_handler(
@@ -198,6 +253,32 @@ class FileManager(Service, ActionProvider):
         finally:
             status_window.destroy()
 
+    def save_generator(self, filename):
+        """Save the model, and write a snapshot of it if enabled.
+
+        The fingerprint of the saved model is recorded as well.
+        Progress is reported like `storage.save_generator()` does.
+        """
+        with open(filename.encode("utf-8"), "w") as out:
+            yield from storage.save_generator(
+                XMLWriter(out), self.element_factory, self.fingerprints
+            )
+        if self.snapshots:
+            self.write_snapshot(filename)
+        self._record_fingerprint()
+
+    def write_snapshot(self, filename):
+        """Write a snapshot of the saved model, to reopen it fast."""
+        try:
+            snapshot.write(
+                filename.encode("utf-8"),
+                self.element_factory,
+                self.modeling_language,
+                snapshot_dir(),
+            )
+        except OSError:
+            log.warning(f"Could not write a snapshot of {filename}", exc_info=True)
+
     @action(name="file-save", shortcut="<Primary>s")
     def action_save(self):
         """Save the file. Depending on if there is a file name, either perform
@@ -247,7 +328,7 @@ class FileManager(Service, ActionProvider):
         def confirm_shutdown():
             self.event_manager.handle(SessionShutdown(self))
 
-        if self.main_window.model_changed:
+        if self.model_changed:
             dialog = Gtk.MessageDialog(
                 self.main_window.window,
                 Gtk.DialogFlags.MODAL | Gtk.DialogFlags.DESTROY_WITH_PARENT,
@@ -233,10 +233,9 @@ class MainWindow(Service, ActionProvider):
     @event_handler(ModelReady)
     def _new_model_content(self, event):
         """Open the toplevel element and load toplevel diagrams."""
-        for diagram in self.element_factory.select(
-            lambda e: e.isKindOf(Diagram)
-            and not (e.namespace and e.namespace.namespace)
-        ):
+        for diagram in self.element_factory.select(Diagram):
+            if diagram.namespace and diagram.namespace.namespace:
+                continue
             self.event_manager.handle(DiagramOpened(diagram))
 
     @event_handler(FileLoaded, FileSaved)
@@ -174,9 +174,7 @@ class NamespaceModel:
 
         self.model.clear()
 
-        toplevel = self.element_factory.select(
-            lambda e: self._visible(e) and not e.owner
-        )
+        toplevel = self.element_factory.select_by("owner", None)
 
         for element in toplevel:
             if self._visible(element):
@@ -0,0 +1,85 @@
+"""Fixtures for the tests in this directory.
+
+The benchmarks, ``test_benchmark_*.py``, are skipped unless pytest is
+started with ``--benchmark``. Run one with::
+
+    pytest --benchmark -s tests/test_benchmark_<name>.py
+"""
+
+import time
+
+import pytest
+
+from gaphor.application import Session
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="run the benchmarks in tests/test_benchmark_*.py",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="needs --benchmark to run")
+    for item in items:
+        if item.fspath.basename.startswith("test_benchmark_"):
+            item.add_marker(skip_benchmark)
+
+
+@pytest.fixture
+def session():
+    """A session with the services needed to load and edit a model."""
+    session = Session(
+        services=[
+            "event_manager",
+            "component_registry",
+            "element_factory",
+            "element_dispatcher",
+            "modeling_language",
+        ]
+    )
+    yield session
+    session.shutdown()
+
+
+@pytest.fixture
+def event_manager(session):
+    return session.get_service("event_manager")
+
+
+@pytest.fixture
+def element_factory(session):
+    return session.get_service("element_factory")
+
+
+@pytest.fixture
+def modeling_language(session):
+    return session.get_service("modeling_language")
+
+
+def best_time(func, rounds=1, repeat=1, setup=None):
+    """The best time of a number of rounds, per call of ``func``.
+
+    Every round calls ``func`` ``repeat`` times. ``setup`` is called
+    before every round, and is not timed.
+    """
+    timings = []
+    for _ in range(rounds):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        timings.append((time.perf_counter() - start) / repeat)
+    return min(timings)
+
+
+@pytest.fixture
+def timed():
+    """Time a function, see `best_time()`."""
+    return best_time
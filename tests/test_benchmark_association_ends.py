@@ -0,0 +1,74 @@
+"""Benchmark memoized derived properties of association ends.
+
+All association ends in models/UML.gaphor are formatted a number of
+times, like association items do when they are drawn. Property.opposite
+and Property.navigability are computed every time, and memoized.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from gaphor import UML
+from gaphor.storage import storage
+from gaphor.UML.umlfmt import format_association_end
+
+MODEL = Path(__file__).parent.parent / "models" / "UML.gaphor"
+ROUNDS = 10
+DERIVED = [UML.Property.opposite, UML.Property.navigability]
+
+
+@pytest.fixture
+def memoize():
+    yield
+    for prop in DERIVED:
+        prop.memoize = True
+
+
+def format_ends(ends):
+    formatted = []
+    for end in ends:
+        formatted.append(format_association_end(end))
+        end.navigability
+        opposite = end.opposite
+        if opposite:
+            opposite.navigability
+            formatted.append(format_association_end(opposite))
+    return formatted
+
+
+def format_rounds(ends, memoize, timed):
+    for prop in DERIVED:
+        prop.memoize = memoize
+        prop.cache_hits = prop.cache_misses = 0
+        for end in ends:
+            end.__dict__.pop(prop._name, None)
+
+    return timed(lambda: format_ends(ends), repeat=ROUNDS) * ROUNDS
+
+
+@pytest.mark.slow
+def test_association_ends_benchmark(element_factory, modeling_language, memoize, timed):
+    storage.load(MODEL, element_factory, modeling_language)
+    ends = element_factory.lselect(
+        lambda e: isinstance(e, UML.Property) and e.association
+    )
+
+    computed = format_rounds(ends, False, timed)
+    computed_ends = format_ends(ends)
+    memoized = format_rounds(ends, True, timed)
+
+    assert format_ends(ends) == computed_ends
+    for prop in DERIVED:
+        # Every end is computed once, and looked up on every round after
+        assert prop.cache_misses <= len(ends)
+        assert prop.cache_hits >= (ROUNDS - 1) * len(ends)
+
+    print(f"\nFormat {len(ends)} association ends {ROUNDS} times:")
+    print(f"  computed: {computed:.3f}s")
+    print(f"  memoized: {memoized:.3f}s, {computed / memoized:.1f}x faster")
+    for prop in DERIVED:
+        print(
+            f"  {prop.name}: {prop.cache_hits} cache hits,"
+            f" {prop.cache_misses} cache misses"
+        )
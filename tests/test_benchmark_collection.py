@@ -0,0 +1,77 @@
+"""Benchmark many-valued associations with many members.
+
+A package is filled with classes and then unlinked. Hash indexed
+collections are compared with the old list based implementation, which
+has linear membership tests and removal.
+"""
+
+import pytest
+
+from gaphor import UML
+from gaphor.core.modeling import collection as collection_module
+from gaphor.core.modeling import properties
+
+
+class listcollection(collection_module.collection):
+    """The collection as it was: all operations work on the list."""
+
+    def _add(self, value):
+        self.items.append(value)
+
+    def _discard(self, value):
+        try:
+            self.items.remove(value)
+        except ValueError:
+            return False
+        return True
+
+    def _move_to_end(self, value):
+        self.items.remove(value)
+        self.items.append(value)
+
+    def __contains__(self, obj):
+        return obj in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+
+def build_and_unlink(element_factory, size, timed):
+    package = element_factory.create(UML.Package)
+    classes = [element_factory.create(UML.Class) for _ in range(size)]
+
+    def build():
+        for c in classes:
+            package.ownedClassifier = c
+
+    build_time = timed(build)
+    assert len(package.ownedClassifier) == size
+    unlink_time = timed(package.unlink)
+    assert not any(c.package for c in classes)
+    element_factory.flush()
+    return build_time, unlink_time
+
+
+@pytest.mark.slow
+def test_collection_benchmark(element_factory, monkeypatch, timed):
+    hashed = {
+        size: build_and_unlink(element_factory, size, timed)
+        for size in (5000, 10000, 50000)
+    }
+    with monkeypatch.context() as m:
+        m.setattr(properties, "collection", listcollection)
+        listed = {
+            size: build_and_unlink(element_factory, size, timed)
+            for size in (5000, 10000)
+        }
+
+    print("\nBuild a package and unlink it:")
+    for name, timings in (("list", listed), ("hashed", hashed)):
+        for size, (build_time, unlink_time) in timings.items():
+            print(
+                f"  {name:>6} {size:>5} elements: "
+                f"build {build_time:.3f}s, unlink {unlink_time:.3f}s"
+            )
@@ -0,0 +1,82 @@
+"""Benchmark derived union caching on models/UML.gaphor.
+
+A batch of edits is followed by a walk over the namespace tree, like a
+namespace refresh does. Per element invalidation of derived union
+caches is compared with invalidating the caches of all elements.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from gaphor import UML
+from gaphor.core.modeling.properties import derivedunion
+from gaphor.storage import storage
+
+MODEL = Path(__file__).parent.parent / "models" / "UML.gaphor"
+
+
+def invalidate_all(self, obj):
+    self.version += 1
+
+
+def derived_unions(element_factory):
+    return {
+        prop
+        for element in element_factory.values()
+        for prop in element.umlproperties()
+        if isinstance(prop, derivedunion)
+    }
+
+
+def edit(classes, packages, offset):
+    for n, c in enumerate(classes, offset):
+        c.name = f"{c.name}_"
+        c.package = packages[n % len(packages)]
+
+
+def refresh(element_factory):
+    def walk(element):
+        for e in element.ownedElement:
+            walk(e)
+
+    for element in element_factory.select_by("owner", None):
+        walk(element)
+
+
+def edit_and_refresh(element_factory, timed, rounds=5):
+    classes = element_factory.lselect(UML.Class)[:200]
+    packages = element_factory.lselect(UML.Package)
+    unions = derived_unions(element_factory)
+    for u in unions:
+        u.cache_hits = u.cache_misses = 0
+
+    offsets = iter(range(1, rounds + 1))
+
+    def edit_once():
+        edit(classes, packages, next(offsets))
+        refresh(element_factory)
+
+    best = timed(edit_once, rounds=rounds)
+    hits = sum(u.cache_hits for u in unions)
+    misses = sum(u.cache_misses for u in unions)
+    return best, hits, misses
+
+
+@pytest.mark.slow
+def test_derivedunion_benchmark(element_factory, modeling_language, monkeypatch, timed):
+    storage.load(MODEL, element_factory, modeling_language)
+    per_element = edit_and_refresh(element_factory, timed)
+    with monkeypatch.context() as m:
+        m.setattr(derivedunion, "_invalidate", invalidate_all)
+        all_elements = edit_and_refresh(element_factory, timed)
+
+    # Only the unions of edited elements are computed again
+    assert per_element[2] < all_elements[2]
+
+    print(f"\n{MODEL.name}, edit 200 classes and walk the namespace tree:")
+    for name, (t, hits, misses) in (
+        ("invalidate all", all_elements),
+        ("per element", per_element),
+    ):
+        print(f"  {name:>14}: {t:.3f}s, {hits} cache hits, {misses} cache misses")
@@ -0,0 +1,81 @@
+"""Benchmark coalescing of element dispatcher handler calls.
+
+Every class in models/UML.gaphor is watched, like a class item watches
+its subject. A script then edits the classes a few times in one
+transaction. Immediate dispatching is compared with coalescing handler
+calls until the transaction is committed.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from gaphor import UML
+from gaphor.storage import storage
+from gaphor.transaction import Transaction
+
+MODEL = Path(__file__).parent.parent / "models" / "UML.gaphor"
+
+
+def update_shapes(event):
+    # Roughly what an item does when its subject changes
+    element = event.element
+    return [(a.name, a.typeValue) for a in getattr(element, "ownedAttribute", ())] + [
+        o.name for o in getattr(element, "ownedOperation", ())
+    ]
+
+
+def watch_classes(element_factory):
+    watchers = []
+    for c in element_factory.select(UML.Class):
+        watcher = element_factory.watcher(c, update_shapes)
+        watcher.watch("name").watch("ownedAttribute.name").watch("ownedOperation.name")
+        watchers.append(watcher)
+    return watchers
+
+
+def edit(event_manager, classes, offset):
+    with Transaction(event_manager):
+        for c in classes:
+            for n in range(3):
+                c.name = f"{c.name}_{offset}{n}"
+            for a in c.ownedAttribute:
+                a.name = f"{a.name}_{offset}"
+                a.name = f"{a.name}_"
+
+
+def dispatch(session, coalesce, timed, rounds=3):
+    event_manager = session.get_service("event_manager")
+    element_factory = session.get_service("element_factory")
+    dispatcher = session.get_service("element_dispatcher")
+    dispatcher.coalesce = coalesce
+    dispatcher.dispatched = dispatcher.coalesced = 0
+    classes = element_factory.lselect(UML.Class)
+
+    watchers = watch_classes(element_factory)
+    offsets = iter(range(rounds))
+    best = timed(
+        lambda: edit(event_manager, classes, f"{int(coalesce)}{next(offsets)}"),
+        rounds=rounds,
+    )
+    for watcher in watchers:
+        watcher.unsubscribe_all()
+
+    return best, dispatcher.dispatched // rounds, dispatcher.coalesced // rounds
+
+
+@pytest.mark.slow
+def test_dispatcher_benchmark(session, element_factory, modeling_language, timed):
+    storage.load(MODEL, element_factory, modeling_language)
+    immediate = dispatch(session, False, timed)
+    coalesced = dispatch(session, True, timed)
+
+    assert coalesced[1] < immediate[1]
+    assert coalesced[2] > 0
+
+    print(f"\n{MODEL.name}, edit all classes in one transaction:")
+    for name, (t, dispatched, saved) in (
+        ("immediate", immediate),
+        ("coalesced", coalesced),
+    ):
+        print(f"  {name:>9}: {t:.3f}s, {dispatched} handler calls, {saved} coalesced")
@@ -0,0 +1,82 @@
+"""Benchmark saving small edits through the journal.
+
+models/UML.gaphor is edited 1,000 times, one attribute per transaction.
+Appending each transaction to the journal is compared with a full save
+after each edit. Full saves are timed for a number of edits and
+extrapolated.
+"""
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from gaphor import UML
+from gaphor.core import Transaction
+from gaphor.services.journal import Journal, journal_path
+from gaphor.storage import storage
+from gaphor.storage.xmlwriter import XMLWriter
+
+MODEL = Path(__file__).parent.parent / "models" / "UML.gaphor"
+EDITS = 1000
+FULL_SAVES = 25
+
+
+@pytest.fixture
+def filename(tmp_path, element_factory, modeling_language):
+    filename = str(tmp_path / MODEL.name)
+    shutil.copy(MODEL, filename)
+    storage.load(filename, element_factory, modeling_language)
+    return filename
+
+
+def edit(event_manager, classes, n):
+    with Transaction(event_manager):
+        klass = classes[n % len(classes)]
+        klass.name = f"{klass.name}_"
+
+
+def full_save(element_factory, filename):
+    with open(filename, "w") as out:
+        storage.save(XMLWriter(out), element_factory)
+
+
+@pytest.mark.slow
+def test_journal_benchmark(
+    event_manager, element_factory, modeling_language, filename, timed
+):
+    classes = element_factory.lselect(UML.Class)
+    edits = iter(range(EDITS))
+
+    def edit_and_save():
+        edit(event_manager, classes, next(edits))
+        full_save(element_factory, filename)
+
+    full = timed(edit_and_save, repeat=FULL_SAVES) * EDITS
+
+    journal = Journal(event_manager, element_factory, modeling_language)
+    journal.enabled = True
+    journal.open(filename)
+    edits = iter(range(EDITS))
+    journaled = timed(lambda: edit(event_manager, classes, next(edits)), repeat=EDITS)
+    journaled *= EDITS
+    journal.shutdown()
+    size = os.path.getsize(journal_path(filename))
+
+    element_factory.flush()
+    load = timed(lambda: storage.load(filename, element_factory, modeling_language))
+    start = time.perf_counter()
+    replayed = Journal(event_manager, element_factory, modeling_language).replay(
+        filename
+    )
+    replay = time.perf_counter() - start
+
+    assert replayed == EDITS
+
+    print(f"\n{MODEL.name}, {EDITS} edits, saved after every edit:")
+    print(f"  full saves: {full:.2f}s (extrapolated from {FULL_SAVES} saves)")
+    print(f"     journal: {journaled:.2f}s, {full / journaled:.0f}x faster")
+    print(f"  journal of {size / 1024:.0f} KiB replayed in {replay:.3f}s")
+    print(f"  (loading the model takes {load:.3f}s)")
@@ -0,0 +1,50 @@
+"""Benchmark lazy loading of diagrams.
+
+The models in models/ are loaded with and without creating the diagram
+items. For lazy loading, the time to open the first diagram is measured
+as well.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from gaphor.core.modeling import Diagram
+from gaphor.storage import storage
+
+MODELS = sorted((Path(__file__).parent.parent / "models").glob("*.gaphor"))
+
+
+def load(element_factory, modeling_language, model, lazy, timed):
+    load_time = timed(
+        lambda: storage.load(model, element_factory, modeling_language, lazy=lazy),
+        rounds=3,
+        setup=element_factory.flush,
+    )
+    lazy_diagrams = sum(1 for d in element_factory.select(Diagram) if d.lazy_canvas)
+    diagram = max(element_factory.select(Diagram), key=lambda d: d.name or "")
+    open_time = timed(lambda: diagram.ownedPresentation)
+    items = len(diagram.ownedPresentation)
+    element_factory.flush()
+    return load_time, open_time, lazy_diagrams, items
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("model", MODELS, ids=lambda p: p.name)
+def test_lazy_load_benchmark(element_factory, modeling_language, model, timed):
+    eager, _, eager_lazy_diagrams, eager_items = load(
+        element_factory, modeling_language, model, False, timed
+    )
+    lazy, open_time, lazy_diagrams, lazy_items = load(
+        element_factory, modeling_language, model, True, timed
+    )
+
+    assert eager_lazy_diagrams == 0
+    assert lazy_diagrams > 0
+    assert lazy_items == eager_items
+
+    print(
+        f"\n{model.name}: eager {eager:.3f}s, lazy {lazy:.3f}s"
+        f" + {open_time:.3f}s to open a diagram"
+        f" ({lazy_diagrams} diagrams not loaded)"
+    )
@@ -0,0 +1,76 @@
+"""Benchmark the streaming model loader against the three-pass loader.
+
+Every model is loaded in a fresh Python process, so peak RSS numbers
+are not influenced by earlier runs.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+resource = pytest.importorskip("resource")
+
+MODELS = sorted(Path(__file__).parent.parent.glob("models/*.gaphor"))
+
+LOAD_SCRIPT = """
+import json, resource, sys, time
+
+from gaphor.application import Session
+from gaphor.storage import storage
+
+session = Session(
+    services=[
+        "event_manager",
+        "component_registry",
+        "element_factory",
+        "element_dispatcher",
+        "modeling_language",
+    ]
+)
+element_factory = session.get_service("element_factory")
+modeling_language = session.get_service("modeling_language")
+
+# ru_maxrss is in bytes on macOS and in KiB elsewhere
+RSS_UNIT = 1024 if sys.platform == "darwin" else 1
+
+def peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // RSS_UNIT
+
+rss_before = peak_rss_kb()
+start = time.perf_counter()
+storage.load(sys.argv[1], element_factory, modeling_language, streaming=sys.argv[2] == "streaming")
+wall_time = time.perf_counter() - start
+rss_after = peak_rss_kb()
+
+print(json.dumps({"wall_time": wall_time, "peak_rss_kb": rss_after, "rss_growth_kb": rss_after - rss_before, "elements": element_factory.size()}))
+"""
+
+
+def load_in_subprocess(model, mode):
+    result = subprocess.run(
+        [sys.executable, "-c", LOAD_SCRIPT, str(model), mode],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("model", MODELS, ids=lambda p: p.name)
+def test_load_benchmark(model):
+    three_pass = load_in_subprocess(model, "three-pass")
+    streaming = load_in_subprocess(model, "streaming")
+
+    assert streaming["elements"] == three_pass["elements"]
+
+    print(f"\n{model.name}:")
+    for mode, stats in (("three-pass", three_pass), ("streaming", streaming)):
+        print(
+            f"  {mode:>10}: {stats['wall_time']:.3f}s, "
+            f"peak RSS {stats['peak_rss_kb'] / 1024:.1f} MiB "
+            f"(+{stats['rss_growth_kb'] / 1024:.1f} MiB during load)"
+        )
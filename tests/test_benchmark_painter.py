@@ -0,0 +1,74 @@
+"""Benchmark panning around a large diagram.
+
+A diagram with 10,000 boxes is painted in a small viewport, at 100
+positions. Painting all items is compared with painting only the items
+the spatial index of the diagram finds in the viewport.
+"""
+
+import cairo
+import pytest
+
+from gaphor.core.modeling import Diagram
+from gaphor.diagram.general import Box
+from gaphor.diagram.painter import BoundingBoxPainter, ItemPainter
+
+ROWS = COLUMNS = 100
+SPACING = 150
+VIEWPORT = (800, 600)
+PAN_STEPS = 100
+
+
+@pytest.fixture
+def diagram(element_factory):
+    diagram = element_factory.create(Diagram)
+    for row in range(ROWS):
+        for column in range(COLUMNS):
+            box = diagram.create(Box)
+            box.matrix.translate(column * SPACING, row * SPACING)
+    diagram.update_now(list(diagram.get_all_items()))
+    return diagram
+
+
+class CountingPainter(ItemPainter):
+    painted = 0
+
+    def paint_item(self, item, cairo, styled_diagram=None):
+        self.painted += 1
+        return super().paint_item(item, cairo, styled_diagram)
+
+
+def pan(painter, items, surface, timed):
+    steps = iter(range(PAN_STEPS))
+
+    def paint():
+        step = next(steps)
+        cr = cairo.Context(surface)
+        cr.translate(-step * SPACING * COLUMNS / PAN_STEPS / 2, -step * SPACING / 2)
+        painter.paint(items, cr)
+
+    painter.painted = 0
+    return timed(paint, repeat=PAN_STEPS), painter.painted
+
+
+@pytest.mark.slow
+def test_painter_benchmark(diagram, timed):
+    items = list(diagram.get_all_items())
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, *VIEWPORT)
+    painter = CountingPainter()
+
+    diagram.spatial_index.clear()
+    everything, all_painted = pan(painter, items, surface, timed)
+
+    index = timed(
+        lambda: BoundingBoxPainter(painter).paint(items, cairo.Context(surface))
+    )
+    culled, culled_painted = pan(painter, items, surface, timed)
+
+    assert all_painted == len(items) * PAN_STEPS
+    assert culled_painted < all_painted / 100
+
+    print(f"\nPan around a diagram of {len(items)} items:")
+    print(f"  paint all items:     {everything * 1000:.1f}ms per frame")
+    print(f"  paint visible items: {culled * 1000:.1f}ms per frame")
+    print(f"  {everything / culled:.0f}x faster, indexing took {index:.2f}s")
+    print(f"  {culled_painted / PAN_STEPS:.0f} items painted per frame")
@@ -0,0 +1,96 @@
+"""Micro-benchmark for the model file parser.
+
+The current parser is compared with a parser that behaves like the old
+one: text is accumulated by string concatenation and the file is fed in
+512 byte blocks, with a progress report for every block.
+"""
+
+from io import StringIO
+from pathlib import Path
+from xml.sax import handler, make_parser
+
+import pytest
+
+from gaphor.storage.parser import GaphorLoader, ProgressGenerator
+
+MODELS = Path(__file__).parent.parent / "models"
+
+LONG_VALUE_MODEL = """<?xml version="1.0" encoding="utf-8"?>
+<gaphor xmlns="http://gaphor.sourceforge.net/model" version="3.0" gaphor-version="2.2.1">
+<StyleSheet id="1">
+<styleSheet>
+<val>{}</val>
+</styleSheet>
+</StyleSheet>
+</gaphor>
+"""
+
+
+class ConcatenatingLoader(GaphorLoader):
+    """Accumulate text the old way."""
+
+    def startElement(self, name, attrs):
+        self.concatenated_text = ""
+        super().startElement(name, attrs)
+
+    def characters(self, content):
+        self.concatenated_text = self.concatenated_text + content
+
+    @property
+    def text(self):
+        return self.concatenated_text
+
+
+def parse(data, loader, **progress_options):
+    parser = make_parser()
+    parser.setFeature(handler.feature_namespaces, 1)
+    parser.setContentHandler(loader)
+
+    reports = sum(
+        1 for _ in ProgressGenerator(StringIO(data), parser, **progress_options)
+    )
+    parser.close()
+    return reports
+
+
+def long_value_model():
+    return LONG_VALUE_MODEL.format(
+        "\n".join(
+            f"diagram > item:nth-child({n}) {{ color: red }}" for n in range(50000)
+        )
+    )
+
+
+BENCHMARK_DATA = {
+    "Safety.gaphor": lambda: (MODELS / "Safety.gaphor").read_text(),
+    "UML.gaphor": lambda: (MODELS / "UML.gaphor").read_text(),
+    "long styleSheet value": long_value_model,
+}
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("name", BENCHMARK_DATA)
+def test_parser_benchmark(name, timed):
+    data = BENCHMARK_DATA[name]()
+    old_loader = ConcatenatingLoader()
+    old_reports = parse(data, old_loader, block_size=512, progress_interval=0)
+    new_loader = GaphorLoader()
+    new_reports = parse(data, new_loader)
+
+    assert [e.values for e in new_loader.elements.values()] == [
+        e.values for e in old_loader.elements.values()
+    ]
+    assert new_reports <= old_reports
+
+    old_time = timed(
+        lambda: parse(data, ConcatenatingLoader(), block_size=512, progress_interval=0),
+        rounds=3,
+    )
+    new_time = timed(lambda: parse(data, GaphorLoader()), rounds=3)
+
+    print(
+        f"\n{name} ({len(data) / 1024:.0f} KiB): "
+        f"old {old_time:.3f}s ({old_reports} progress reports), "
+        f"new {new_time:.3f}s ({new_reports} progress reports), "
+        f"{old_time / new_time:.1f}x faster"
+    )
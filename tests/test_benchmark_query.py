@@ -0,0 +1,63 @@
+"""Benchmark queries on collections.
+
+Queries are done repeatedly on lists of 10,000 elements, with matchers
+that evaluate the query expression and with cached (and, for simple
+comparisons, direct) matchers.
+"""
+
+import pytest
+
+from gaphor import UML
+from gaphor.core.modeling import ElementFactory
+from gaphor.core.modeling.collection import collectionlist
+from gaphor.core.modeling.listmixins import matcher
+
+ELEMENTS = 10_000
+QUERIES = 20
+
+
+def eval_matcher(expr):
+    compiled = compile(expr, "<matcher>", "eval")
+
+    def real_matcher(element):
+        try:
+            return bool(eval(compiled, {}, {"it": element}))
+        except (AttributeError, NameError):
+            return False
+
+    return real_matcher
+
+
+@pytest.fixture
+def elements():
+    element_factory = ElementFactory()
+    elements = collectionlist()
+    for n in range(ELEMENTS):
+        klass = element_factory.create(UML.Class)
+        klass.name = f"C{n % 100}"
+        klass.isAbstract = n % 2 == 0
+        elements.append(klass)
+    return elements
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    "expr",
+    ['it.name == "C42"', "it.isAbstract != True", 'it.name.startswith("C4")'],
+)
+def test_query_benchmark(elements, expr, timed):
+    matcher.cache_clear()
+    expected = list(filter(eval_matcher(expr), elements))
+
+    evaluated = timed(
+        lambda: list(filter(eval_matcher(expr), elements)), repeat=QUERIES
+    )
+    cached = timed(lambda: elements[expr], repeat=QUERIES)
+
+    assert list(elements[expr]) == expected
+    assert matcher.cache_info().misses == 1
+    print(
+        f"\n{QUERIES} queries {expr!r} on {ELEMENTS} elements:"
+        f" eval {evaluated * QUERIES:.3f}s, cached {cached * QUERIES:.3f}s,"
+        f" {evaluated / cached:.1f}x faster"
+    )
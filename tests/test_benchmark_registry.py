@@ -0,0 +1,69 @@
+"""Benchmark service lookups in the component registry.
+
+A session is created with all services from the ``gaphor.services``
+entry point. Lookups are compared with a registry that scans all
+components, like the registry used to.
+"""
+
+import pytest
+
+from gaphor.abc import ActionProvider, Service
+from gaphor.application import Session
+from gaphor.services.componentregistry import ComponentRegistry
+
+LOOKUPS = 100_000
+
+
+class ScanningRegistry:
+    def __init__(self, components):
+        self._comp = set(components)
+
+    def get_service(self, name):
+        found = [c for n, c in self._comp if isinstance(c, Service) and n == name]
+        assert len(found) == 1
+        return found[0]
+
+    def all(self, base):
+        return ((n, c) for n, c in self._comp if isinstance(c, base))
+
+
+@pytest.fixture
+def session():
+    # All services, not only the ones needed for a model
+    session = Session()
+    yield session
+    session.shutdown()
+
+
+@pytest.mark.slow
+def test_registry_benchmark(session, timed):
+    component_registry: ComponentRegistry = session.component_registry
+    components = list(component_registry.all(Service))  # type: ignore[misc]
+    scanning = ScanningRegistry(components)
+
+    assert component_registry.get_service("element_factory") is scanning.get_service(
+        "element_factory"
+    )
+    assert set(component_registry.all(ActionProvider)) == set(
+        scanning.all(ActionProvider)
+    )
+
+    print(f"\n{LOOKUPS} lookups in a session with {len(components)} services:")
+    for name, indexed_lookup, scanning_lookup in [
+        (
+            "get_service",
+            lambda: component_registry.get_service("element_factory"),
+            lambda: scanning.get_service("element_factory"),
+        ),
+        (
+            "all(ActionProvider)",
+            lambda: list(component_registry.all(ActionProvider)),
+            lambda: list(scanning.all(ActionProvider)),
+        ),
+    ]:
+        indexed = timed(indexed_lookup, repeat=LOOKUPS) * LOOKUPS
+        scanned = timed(scanning_lookup, repeat=LOOKUPS) * LOOKUPS
+        print(
+            f"  {name:>20}: scan {scanned:.3f}s, indexed {indexed:.3f}s,"
+            f" {scanned / indexed:.1f}x faster"
+        )
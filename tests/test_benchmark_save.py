@@ -0,0 +1,48 @@
+"""Benchmark model saving.
+
+Every bundled model is saved through XMLSerializer (the default for
+XMLWriter) and by feeding SAX events to an XMLWriter.
+"""
+
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from gaphor.storage import storage
+from gaphor.storage.xmlwriter import XMLWriter
+
+MODELS = sorted(Path(__file__).parent.parent.glob("models/*.gaphor"))
+
+
+class SaxXMLWriter(XMLWriter):
+    """An XMLWriter that is fed SAX events by save_generator()."""
+
+    write_directly = False
+
+
+def saved(writer_class, element_factory):
+    out = StringIO()
+    storage.save(writer_class(out), element_factory)
+    return out.getvalue()
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("model", MODELS, ids=lambda p: p.name)
+def test_save_benchmark(model, element_factory, modeling_language, timed):
+    storage.load(model, element_factory, modeling_language)
+    size = element_factory.size()
+
+    sax_output = saved(SaxXMLWriter, element_factory)
+    assert saved(XMLWriter, element_factory) == sax_output
+    length = len(sax_output)
+
+    sax_time = timed(lambda: saved(SaxXMLWriter, element_factory), rounds=3)
+    serializer_time = timed(lambda: saved(XMLWriter, element_factory), rounds=3)
+
+    print(f"\n{model.name} ({size} elements, {length / 1024:.0f} KiB):")
+    for name, t in (("SAX events", sax_time), ("XMLSerializer", serializer_time)):
+        print(
+            f"  {name:>13}: {t:.3f}s, {size / t:.0f} elements/s, "
+            f"{length / 1024 / 1024 / t:.1f} MiB/s"
+        )
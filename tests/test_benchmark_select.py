@@ -0,0 +1,53 @@
+"""Benchmark element factory lookups on models/UML.gaphor.
+
+Lookups through the type and secondary indexes are compared with a scan
+of all elements in the model.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from gaphor import UML
+from gaphor.core.modeling import StyleSheet
+from gaphor.storage import storage
+
+MODEL = Path(__file__).parent.parent / "models" / "UML.gaphor"
+
+
+@pytest.mark.slow
+def test_select_benchmark(element_factory, modeling_language, timed):
+    storage.load(MODEL, element_factory, modeling_language)
+    lookups = {
+        "StyleSheet": (
+            lambda: next(element_factory.select(StyleSheet), None),
+            lambda: next(
+                element_factory.select(lambda e: isinstance(e, StyleSheet)), None
+            ),
+        ),
+        "Class": (
+            lambda: element_factory.lselect(UML.Class),
+            lambda: element_factory.lselect(lambda e: isinstance(e, UML.Class)),
+        ),
+        "name": (
+            lambda: list(element_factory.select_by("name", "Element")),
+            lambda: element_factory.lselect(
+                lambda e: getattr(e, "name", None) == "Element"
+            ),
+        ),
+        "owner": (
+            lambda: list(element_factory.select_by("owner", None)),
+            lambda: element_factory.lselect(lambda e: not e.owner),
+        ),
+    }
+
+    print(f"\n{MODEL.name} ({element_factory.size()} elements):")
+    for name, (indexed, scan) in lookups.items():
+        assert indexed() == scan()
+        indexed_time = timed(indexed, rounds=5, repeat=100)
+        scan_time = timed(scan, rounds=5, repeat=100)
+        print(
+            f"  {name:>10}: scan {scan_time * 1e6:.0f}µs, "
+            f"index {indexed_time * 1e6:.0f}µs, "
+            f"{scan_time / indexed_time:.0f}x faster"
+        )
@@ -0,0 +1,67 @@
+"""Benchmark updating the shapes of a large class.
+
+One attribute of a class with 200 attributes is edited. The shapes of
+the class item are updated with and without reusing the rows of the
+previous update.
+"""
+
+import pytest
+
+from gaphor import UML
+from gaphor.diagram.shapes import ShapeCache
+from gaphor.UML.classes import ClassItem
+
+ATTRIBUTES = 200
+EDITS = 500
+
+
+@pytest.fixture
+def item(element_factory):
+    with element_factory.block_events():
+        diagram = element_factory.create(UML.Diagram)
+        klass = element_factory.create(UML.Class)
+        for n in range(ATTRIBUTES):
+            attribute = element_factory.create(UML.Property)
+            attribute.name = f"attribute{n}"
+            klass.ownedAttribute = attribute
+        item = diagram.create(ClassItem, subject=klass)
+    item.update_shapes()
+    return item
+
+
+def edits(item, timed):
+    attribute = item.subject.ownedAttribute[ATTRIBUTES // 2]
+
+    def edit():
+        attribute.isStatic = not attribute.isStatic
+        item.update_shapes()
+
+    return timed(edit, repeat=EDITS)
+
+
+@pytest.mark.slow
+def test_shapes_benchmark(item, timed):
+    item.shape_cache = shape_cache = ShapeCache()
+    item.update_shapes()
+    shape_cache.created = shape_cache.reused = 0
+    reused = edits(item, timed)
+    created, kept = shape_cache.created, shape_cache.reused
+
+    # Only the row of the edited attribute changes its key
+    assert created <= 2 * EDITS
+    assert kept >= (ATTRIBUTES - 1) * EDITS
+
+    class FreshShapeCache(ShapeCache):
+        def __enter__(self):
+            self._shapes = {}
+            return self
+
+    item.shape_cache = FreshShapeCache()
+    fresh = edits(item, timed)
+
+    print(f"\nEdit 1 attribute of a class with {ATTRIBUTES} attributes:")
+    print(f"  new shapes: {fresh * 1000:.2f}ms per update")
+    print(
+        f"  reused:     {reused * 1000:.2f}ms per update, {fresh / reused:.1f}x faster"
+    )
+    print(f"  shapes created: {created}, reused: {kept}")
@@ -0,0 +1,38 @@
+"""Benchmark loading models from binary snapshots.
+
+The models in models/ are loaded from XML and from a snapshot.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from gaphor.storage import snapshot, storage
+
+MODELS = sorted((Path(__file__).parent.parent / "models").glob("*.gaphor"))
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("model", MODELS, ids=lambda p: p.name)
+def test_snapshot_benchmark(element_factory, modeling_language, model, timed):
+    xml = timed(
+        lambda: storage.load(model, element_factory, modeling_language),
+        rounds=3,
+        setup=element_factory.flush,
+    )
+    size = element_factory.size()
+    data = snapshot.dump(element_factory, modeling_language)
+    binary = timed(
+        lambda: snapshot.load(data, element_factory, modeling_language),
+        rounds=3,
+        setup=element_factory.flush,
+    )
+
+    assert element_factory.size() == size
+    assert len(data) < model.stat().st_size
+
+    print(
+        f"\n{model.name}: XML {xml:.3f}s ({model.stat().st_size / 1024:.0f} KiB),"
+        f" snapshot {binary:.3f}s ({len(data) / 1024:.0f} KiB),"
+        f" {xml / binary:.1f}x faster"
+    )
@@ -0,0 +1,84 @@
+"""Benchmark style sheet matching.
+
+Every item in examples/all-elements.gaphor is styled, using the indexed
+and memoized CompiledStyleSheet.match() and by evaluating all rules for
+every item. This is done for the style sheet of the model and for a
+style sheet with a few rules for every item type.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from gaphor.core.modeling import Diagram, StyleSheet
+from gaphor.core.modeling.diagram import StyledItem
+from gaphor.core.styling import MATCH_SORT_KEY, CompiledStyleSheet, merge_styles
+from gaphor.storage import storage
+
+MODEL = Path(__file__).parent.parent / "examples" / "all-elements.gaphor"
+
+
+def match_all_rules(compiled_style_sheet, node):
+    results = sorted(
+        (
+            (specificity, order, declarations)
+            for pred, specificity, order, declarations in compiled_style_sheet.selectors
+            if pred(node)
+        ),
+        key=MATCH_SORT_KEY,
+    )
+    return merge_styles(decl for _, _, decl in results)
+
+
+def style_sheet_for(nodes):
+    names = sorted({node.name() for node in nodes})
+    return "\n".join(
+        f"""
+        {name} {{ color: red }}
+        {name}[subject] {{ font-size: 12 }}
+        {name}[subject.name^=a] {{ font-style: italic }}
+        {name}:hover {{ highlight-color: blue }}
+        diagram > {name} {{ line-width: 3 }}
+        """
+        for name in names
+    )
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("style_sheet", ["model", "generated"])
+def test_style_benchmark(element_factory, modeling_language, style_sheet, timed):
+    storage.load(MODEL, element_factory, modeling_language)
+    nodes = [
+        StyledItem(item)
+        for diagram in element_factory.select(Diagram)
+        for item in diagram.get_all_items()
+    ]
+    compiled_style_sheet = (
+        next(element_factory.select(StyleSheet))._compiled_style_sheet
+        if style_sheet == "model"
+        else CompiledStyleSheet(style_sheet_for(nodes))
+    )
+
+    for node in nodes:
+        assert compiled_style_sheet.match(node) == match_all_rules(
+            compiled_style_sheet, node
+        )
+
+    def all_rules():
+        for node in nodes:
+            match_all_rules(compiled_style_sheet, node)
+
+    def indexed():
+        for node in nodes:
+            compiled_style_sheet.match(node)
+
+    all_rules_time = timed(all_rules, rounds=5)
+    indexed_time = timed(indexed, rounds=5)
+
+    print(
+        f"\n{MODEL.name}, {style_sheet} style sheet ({len(nodes)} items, "
+        f"{len(compiled_style_sheet.selectors)} rules):\n"
+        f"  all rules: {all_rules_time * 1000:.1f}ms\n"
+        f"    indexed: {indexed_time * 1000:.1f}ms, "
+        f"{all_rules_time / indexed_time:.1f}x faster"
+    )
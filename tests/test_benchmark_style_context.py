@@ -0,0 +1,74 @@
+"""Benchmark style matching on a deeply nested diagram.
+
+Items are styled with a new style node for every item, and with style
+nodes that share their parent and child nodes through a StyledDiagram.
+"""
+
+import pytest
+
+from gaphor import UML
+from gaphor.core.eventmanager import EventManager
+from gaphor.core.modeling import Diagram, ElementFactory
+from gaphor.core.modeling.diagram import StyledDiagram, StyledItem
+from gaphor.core.styling import CompiledStyleSheet
+from gaphor.UML.classes import ClassItem, PackageItem
+
+STYLE_SHEET = """
+* { color: black }
+package package { line-width: 1 }
+package package package class { font-size: 10 }
+diagram > package { font-size: 14 }
+package:has(class) { background-color: white }
+:not(:empty) { padding: 4 }
+"""
+
+
+@pytest.fixture
+def diagram():
+    element_factory = ElementFactory(EventManager())
+    diagram = element_factory.create(Diagram)
+    yield diagram
+    element_factory.shutdown()
+
+
+def create_nested_items(diagram, depth, breadth):
+    parent = None
+    for _ in range(depth):
+        for _ in range(breadth):
+            diagram.create(
+                ClassItem, parent=parent, subject=diagram.model.create(UML.Class)
+            )
+        parent = diagram.create(
+            PackageItem, parent=parent, subject=diagram.model.create(UML.Package)
+        )
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("depth", [10, 50])
+def test_style_context_benchmark(diagram, depth, timed):
+    create_nested_items(diagram, depth, breadth=5)
+    items = list(diagram.get_all_items())
+
+    def new_nodes():
+        compiled_style_sheet = CompiledStyleSheet(STYLE_SHEET)
+        return [compiled_style_sheet.match(StyledItem(item)) for item in items]
+
+    def styled_diagram():
+        compiled_style_sheet = CompiledStyleSheet(STYLE_SHEET)
+        styled_diagram = StyledDiagram(diagram)
+        return [
+            compiled_style_sheet.match(styled_diagram.styled_item(item))
+            for item in items
+        ]
+
+    assert new_nodes() == styled_diagram()
+
+    new_nodes_time = timed(new_nodes, rounds=3)
+    styled_diagram_time = timed(styled_diagram, rounds=3)
+
+    print(
+        f"\nDepth {depth}, {len(items)} items:\n"
+        f"      new nodes: {new_nodes_time * 1000:.1f}ms\n"
+        f"  StyledDiagram: {styled_diagram_time * 1000:.1f}ms, "
+        f"{new_nodes_time / styled_diagram_time:.1f}x faster"
+    )
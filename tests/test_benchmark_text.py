@@ -0,0 +1,50 @@
+"""Benchmark measuring the text in the example models.
+
+All diagrams in models/ are updated, which measures all text shown on
+them. Text is measured with and without the shared text size cache.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from gaphor.core.modeling import Diagram
+from gaphor.diagram import text
+from gaphor.storage import storage
+
+MODELS = sorted((Path(__file__).parent.parent / "models").glob("*.gaphor"))
+
+
+def update_all(diagrams):
+    for diagram in diagrams:
+        diagram.update_now(list(diagram.get_all_items()))
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("model", MODELS, ids=lambda p: p.name)
+def test_text_benchmark(element_factory, modeling_language, model, monkeypatch, timed):
+    storage.load(model, element_factory, modeling_language)
+    diagrams = element_factory.lselect(Diagram)
+
+    with monkeypatch.context() as m:
+        m.setattr(text, "text_size", text.text_size.__wrapped__)
+        uncached = timed(lambda: update_all(diagrams))
+
+    text.text_size.cache_clear()
+    cold = timed(lambda: update_all(diagrams))
+    cold_info = text.text_size.cache_info()
+    warm = timed(lambda: update_all(diagrams))
+    info = text.text_size.cache_info()
+
+    # All text is measured on the first update
+    assert info.misses == cold_info.misses
+    assert info.hits > cold_info.hits
+
+    print(
+        f"\n{model.name}: no cache {uncached:.3f}s,"
+        f" cold cache {cold:.3f}s, warm cache {warm:.3f}s"
+    )
+    print(
+        f"  {info.misses} texts measured, {info.hits} cache hits"
+        f" ({info.hits / max(1, info.hits + info.misses):.0%})"
+    )
@@ -0,0 +1,61 @@
+"""Benchmark loading, saving and flushing with cached element properties.
+
+Element.umlproperties() is compared with the old implementation, which
+looked up all properties with dir() on every call.
+"""
+
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from gaphor.core.modeling import Element
+from gaphor.core.modeling.properties import umlproperty
+from gaphor.storage import storage
+from gaphor.storage.xmlwriter import XMLWriter
+
+MODEL = Path(__file__).parent.parent / "models" / "UML.gaphor"
+
+
+def uncached_umlproperties(class_):
+    for propname in dir(class_):
+        if not propname.startswith("_"):
+            prop = getattr(class_, propname)
+            if isinstance(prop, umlproperty):
+                yield prop
+
+
+def load_save_flush(element_factory, modeling_language, timed, rounds=3):
+    timings = {"load": [], "save": [], "flush": []}
+    for _ in range(rounds):
+        timings["load"].append(
+            timed(lambda: storage.load(MODEL, element_factory, modeling_language))
+        )
+        out = StringIO()
+        timings["save"].append(
+            timed(lambda: storage.save(XMLWriter(out), element_factory))
+        )
+        timings["flush"].append(timed(element_factory.flush))
+    return {name: min(t) for name, t in timings.items()}, out.getvalue()
+
+
+@pytest.mark.slow
+def test_umlproperties_benchmark(
+    element_factory, modeling_language, monkeypatch, timed
+):
+    cached, cached_output = load_save_flush(element_factory, modeling_language, timed)
+    with monkeypatch.context() as m:
+        m.setattr(Element, "umlproperties", classmethod(uncached_umlproperties))
+        uncached, uncached_output = load_save_flush(
+            element_factory, modeling_language, timed
+        )
+
+    assert cached_output == uncached_output
+
+    print(f"\n{MODEL.name}:")
+    for name in cached:
+        print(
+            f"  {name:>5}: dir() {uncached[name]:.3f}s, "
+            f"cached {cached[name]:.3f}s, "
+            f"{uncached[name] / cached[name]:.1f}x faster"
+        )
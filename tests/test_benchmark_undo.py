@@ -0,0 +1,138 @@
+"""Benchmark undoing the deletion of many diagram items.
+
+Every undo action looks up the elements it works on by id. The id index
+for presentations is compared with the old lookup, which scanned the
+presentations of all diagrams. The memory held by the undo history is
+measured as well, with and without compression.
+"""
+
+import gc
+import tracemalloc
+
+import pytest
+
+from gaphor import UML
+from gaphor.application import Session
+from gaphor.core import Transaction
+from gaphor.core.modeling import Diagram
+from gaphor.services.undomanager import UndoManager
+from gaphor.UML.classes import ClassItem
+
+ITEMS = 2000
+
+
+@pytest.fixture
+def session():
+    # The session from conftest.py, with an undo manager
+    session = Session(
+        services=[
+            "event_manager",
+            "component_registry",
+            "element_factory",
+            "element_dispatcher",
+            "modeling_language",
+            "undo_manager",
+        ]
+    )
+    yield session
+    session.shutdown()
+
+
+def scanning_deep_lookup(self, id):
+    element = self.element_factory.lookup(id)
+    if not element:
+        for diagram in self.element_factory.select(Diagram):
+            for presentation in diagram.ownedPresentation:
+                if presentation.id == id:
+                    return presentation
+        raise ValueError(f"Element with id {id} not found in model")
+    return element
+
+
+def delete_and_undo(session, timed):
+    event_manager = session.get_service("event_manager")
+    element_factory = session.get_service("element_factory")
+    undo_manager = session.get_service("undo_manager")
+
+    with Transaction(event_manager):
+        diagram = element_factory.create(Diagram)
+        for n in range(ITEMS):
+            diagram.create(ClassItem, subject=element_factory.create(UML.Class))
+        # Other diagrams are scanned as well
+        other = element_factory.create(Diagram)
+        for n in range(ITEMS):
+            other.create(ClassItem)
+
+    with Transaction(event_manager):
+        for item in list(diagram.ownedPresentation):
+            item.unlink()
+
+    elapsed = timed(undo_manager.undo_transaction)
+
+    assert len(diagram.ownedPresentation) == ITEMS
+    element_factory.flush()
+    undo_manager.clear_undo_stack()
+    undo_manager.clear_redo_stack()
+    return elapsed
+
+
+@pytest.mark.slow
+def test_undo_benchmark(session, monkeypatch, timed):
+    indexed = delete_and_undo(session, timed)
+    with monkeypatch.context() as m:
+        m.setattr(UndoManager, "deep_lookup", scanning_deep_lookup)
+        scanning = delete_and_undo(session, timed)
+
+    print(f"\nUndo deletion of {ITEMS} items:")
+    print(f"  scan diagrams: {scanning:.3f}s")
+    print(f"       id index: {indexed:.3f}s, {scanning / indexed:.1f}x faster")
+
+
+def delete_all_memory(session, spill_after):
+    event_manager = session.get_service("event_manager")
+    element_factory = session.get_service("element_factory")
+    undo_manager = session.get_service("undo_manager")
+    undo_manager.spill_after = spill_after
+
+    with Transaction(event_manager):
+        diagram = element_factory.create(Diagram)
+        for n in range(ITEMS):
+            diagram.create(ClassItem, subject=element_factory.create(UML.Class))
+
+    tracemalloc.start()
+    with Transaction(event_manager):
+        for item in list(diagram.ownedPresentation):
+            item.unlink()
+    # Push the delete transaction out of the uncompressed window
+    for n in range(spill_after or 0):
+        with Transaction(event_manager):
+            diagram.name = str(n)
+    usage = undo_manager.memory_usage()
+
+    # Memory held by the undo history is released when the stack is cleared
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    undo_manager.clear_undo_stack()
+    gc.collect()
+    retained = before - tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    element_factory.flush()
+    undo_manager.clear_undo_stack()
+    undo_manager.clear_redo_stack()
+    return retained, usage
+
+
+@pytest.mark.slow
+def test_undo_memory_benchmark(session):
+    plain = delete_all_memory(session, spill_after=None)
+    compressed = delete_all_memory(session, spill_after=1)
+
+    assert compressed[0] < plain[0]
+
+    print(f"\nUndo history after deleting {ITEMS} items:")
+    for name, (retained, usage) in (("records", plain), ("compressed", compressed)):
+        print(
+            f"  {name:>10}: {retained / 1024:.0f} KiB retained, "
+            f"memory_usage() {usage / 1024:.0f} KiB"
+        )
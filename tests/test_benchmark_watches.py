@@ -0,0 +1,78 @@
+"""Benchmark watching diagram items.
+
+examples/all-elements.gaphor is copied 50 times into one model, with new
+ids. The model is loaded with all diagram items, which register their
+watches on load. Load time and memory in use after loading are
+measured, in total and by the element dispatcher.
+"""
+
+import re
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from gaphor.core.modeling import Diagram
+from gaphor.storage import storage
+
+MODEL = Path(__file__).parent.parent / "examples" / "all-elements.gaphor"
+COPIES = 50
+
+ID = re.compile(r'((?:id|refid)="[^"]+)"')
+
+
+@pytest.fixture
+def scaled_model(tmp_path):
+    text = MODEL.read_text()
+    start = text.index(">", text.index("<gaphor")) + 1
+    end = text.rindex("</gaphor>")
+    body = text[start:end]
+    filename = tmp_path / "scaled.gaphor"
+    filename.write_text(
+        text[:start]
+        + "".join(ID.sub(rf'\1-{n}"', body) for n in range(COPIES))
+        + text[end:]
+    )
+    return filename
+
+
+def diagram_items(element_factory):
+    return [
+        item for d in element_factory.select(Diagram) for item in d.ownedPresentation
+    ]
+
+
+@pytest.mark.slow
+def test_watches_benchmark(
+    session, element_factory, modeling_language, scaled_model, timed
+):
+    def load(model=scaled_model):
+        storage.load(model, element_factory, modeling_language, lazy=False)
+
+    load(MODEL)
+    copied_items = len(diagram_items(element_factory))
+
+    load_time = timed(load, rounds=3, setup=element_factory.flush)
+
+    element_factory.flush()
+    tracemalloc.start()
+    load()
+    memory, _ = tracemalloc.get_traced_memory()
+    dispatcher_memory = sum(
+        stat.size
+        for stat in tracemalloc.take_snapshot()
+        .filter_traces([tracemalloc.Filter(True, "*/elementdispatcher.py")])
+        .statistics("filename")
+    )
+    tracemalloc.stop()
+
+    items = diagram_items(element_factory)
+    plans = session.get_service("element_dispatcher")._plans
+    assert len(items) == COPIES * copied_items
+    # Plans are shared by all items of a class, in all copies
+    assert len(plans) < copied_items
+
+    print(f"\n{MODEL.name} x {COPIES}, {len(items)} diagram items:")
+    print(f"  load: {load_time:.3f}s, {memory / 1024 / 1024:.1f} MiB in use")
+    print(f"  element dispatcher: {dispatcher_memory / 1024 / 1024:.1f} MiB")
+    print(f"  {len(plans)} watch plans")
@@ -1,6 +1,10 @@
 import pytest
 
+from gaphor import UML
+from gaphor.application import Session
+from gaphor.core.modeling import Diagram
 from gaphor.plugins.diagramexport import gaphorconvert
+from gaphor.storage import storage
 
 
 def test_help_output(capsys):
@@ -14,6 +18,8 @@ def test_help_output(capsys):
     assert "--dir=directory" in captured.out
     assert "--format=format" in captured.out
     assert "--regex=regex" in captured.out
+    assert "--jobs=jobs" in captured.out
+    assert "--incremental" in captured.out
 
 
 def test_export_pdf(tmp_path):
@@ -45,3 +51,85 @@ def test_export_svg(tmp_path):
 
     assert model_path.exists()
     assert (model_path / "main.svg").exists()
+
+
+def test_export_with_jobs(tmp_path):
+    gaphorconvert.main(
+        ["-v", "-j", "2", "-d", str(tmp_path), "test-models/issue_53.gaphor"]
+    )
+
+    assert len(list(tmp_path.glob("**/*.pdf"))) > 1
+
+
+def test_incremental_export_skips_unchanged_diagrams(tmp_path, capsys):
+    argv = ["-v", "-i", "-d", str(tmp_path), "examples/all-elements.gaphor"]
+    gaphorconvert.main(argv)
+    capsys.readouterr()
+
+    gaphorconvert.main(argv)
+    captured = capsys.readouterr()
+
+    assert (tmp_path / gaphorconvert.MANIFEST).exists()
+    assert "unchanged: New model/main" in captured.err
+    assert "rendering" not in captured.err
+
+
+@pytest.fixture
+def session():
+    session = Session(
+        services=[
+            "event_manager",
+            "component_registry",
+            "element_factory",
+            "element_dispatcher",
+            "modeling_language",
+            "fingerprints",
+        ]
+    )
+    storage.load(
+        "examples/all-elements.gaphor",
+        session.get_service("element_factory"),
+        session.get_service("modeling_language"),
+    )
+    yield session
+    session.shutdown()
+
+
+def test_fingerprint_changes_with_shown_elements(session):
+    element_factory = session.get_service("element_factory")
+    fingerprints = session.get_service("fingerprints")
+    diagram = next(element_factory.select(Diagram))
+    klass = next(
+        c
+        for c in element_factory.select(UML.Class)
+        if c.presentation and c.ownedAttribute
+    )
+    other = element_factory.create(UML.Class)
+    fingerprint = gaphorconvert.fingerprint(diagram, "pdf", fingerprints)
+
+    other.name = "not shown"
+    unchanged = gaphorconvert.fingerprint(diagram, "pdf", fingerprints)
+    klass.ownedAttribute[0].name = "renamed"
+    changed = gaphorconvert.fingerprint(diagram, "pdf", fingerprints)
+
+    assert unchanged == fingerprint
+    assert changed != fingerprint
+    assert gaphorconvert.fingerprint(diagram, "svg", fingerprints) != changed
+
+
+def test_fingerprint_changes_with_attribute_type(session):
+    element_factory = session.get_service("element_factory")
+    fingerprints = session.get_service("fingerprints")
+    diagram = next(element_factory.select(Diagram))
+    klass = next(
+        c
+        for c in element_factory.select(UML.Class)
+        if c.presentation and c.ownedAttribute
+    )
+    attribute = klass.ownedAttribute[0]
+    attribute.type = element_factory.create(UML.Class)
+    fingerprint = gaphorconvert.fingerprint(diagram, "pdf", fingerprints)
+
+    attribute.type.name = "Renamed"
+
+    assert gaphorconvert.fingerprint(diagram, "pdf", fingerprints) != fingerprint
@@ -108,6 +108,27 @@ def test_diagram_item_can_undo_(event_manager, element_factory, undo_manager, ca
     assert not caplog.records
 
 
+@pytest.mark.parametrize("spill_after", [None, 0])
+def test_diagram_item_move_can_undo_and_redo(
+    event_manager, element_factory, undo_manager, spill_after
+):
+    undo_manager.spill_after = spill_after
+    with Transaction(event_manager):
+        diagram = element_factory.create(Diagram)
+        cls = diagram.create(ClassItem, subject=element_factory.create(UML.Class))
+
+    with Transaction(event_manager):
+        cls.matrix.translate(10, 10)
+
+    undo_manager.undo_transaction()
+
+    assert cls.matrix.tuple() == (1, 0, 0, 1, 0, 0)
+
+    undo_manager.redo_transaction()
+
+    assert cls.matrix.tuple() == (1, 0, 0, 1, 10, 10)
+
+
 def test_diagram_item_should_not_end_up_in_element_factory(
     event_manager, element_factory, undo_manager
 ):